@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import User
+from reviews.versions import cache_is_shared
+
+TOKEN_VERSION_KEY = 'token_version:{user_id}'
+# Версия для удаленного пользователя: не совпадает ни с одним токеном.
+DELETED_USER_VERSION = -1
+
+
+def access_token_for_user(user):
+    """Токен доступа с claims роли, прав суперпользователя и версии."""
+    token = AccessToken.for_user(user)
+    token['role'] = user.role
+    token['is_superuser'] = user.is_superuser
+    token['token_version'] = user.token_version
+    return token
+
+
+def get_token_version(user_id):
+    """
+    Текущая версия токенов пользователя. Берется из кеша, при промахе
+    читается одним запросом по первичному ключу. Если кеш не общий,
+    сброс версии в другом процессе здесь не виден, поэтому версия
+    хранится не дольше LOCAL_COPY_TIMEOUT секунд.
+    """
+    key = TOKEN_VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id, is_active=True
+        ).values_list('token_version', flat=True).first()
+        if version is None:
+            version = DELETED_USER_VERSION
+        timeout = settings.TOKEN_VERSION_CACHE_TIMEOUT
+        if not cache_is_shared():
+            timeout = min(timeout, settings.LOCAL_COPY_TIMEOUT)
+        cache.set(key, version, timeout)
+    return version
+
+
+def invalidate_token_version(user_id):
+    cache.delete(TOKEN_VERSION_KEY.format(user_id=user_id))
+
+
+class ClaimsUser(TokenUser):
+    """
+    Пользователь, построенный по claims токена без обращения к БД.
+    Поддерживает проверки прав, которые используют разрешения api.
+    """
+
+    @cached_property
+    def role(self):
+        return self.token.get('role', 'user')
+
+    @property
+    def is_admin(self):
+        return self.role == 'admin'
+
+    @property
+    def is_moderator(self):
+        return self.role == 'moderator'
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по JWT с claims роли.
+    Для таких токенов пользователь не загружается из БД: проверяется
+    только версия токенов пользователя (из кеша). Токены без claims
+    обрабатываются как раньше, с загрузкой пользователя.
+    """
+
+    def get_user(self, validated_token):
+        if 'token_version' not in validated_token:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатора пользователя.'
+            )
+        if get_token_version(user_id) != validated_token['token_version']:
+            raise InvalidToken('Права пользователя изменились.')
+        return ClaimsUser(validated_token)
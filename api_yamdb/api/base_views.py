@@ -1,6 +1,44 @@
+from functools import partial
+
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
+
+from .cache import get_stats
 from .permissions import IsAdminOrReadOnly
+from .serializers import CatalogStatsSerializer, parse_list_param
+
+
+class SparseFieldsViewMixin:
+    """
+    Разбор параметров ?fields= и ?expand= во вьюсете, чтобы сокращать
+    не только ответ, но и запрос к БД.
+    """
+
+    def get_requested_fields(self):
+        return parse_list_param(self.request, 'fields')
+
+    def get_expanded_fields(self):
+        return parse_list_param(self.request, 'expand') or set()
+
+    def wants_field(self, name):
+        requested = self.get_requested_fields()
+        return requested is None or name in requested
+
+    def get_only_fields(self, concrete_fields):
+        """
+        Поля модели для only() или None, если поля не ограничены.
+        concrete_fields — словарь поле ответа -> поля модели.
+        """
+        requested = self.get_requested_fields()
+        if requested is None:
+            return None
+        only = ['id']
+        for name, model_fields in concrete_fields.items():
+            if name in requested:
+                only.extend(model_fields)
+        return only
 
 
 class BaseCategoryGenreViewSet(viewsets.ModelViewSet):
@@ -13,3 +51,23 @@ class BaseCategoryGenreViewSet(viewsets.ModelViewSet):
 
     def retrieve(self, request, *args, **kwargs):
         return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    @action(detail=True, url_path='stats')
+    def stats(self, request, slug=None):
+        """
+        Статистика произведений категории или жанра.
+        Значения берутся из предрасчитанной таблицы одним запросом,
+        ответ кешируется.
+        """
+        return Response(get_stats(
+            self.get_queryset().model, slug, partial(self.build_stats, slug)
+        ))
+
+    def build_stats(self, slug):
+        instance = get_object_or_404(
+            self.get_queryset().select_related('stats'), slug=slug
+        )
+        return CatalogStatsSerializer(
+            getattr(instance, 'stats', {}),
+            context={'group': instance}
+        ).data
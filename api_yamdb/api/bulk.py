@@ -0,0 +1,150 @@
+from django.db import connection, transaction
+from django.db.models import Max
+from rest_framework.exceptions import ValidationError
+
+from reviews.models import Title
+from reviews.signals import titles_bulk_saved
+from .serializers import TitleWriteSerializer
+
+TITLE_FIELDS = ('name', 'year', 'description', 'category')
+
+
+def validate_titles(items):
+    """
+    Проверяет элементы пакета сериализатором TitleWriteSerializer.
+    Элементы с id считаются изменением существующего произведения.
+    Возвращает результаты по каждому элементу и данные корректных
+    элементов: списки (индекс, данные) для создания и изменения.
+    """
+    results = [None] * len(items)
+    creates, updates = [], []
+    update_ids = {
+        item['id'] for item in items
+        if isinstance(item, dict) and isinstance(item.get('id'), int)
+    }
+    existing = set(
+        Title.objects.filter(pk__in=update_ids).values_list('pk', flat=True)
+    )
+    # Один сериализатор на весь пакет, как в ListSerializer: поля
+    # не создаются заново для каждого элемента.
+    create_serializer = TitleWriteSerializer()
+    update_serializer = TitleWriteSerializer(partial=True)
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = {
+                'index': index,
+                'status': 'error',
+                'errors': {'non_field_errors': ['Ожидается объект.']}
+            }
+            continue
+        title_id = item.get('id')
+        if title_id is not None and title_id not in existing:
+            results[index] = {
+                'index': index,
+                'status': 'error',
+                'errors': {'id': [f'Произведение {title_id} не найдено.']}
+            }
+            continue
+        serializer = (
+            create_serializer if title_id is None else update_serializer
+        )
+        try:
+            data = serializer.run_validation(item)
+        except ValidationError as error:
+            results[index] = {
+                'index': index,
+                'status': 'error',
+                'errors': error.detail
+            }
+        else:
+            if title_id is None:
+                creates.append((index, data))
+            else:
+                updates.append((index, title_id, data))
+    return results, creates, updates
+
+
+def insert_titles(titles, batch_size):
+    """
+    Вставляет произведения и заполняет их id. Возвращает список id
+    произведений, для которых post_save не отправлялся.
+    SQLite не возвращает id из пакетной вставки, но держит блокировку
+    записи до конца транзакции, поэтому строки пакета получают подряд
+    идущие id, последний из которых — наибольший в таблице. Другие
+    БД без RETURNING могут чередовать вставки параллельных транзакций,
+    там произведения сохраняются по одному (с сигналами post_save).
+    """
+    can_return = connection.features.can_return_rows_from_bulk_insert
+    if can_return or connection.vendor == 'sqlite':
+        Title.objects.bulk_create(titles, batch_size=batch_size)
+        if not can_return:
+            last = Title.all_objects.aggregate(last=Max('pk'))['last']
+            for title_id, title in enumerate(
+                titles, start=last - len(titles) + 1
+            ):
+                title.pk = title_id
+        return [title.pk for title in titles]
+    for title in titles:
+        title.save()
+    return []
+
+
+def save_titles(creates, updates, batch_size=500):
+    """
+    Сохраняет проверенные произведения в одной транзакции:
+    пакетная вставка и изменение произведений, затем пакетное
+    удаление и вставка связей с жанрами.
+    Возвращает словарь индекс элемента -> id произведения.
+    """
+    through = Title.genre.through
+    saved = {}
+    links = []
+    with transaction.atomic():
+        titles = [
+            Title(**{
+                field: data[field] for field in TITLE_FIELDS if field in data
+            })
+            for _, data in creates
+        ]
+        bulk_created = []
+        if titles:
+            bulk_created = insert_titles(titles, batch_size)
+            for (index, data), title in zip(creates, titles):
+                saved[index] = title.pk
+                links.extend(
+                    through(title_id=title.pk, genre_id=genre.pk)
+                    for genre in data['genre']
+                )
+
+        changed_fields = set()
+        changed = Title.objects.in_bulk(
+            [title_id for _, title_id, _ in updates]
+        )
+        relinked = []
+        for index, title_id, data in updates:
+            title = changed[title_id]
+            for field in TITLE_FIELDS:
+                if field in data:
+                    setattr(title, field, data[field])
+                    changed_fields.add(field)
+            saved[index] = title_id
+            if 'genre' in data:
+                relinked.append(title_id)
+                links.extend(
+                    through(title_id=title_id, genre_id=genre.pk)
+                    for genre in data['genre']
+                )
+        if changed_fields:
+            Title.objects.bulk_update(
+                changed.values(), changed_fields, batch_size=batch_size
+            )
+        if relinked:
+            through.objects.filter(title_id__in=relinked).delete()
+        through.objects.bulk_create(
+            links, batch_size=batch_size, ignore_conflicts=True
+        )
+        updated_ids = [title_id for _, title_id, _ in updates]
+        titles_bulk_saved.send(
+            sender=Title, created=bulk_created, updated=updated_ids
+        )
+    return saved
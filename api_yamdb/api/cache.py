@@ -0,0 +1,215 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+TITLE_CACHE_KEY = 'title_response:{generation}:{pk}'
+TITLE_CACHE_GENERATION_KEY = 'title_response_generation'
+TITLE_LIST_CACHE_KEY = 'title_list_response:{generation}:{digest}'
+TITLE_LIST_GENERATION_KEY = 'title_list_response_generation'
+STATS_CACHE_KEY = 'stats_response:{generation}:{label}:{slug}'
+STATS_CACHE_GENERATION_KEY = 'stats_response_generation'
+LOCK_KEY = '{key}:lock'
+COUNTER_KEY = 'single_flight:{name}'
+COUNTERS = ('computed', 'coalesced', 'stale')
+
+
+def get_generation(key):
+    """
+    Поколение группы записей кеша: входит в ключи, поэтому его смена
+    сбрасывает все записи группы сразу.
+    """
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, 1, None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def increment(key, value=1):
+    """Увеличивает общий для всех процессов счетчик в кеше."""
+    if not value:
+        return
+    try:
+        cache.incr(key, value)
+    except ValueError:
+        if not cache.add(key, value, None):
+            cache.incr(key, value)
+
+
+def count(name, value=1):
+    increment(COUNTER_KEY.format(name=name), value)
+
+
+def single_flight_stats():
+    """Значения счетчиков: пересчеты, объединенные и устаревшие ответы."""
+    values = cache.get_many(
+        [COUNTER_KEY.format(name=name) for name in COUNTERS]
+    )
+    return {
+        name: values.get(COUNTER_KEY.format(name=name), 0)
+        for name in COUNTERS
+    }
+
+
+def store(keys, values, timeout):
+    """
+    Сохраняет значения вместе со сроком свежести. Записи живут в кеше
+    дольше на SINGLE_FLIGHT_STALE_TIMEOUT и в это время отдаются
+    как устаревшие, пока один процесс их пересчитывает.
+    """
+    fresh_until = time.time() + timeout
+    cache.set_many(
+        {keys[pk]: (value, fresh_until) for pk, value in values.items()},
+        timeout + settings.SINGLE_FLIGHT_STALE_TIMEOUT
+    )
+
+
+def get_or_compute_many(keys, compute, timeout):
+    """
+    Single-flight чтение группы записей кеша.
+    keys — словарь id -> ключ, compute(ids) возвращает словарь id -> значение
+    для существующих объектов. Отсутствующую или устаревшую запись
+    пересчитывает только процесс, захвативший блокировку ключа;
+    остальные получают устаревшее значение или ждут результата.
+    Возвращает словарь id -> значение.
+    """
+    entries = cache.get_many(keys.values())
+    now = time.time()
+    found, expired, absent = {}, [], []
+    for pk, key in keys.items():
+        entry = entries.get(key)
+        if entry is None:
+            absent.append(pk)
+            continue
+        found[pk], fresh_until = entry
+        if fresh_until <= now:
+            expired.append(pk)
+    own = [
+        pk for pk in expired + absent
+        if cache.add(
+            LOCK_KEY.format(key=keys[pk]), 1,
+            settings.SINGLE_FLIGHT_LOCK_TIMEOUT
+        )
+    ]
+    count('stale', len(expired) - len(set(expired) & set(own)))
+    waiting = [pk for pk in absent if pk not in own]
+    if own:
+        found.update(compute_and_store(keys, own, compute, timeout))
+    if waiting:
+        ready = wait_for(keys, waiting)
+        count('coalesced', len(ready))
+        found.update(ready)
+        rest = [pk for pk in waiting if pk not in ready]
+        if rest:
+            values = compute(rest)
+            count('computed', len(rest))
+            found.update(values)
+    return found
+
+
+def compute_and_store(keys, ids, compute, timeout):
+    try:
+        values = compute(ids)
+        count('computed', len(ids))
+        store(keys, values, timeout)
+    finally:
+        cache.delete_many([LOCK_KEY.format(key=keys[pk]) for pk in ids])
+    return values
+
+
+def wait_for(keys, ids):
+    """
+    Ждет, пока другой процесс сохранит записи или снимет блокировки.
+    Возвращает словарь id -> значение для дождавшихся записей.
+    """
+    deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT_TIMEOUT
+    ready = {}
+    pending = list(ids)
+    while pending and time.monotonic() < deadline:
+        time.sleep(settings.SINGLE_FLIGHT_POLL_INTERVAL)
+        entries = cache.get_many([keys[pk] for pk in pending])
+        locks = cache.get_many(
+            [LOCK_KEY.format(key=keys[pk]) for pk in pending]
+        )
+        for pk in list(pending):
+            entry = entries.get(keys[pk])
+            if entry is not None:
+                ready[pk] = entry[0]
+            elif LOCK_KEY.format(key=keys[pk]) in locks:
+                continue
+            pending.remove(pk)
+    return ready
+
+
+def single_flight(key, compute, timeout):
+    """Single-flight чтение одной записи кеша; compute() без аргументов."""
+    return get_or_compute_many(
+        {key: key}, lambda ids: {key: compute()}, timeout
+    )[key]
+
+
+def title_cache_keys(ids):
+    generation = get_generation(TITLE_CACHE_GENERATION_KEY)
+    return {
+        pk: TITLE_CACHE_KEY.format(generation=generation, pk=pk)
+        for pk in ids
+    }
+
+
+def get_titles(ids, compute):
+    """
+    Ответы по произведениям из кеша; недостающие вычисляются
+    compute(ids) -> словарь id -> ответ.
+    """
+    return get_or_compute_many(
+        title_cache_keys(ids), compute, settings.TITLE_CACHE_TIMEOUT
+    )
+
+
+def invalidate_titles(ids):
+    cache.delete_many(title_cache_keys(ids).values())
+
+
+def invalidate_all_titles():
+    bump_generation(TITLE_CACHE_GENERATION_KEY)
+
+
+def get_title_list(base_url, params, compute):
+    """
+    Страница списка произведений из кеша. Ключ строится по адресу
+    и нормализованным параметрам запроса; смена поколения коллекции
+    сбрасывает все страницы.
+    """
+    digest = hashlib.md5(repr((base_url, params)).encode()).hexdigest()
+    key = TITLE_LIST_CACHE_KEY.format(
+        generation=get_generation(TITLE_LIST_GENERATION_KEY),
+        digest=digest
+    )
+    return single_flight(key, compute, settings.TITLE_LIST_CACHE_TIMEOUT)
+
+
+def invalidate_title_lists():
+    bump_generation(TITLE_LIST_GENERATION_KEY)
+
+
+def get_stats(model, slug, compute):
+    """Ответ со статистикой категории или жанра из кеша."""
+    key = STATS_CACHE_KEY.format(
+        generation=get_generation(STATS_CACHE_GENERATION_KEY),
+        label=model._meta.model_name,
+        slug=slug
+    )
+    return single_flight(key, compute, settings.STATS_CACHE_TIMEOUT)
+
+
+def invalidate_stats():
+    bump_generation(STATS_CACHE_GENERATION_KEY)
@@ -1,6 +1,10 @@
 import django_filters
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Length
+from rest_framework.filters import SearchFilter
 
 from reviews.models import Title
+from reviews.trigrams import search_titles, trigrams
 
 
 class TitleFilter(django_filters.FilterSet):
@@ -24,3 +28,64 @@ class TitleFilter(django_filters.FilterSet):
     class Meta:
         model = Title
         fields = ['genre', 'category', 'year', 'name']
+
+
+def prefix_range(prefix):
+    """
+    Границы диапазона строк с данным префиксом: [prefix, upper).
+    Сравнение по диапазону использует обычный индекс столбца.
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class UserSearchFilter(SearchFilter):
+    """
+    Поиск пользователей по началу имени или почты без учета регистра
+    по индексированным столбцам username_lower и email_lower.
+    С параметром ?search_mode=contains выполняется поиск по подстроке.
+    """
+    search_mode_param = 'search_mode'
+
+    def filter_queryset(self, request, queryset, view):
+        mode = request.query_params.get(self.search_mode_param, 'prefix')
+        if mode == 'contains':
+            return super().filter_queryset(request, queryset, view)
+        for term in self.get_search_terms(request):
+            lower, upper = prefix_range(term.lower())
+            queryset = queryset.filter(
+                Q(username_lower__gte=lower, username_lower__lt=upper)
+                | Q(email_lower__gte=lower, email_lower__lt=upper)
+            )
+        return queryset
+
+
+class TitleSearchFilter(SearchFilter):
+    """
+    Поиск произведений по названию. С параметром ?search_mode=fuzzy
+    выполняется нечеткий поиск по индексу триграмм: результаты
+    упорядочены по сходству с запросом, затем короткие названия
+    (совпавшее слово занимает в них большую часть), затем по рейтингу.
+    """
+    search_mode_param = 'search_mode'
+
+    def filter_queryset(self, request, queryset, view):
+        if request.query_params.get(self.search_mode_param) != 'fuzzy':
+            return super().filter_queryset(request, queryset, view)
+        query = request.query_params.get(self.search_param, '')
+        if not trigrams(query):
+            # Пустой запрос, как и в обычном поиске, не фильтрует список.
+            return queryset
+        similarities = search_titles(query)
+        if not similarities:
+            return queryset.none()
+        return queryset.filter(
+            pk__in=[pk for pk, _ in similarities]
+        ).annotate(similarity=Case(
+            *(When(pk=pk, then=Value(similarity))
+              for pk, similarity in similarities),
+            output_field=FloatField()
+        )).order_by(
+            '-similarity',
+            Length('name'),
+            F('rating_stats__average').desc(nulls_last=True)
+        )
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from api.warmup import warm_cache
+from reviews.versions import cache_is_shared
+
+
+class Command(BaseCommand):
+    """Прогрев кеша ответов API после развертывания."""
+
+    help = (
+        'Заполняет общий кеш ответов самых обсуждаемых произведений '
+        'и первых страниц списка по категориям и жанрам.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=settings.CACHE_WARM_TOP_TITLES,
+            help='Количество произведений с наибольшим числом отзывов.'
+        )
+        parser.add_argument(
+            '--pages',
+            type=int,
+            default=settings.CACHE_WARM_PAGES,
+            help='Количество первых страниц списка на каждый фильтр.'
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=settings.CACHE_WARM_THREADS,
+            help='Количество потоков.'
+        )
+        parser.add_argument(
+            '--base-url',
+            default=settings.CACHE_WARM_BASE_URL,
+            help='Адрес сайта, по которому обращаются клиенты.'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Прогреть кеш, даже если он не общий между процессами.'
+        )
+
+    def handle(self, *args, **options):
+        if not cache_is_shared() and not options['force']:
+            # Кеш команды не увидит ни один WSGI-процесс.
+            raise CommandError(
+                'Кеш хранится в памяти процесса: прогрев командой не '
+                'дойдет до WSGI-процессов. Включите CACHE_WARM_ON_STARTUP '
+                'или укажите --force.'
+            )
+        results, duration = warm_cache(
+            options['top'],
+            options['pages'],
+            options['threads'],
+            options['base_url']
+        )
+        errors = 0
+        for name, seconds, error in results:
+            if error is not None:
+                errors += 1
+                self.stderr.write(f'{name}: {error}')
+            elif options['verbosity'] > 1:
+                self.stdout.write(f'{name}: {seconds:.3f} с')
+        self.stdout.write(self.style.SUCCESS(
+            f'Кеш прогрет за {duration:.3f} с: задач {len(results)}, '
+            f'ошибок {errors}'
+        ))
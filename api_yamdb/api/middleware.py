@@ -0,0 +1,107 @@
+import gzip
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSED_CACHE_KEY = 'compressed_response:{encoding}:{digest}'
+
+
+def compress_gzip(content):
+    # mtime=0 делает результат детерминированным для одинакового содержимого.
+    return gzip.compress(content, compresslevel=6, mtime=0)
+
+
+def compress_brotli(content):
+    return brotli.compress(content, quality=5)
+
+
+COMPRESSORS = {'gzip': compress_gzip}
+if brotli is not None:
+    COMPRESSORS = {'br': compress_brotli, **COMPRESSORS}
+
+
+def accepted_encodings(header):
+    """Кодировки из заголовка Accept-Encoding с ненулевым q."""
+    encodings = set()
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        if quality > 0:
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+def choose_encoding(header):
+    """Первая поддерживаемая кодировка в порядке предпочтения сервера."""
+    accepted = accepted_encodings(header)
+    for encoding in COMPRESSORS:
+        if encoding in accepted or '*' in accepted:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Сжатие ответов API (brotli, если установлен, иначе gzip).
+    Ответы меньше API_COMPRESS_MIN_SIZE байт не сжимаются. Если ответ
+    собран из кеша ответов (помечен атрибутом api_cache_key), сжатые
+    байты тоже кешируются по хешу содержимого.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.should_compress(request, response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoding is None:
+            return response
+        response.content = self.compress(
+            response.content, encoding,
+            getattr(response, 'api_cache_key', None)
+        )
+        response['Content-Encoding'] = encoding
+        response['Content-Length'] = str(len(response.content))
+        return response
+
+    @staticmethod
+    def should_compress(request, response):
+        return (
+            request.path.startswith('/api/')
+            and not response.streaming
+            and response.status_code == 200
+            and not response.has_header('Content-Encoding')
+            and len(response.content) >= settings.API_COMPRESS_MIN_SIZE
+        )
+
+    @staticmethod
+    def compress(content, encoding, api_cache_key):
+        if api_cache_key is None:
+            return COMPRESSORS[encoding](content)
+        digest = hashlib.md5(
+            api_cache_key.encode() + b'\0' + content
+        ).hexdigest()
+        key = COMPRESSED_CACHE_KEY.format(encoding=encoding, digest=digest)
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = COMPRESSORS[encoding](content)
+            cache.set(key, compressed, settings.API_COMPRESS_CACHE_TIMEOUT)
+        return compressed
@@ -0,0 +1,65 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class UsernameCursorPagination(CursorPagination):
+    """Курсорная пагинация по уникальному индексированному username."""
+    ordering = 'username'
+
+
+class UserPagination(PageNumberPagination):
+    """
+    Постраничная пагинация списка пользователей; с параметром ?cursor=
+    или ?pagination=cursor — курсорная по username, без подсчета
+    количества и смещения OFFSET.
+    """
+
+    def __init__(self):
+        self.cursor_pagination = UsernameCursorPagination()
+        self.use_cursor = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_cursor = (
+            'cursor' in request.query_params
+            or request.query_params.get('pagination') == 'cursor'
+        )
+        if self.use_cursor:
+            return self.cursor_pagination.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.use_cursor:
+            return self.cursor_pagination.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TitlePagination(PageNumberPagination):
+    """
+    Постраничная пагинация произведений. Если задан base_url, ссылки
+    next/previous строятся от него, а не от адреса запроса: закешированная
+    страница не должна содержать параметры, не входящие в ключ кеша.
+    """
+    base_url = None
+
+    def get_base_url(self):
+        return self.base_url or self.request.build_absolute_uri()
+
+    def get_next_link(self):
+        if not self.page.has_next():
+            return None
+        return replace_query_param(
+            self.get_base_url(),
+            self.page_query_param,
+            self.page.next_page_number()
+        )
+
+    def get_previous_link(self):
+        if not self.page.has_previous():
+            return None
+        url = self.get_base_url()
+        page_number = self.page.previous_page_number()
+        if page_number == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, page_number)
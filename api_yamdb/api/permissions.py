@@ -1,5 +1,8 @@
 from rest_framework import permissions
 
+# Разрешения используют только id, роль и is_superuser пользователя,
+# поэтому работают и с api.authentication.ClaimsUser без загрузки из БД.
+
 
 class IsAdminOrReadOnly(permissions.BasePermission):
     """Проверка прав администратора."""
@@ -23,7 +26,7 @@ class IsStaffOrAuthorOrReadOnly(permissions.BasePermission):
                 or request.user.is_superuser
                 or request.user.is_admin
                 or request.user.is_moderator
-                or request.user == obj.author
+                or obj.author_id == request.user.id
                 )
 
 
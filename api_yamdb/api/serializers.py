@@ -1,11 +1,49 @@
 from django.core.validators import RegexValidator
+from django.db import transaction
+from django.db.models import Manager
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
+from reviews.dictionaries import attach_genre_ids, categories, genres
 from reviews.models import Category, Genre, Title, Comment, Review, User
 from reviews import constants
 
 
+def parse_list_param(request, name):
+    """
+    Значения параметра запроса через запятую.
+    Возвращает None, если параметр не передан или запрос не на чтение.
+    """
+    if request is None or request.method != 'GET':
+        return None
+    if name not in request.query_params:
+        return None
+    return {
+        value.strip() for value in request.query_params[name].split(',')
+        if value.strip()
+    }
+
+
+class SparseFieldsMixin:
+    """
+    Ограничение полей ответа параметром ?fields= и подключение
+    дополнительных полей из Meta.expandable_fields параметром ?expand=.
+    Дополнительные поля без запроса не выводятся.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        requested = parse_list_param(request, 'fields')
+        expanded = parse_list_param(request, 'expand') or set()
+        for name in getattr(self.Meta, 'expandable_fields', ()):
+            if name not in expanded:
+                self.fields.pop(name, None)
+        if requested is not None:
+            for name in set(self.fields) - requested - expanded:
+                self.fields.pop(name)
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Сериализатор пользователя."""
     username = serializers.CharField(
@@ -13,14 +51,14 @@ class UserSerializer(serializers.ModelSerializer):
         required=True,
         validators=[
             RegexValidator(r'^[\w.@+-]+\Z'),
-            UniqueValidator(queryset=User.objects.all())
+            UniqueValidator(queryset=User.all_objects.all())
         ]
     )
 
     email = serializers.EmailField(
         max_length=constants.EMAIL_LENGHT,
         required=True,
-        validators=[UniqueValidator(queryset=User.objects.all())]
+        validators=[UniqueValidator(queryset=User.all_objects.all())]
     )
 
     class Meta:
@@ -54,18 +92,22 @@ class SignUpSerializer(serializers.Serializer):
     email = serializers.EmailField(max_length=constants.EMAIL_LENGHT)
 
     def validate(self, data):
-        if User.objects.filter(email=data['email']).exists():
-            user = User.objects.get(email=data['email'])
+        if User.all_objects.filter(email=data['email']).exists():
+            user = User.all_objects.get(email=data['email'])
             if user.username != data['username']:
                 raise serializers.ValidationError(
                     f'Неверный username для почты {user.email}'
                 )
-        if User.objects.filter(username=data['username']).exists():
-            user = User.objects.get(username=data['username'])
+        if User.all_objects.filter(username=data['username']).exists():
+            user = User.all_objects.get(username=data['username'])
             if user.email != data['email']:
                 raise serializers.ValidationError(
                     f'Неверный email для пользователя {user.username}'
                 )
+            if user.deleted_at is not None:
+                raise serializers.ValidationError(
+                    f'Пользователь {user.username} удаляется'
+                )
         return data
 
     def validate_username(self, data):
@@ -105,19 +147,169 @@ class GenreSerializer(serializers.ModelSerializer):
         lookup_field = 'slug'
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class CachedDictionaryField(serializers.Field):
+    """
+    Вложенный объект справочника (категории или жанра) только для чтения.
+    Объекты берутся из кеша справочника по id, без запросов к БД.
+    """
+
+    def __init__(self, dictionary, serializer_class, many=False, **kwargs):
+        kwargs['read_only'] = True
+        self.dictionary = dictionary
+        self.serializer_class = serializer_class
+        self.many = many
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not self.many:
+            obj = self.dictionary.get(value)
+            return self.serializer_class(obj).data if obj else None
+        return [
+            self.serializer_class(obj).data
+            for obj in map(self.dictionary.get, value) if obj is not None
+        ]
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """Поле slug справочника, который проверяется по кешу без запросов."""
+
+    def __init__(self, dictionary, **kwargs):
+        self.dictionary = dictionary
+        kwargs.setdefault('slug_field', 'slug')
+        kwargs.setdefault('queryset', dictionary.model.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        obj = (
+            self.dictionary.get_by_slug(data)
+            if isinstance(data, str) else None
+        )
+        if obj is None:
+            self.fail('does_not_exist', slug_name=self.slug_field, value=data)
+        return obj
+
+
+class GenreSlugsField(serializers.ListField):
+    """
+    Список slug жанров произведения.
+    Все slug проверяются разом, в ошибке перечисляются неизвестные.
+    Возвращает список объектов Genre в порядке передачи.
+    """
+    child = serializers.SlugField()
+    default_error_messages = {
+        'unknown': 'Жанры не найдены: {slugs}.',
+    }
+
+    def get_attribute(self, instance):
+        if not hasattr(instance, 'genre_ids'):
+            attach_genre_ids([instance])
+        return instance.genre_ids
+
+    def to_internal_value(self, data):
+        slugs = list(dict.fromkeys(super().to_internal_value(data)))
+        found = genres.get_many_by_slug(slugs)
+        unknown = [slug for slug in slugs if slug not in found]
+        if unknown:
+            self.fail('unknown', slugs=', '.join(unknown))
+        return [found[slug] for slug in slugs]
+
+    def to_representation(self, data):
+        return [
+            obj.slug for obj in map(genres.get, data) if obj is not None
+        ]
+
+
+class CatalogStatsSerializer(serializers.Serializer):
+    """
+    Сериализатор статистики категории или жанра.
+    Если статистика еще не рассчитана, возвращаются нулевые значения.
+    """
+    name = serializers.SerializerMethodField()
+    slug = serializers.SerializerMethodField()
+    titles_count = serializers.IntegerField(default=0)
+    reviews_count = serializers.IntegerField(default=0)
+    average_rating = serializers.FloatField(default=None)
+    min_year = serializers.IntegerField(default=None)
+    max_year = serializers.IntegerField(default=None)
+    updated_at = serializers.DateTimeField(default=None)
+
+    def get_name(self, obj):
+        return self.context['group'].name
+
+    def get_slug(self, obj):
+        return self.context['group'].slug
+
+
+class TitleListSerializer(serializers.ListSerializer):
+    """Список произведений: жанры всех произведений загружаются сразу."""
+
+    def to_representation(self, data):
+        titles = data.all() if isinstance(data, Manager) else data
+        if 'genre' in self.child.fields:
+            titles = attach_genre_ids(titles)
+        return super().to_representation(titles)
+
+
+class TitleReadSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели Title (чтение данных).
     Этот сериализатор преобразует объект произведения в формат JSON, включая
     информацию о категории и жанре. Рейтинг возвращается в виде целого числа.
+    Категория и жанры берутся из кеша справочников.
+    По запросу ?expand=reviews_count возвращается число отзывов.
     """
-    category = CategorySerializer(read_only=True)
-    genre = GenreSerializer(read_only=True, many=True)
+    category = CachedDictionaryField(
+        categories, CategorySerializer, source='category_id'
+    )
+    genre = CachedDictionaryField(
+        genres, GenreSerializer, many=True, source='genre_ids'
+    )
     rating = serializers.IntegerField(read_only=True, default=0)
+    reviews_count = serializers.IntegerField(read_only=True, default=0)
 
     class Meta:
-        fields = '__all__'
+        # Пометка на удаление ставится только через DELETE.
+        exclude = ('deleted_at',)
         model = Title
+        list_serializer_class = TitleListSerializer
+        expandable_fields = ('reviews_count',)
+
+    def to_representation(self, instance):
+        if 'genre' in self.fields and not hasattr(instance, 'genre_ids'):
+            attach_genre_ids([instance])
+        return super().to_representation(instance)
+
+
+class TitleTopSerializer(TitleReadSerializer):
+    """
+    Сериализатор списка лучших произведений.
+    Дополнительно возвращает взвешенный рейтинг, по которому идет сортировка.
+    """
+    weighted_rating = serializers.FloatField(read_only=True)
+
+
+class TitleTrendingSerializer(TitleReadSerializer):
+    """
+    Сериализатор списка популярных произведений.
+    Дополнительно возвращает текущую популярность произведения.
+    """
+    trending_score = serializers.FloatField(read_only=True)
+
+
+class TitleSimilarSerializer(TitleReadSerializer):
+    """
+    Сериализатор списка похожих произведений.
+    Дополнительно возвращает меру похожести на исходное произведение.
+    """
+    similarity = serializers.FloatField(read_only=True)
+
+
+class TitleRecommendationSerializer(TitleReadSerializer):
+    """
+    Сериализатор персональных рекомендаций.
+    Дополнительно возвращает релевантность произведения для пользователя.
+    """
+    relevance = serializers.FloatField(read_only=True)
 
 
 class TitleWriteSerializer(serializers.ModelSerializer):
@@ -126,32 +318,45 @@ class TitleWriteSerializer(serializers.ModelSerializer):
     Этот сериализатор используется для преобразования данных произведения
     в формат JSON при записи в базу данных.
     """
-    category = serializers.SlugRelatedField(
-        queryset=Category.objects.all(),
-        slug_field='slug'
-    )
-    genre = serializers.SlugRelatedField(
-        queryset=Genre.objects.all(),
-        slug_field='slug',
-        many=True
-    )
+    category = CachedSlugRelatedField(categories)
+    genre = GenreSlugsField()
 
     class Meta:
-        fields = '__all__'
+        exclude = ('deleted_at',)
         model = Title
 
+    @transaction.atomic
+    def create(self, validated_data):
+        genre = validated_data.pop('genre')
+        title = super().create(validated_data)
+        title.set_genres([obj.pk for obj in genre], created=True)
+        return title
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        genre = validated_data.pop('genre', None)
+        title = super().update(instance, validated_data)
+        if genre is not None:
+            title.set_genres([obj.pk for obj in genre])
+        return title
 
-class ReviewSerializer(serializers.ModelSerializer):
-    """Сериализатор для модели Review."""
+
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Сериализатор для модели Review.
+    По запросу ?expand=comments_count возвращается число комментариев.
+    """
 
     author = serializers.StringRelatedField(
         read_only=True
     )
+    comments_count = serializers.IntegerField(read_only=True, default=0)
 
     class Meta:
         model = Review
         fields = (
-            'id', 'text', 'author', 'score', 'pub_date')
+            'id', 'text', 'author', 'score', 'pub_date', 'comments_count')
+        expandable_fields = ('comments_count',)
 
     def validate(self, data):
         """Запрещает пользователям оставлять повторные отзывы."""
@@ -159,14 +364,16 @@ class ReviewSerializer(serializers.ModelSerializer):
             return data
         author = self.context.get('request').user
         title_id = self.context.get('view').kwargs.get('title_id')
-        if Review.objects.filter(author=author, title=title_id).exists():
+        if Review.objects.filter(
+            author_id=author.id, title=title_id
+        ).exists():
             raise serializers.ValidationError(
                 'У вас уже есть отзыв на это произведение'
             )
         return data
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор объектов класса Comment."""
 
     author = serializers.StringRelatedField(
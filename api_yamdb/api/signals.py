@@ -0,0 +1,74 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, Review, Title, User
+from .authentication import invalidate_token_version
+from reviews.signals import (catalog_stats_refreshed, reviews_bulk_deleted,
+                             titles_bulk_saved)
+from .cache import (invalidate_all_titles, invalidate_stats,
+                    invalidate_title_lists, invalidate_titles)
+
+
+@receiver((post_save, post_delete), sender=Title)
+def title_changed(sender, instance, **kwargs):
+    """
+    Сбрасывает кеш ответа произведения после фиксации транзакции:
+    жанры сохраняются уже после post_save.
+    """
+    transaction.on_commit(partial(invalidate_titles, [instance.pk]))
+    transaction.on_commit(invalidate_title_lists)
+
+
+@receiver((post_save, post_delete), sender=Review)
+def title_rating_changed(sender, instance, **kwargs):
+    """
+    Изменение отзыва меняет рейтинг произведения в ответе
+    и порядок произведений в списке.
+    """
+    if instance.title_id:
+        transaction.on_commit(
+            partial(invalidate_titles, [instance.title_id])
+        )
+    transaction.on_commit(invalidate_title_lists)
+
+
+@receiver((post_save, post_delete), sender=Category)
+@receiver((post_save, post_delete), sender=Genre)
+def title_dictionary_changed(sender, **kwargs):
+    """
+    Категории и жанры входят в ответы всех произведений
+    и в ответы со статистикой.
+    """
+    transaction.on_commit(invalidate_all_titles)
+    transaction.on_commit(invalidate_title_lists)
+    transaction.on_commit(invalidate_stats)
+
+
+@receiver(titles_bulk_saved)
+def titles_bulk_changed(sender, created, updated, **kwargs):
+    transaction.on_commit(
+        partial(invalidate_titles, [*created, *updated])
+    )
+    transaction.on_commit(invalidate_title_lists)
+
+
+@receiver(reviews_bulk_deleted)
+def reviews_bulk_changed(sender, title_ids, **kwargs):
+    transaction.on_commit(
+        partial(invalidate_titles, [pk for pk in title_ids if pk])
+    )
+    transaction.on_commit(invalidate_title_lists)
+
+
+@receiver(catalog_stats_refreshed)
+def stats_refreshed(sender, **kwargs):
+    invalidate_stats()
+
+
+@receiver((post_save, post_delete), sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Сбрасывает закешированную версию токенов пользователя."""
+    transaction.on_commit(partial(invalidate_token_version, instance.pk))
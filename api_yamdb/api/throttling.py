@@ -0,0 +1,133 @@
+import hashlib
+
+from django.core.cache import cache
+from rest_framework.throttling import SimpleRateThrottle
+
+from .cache import increment
+
+METRIC_KEY = 'throttle_metric:{scope}:{result}'
+
+
+class TokenBucketRateThrottle(SimpleRateThrottle):
+    """
+    Ограничение частоты запросов, приближающее token bucket скользящим
+    окном. Ставка из DEFAULT_THROTTLE_RATES задает емкость и скорость
+    пополнения: '10/min' — до 10 запросов подряд и 10 новых запросов
+    в минуту. Запросы считаются счетчиком текущего окна длиной duration,
+    счетчик прошлого окна учитывается с весом, убывающим по мере
+    прохождения текущего. Счетчик увеличивается атомарно (cache.incr),
+    поэтому параллельные запросы не пропускаются сверх ставки;
+    проверка выполняется за O(1) без обращений к БД.
+    """
+
+    window_key = '{key}:{window}'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        now = self.timer()
+        window, elapsed = divmod(now, self.duration)
+        current = self.window_key.format(key=self.key, window=int(window))
+        # Счетчик окна нужен и в следующем окне как прошлый.
+        self.cache.add(current, 0, 2 * self.duration)
+        used = self.cache.incr(current)
+        previous = self.cache.get(
+            self.window_key.format(key=self.key, window=int(window) - 1), 0
+        )
+        weight = 1 - elapsed / self.duration
+        if previous * weight + used > self.num_requests:
+            # Отклоненный запрос не расходует ставку.
+            self.cache.decr(current)
+            if used > self.num_requests or not previous:
+                self.wait_seconds = self.duration - elapsed
+            else:
+                self.wait_seconds = max(0, self.duration * (
+                    1 - (self.num_requests - used) / previous
+                ) - elapsed)
+            increment(METRIC_KEY.format(scope=self.scope, result='throttled'))
+            return False
+        increment(METRIC_KEY.format(scope=self.scope, result='allowed'))
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPRateThrottle(TokenBucketRateThrottle):
+    """Ограничение по IP-адресу клиента."""
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope, 'ident': self.get_ident(request)
+        }
+
+
+class UsernameRateThrottle(TokenBucketRateThrottle):
+    """
+    Ограничение по имени пользователя из тела запроса.
+    Имя хешируется: в ключе кеша не должно быть произвольных символов.
+    """
+
+    def get_cache_key(self, request, view):
+        data = request.data
+        username = data.get('username') if hasattr(data, 'get') else None
+        if not isinstance(username, str) or not username:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': hashlib.md5(username.lower().encode()).hexdigest()
+        }
+
+
+class SignupIPRateThrottle(IPRateThrottle):
+    scope = 'signup_ip'
+
+
+class SignupUsernameRateThrottle(UsernameRateThrottle):
+    scope = 'signup_username'
+
+
+class TokenIPRateThrottle(IPRateThrottle):
+    scope = 'token_ip'
+
+
+class TokenUsernameRateThrottle(UsernameRateThrottle):
+    scope = 'token_username'
+
+
+class WriteUserRateThrottle(TokenBucketRateThrottle):
+    """Ограничение создания отзывов и комментариев по пользователю."""
+    scope = 'write_user'
+
+    def get_cache_key(self, request, view):
+        if request.method != 'POST' or not request.user.is_authenticated:
+            return None
+        return self.cache_format % {
+            'scope': self.scope, 'ident': request.user.pk
+        }
+
+
+THROTTLE_SCOPES = (
+    SignupIPRateThrottle.scope,
+    SignupUsernameRateThrottle.scope,
+    TokenIPRateThrottle.scope,
+    TokenUsernameRateThrottle.scope,
+    WriteUserRateThrottle.scope,
+)
+
+
+def throttle_stats():
+    """Количество пропущенных и отклоненных запросов по областям."""
+    keys = {
+        (scope, result): METRIC_KEY.format(scope=scope, result=result)
+        for scope in THROTTLE_SCOPES
+        for result in ('allowed', 'throttled')
+    }
+    values = cache.get_many(keys.values())
+    stats = {scope: {} for scope in THROTTLE_SCOPES}
+    for (scope, result), key in keys.items():
+        stats[scope][result] = values.get(key, 0)
+    return stats
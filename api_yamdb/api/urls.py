@@ -6,7 +6,10 @@ from api.views import (
     GenreViewSet,
     TitleViewSet,
     ReviewViewSet,
+    ChangesView,
     CommentViewSet,
+    ExportView,
+    SearchView,
     SignupUser,
     Token,
     UserViewSet
@@ -31,5 +34,8 @@ router_v1.register('users', UserViewSet, 'users')
 urlpatterns = [
     path('v1/', include(router_v1.urls)),
     path('v1/auth/signup/', SignupUser.as_view(), name='signup'),
-    path('v1/auth/token/', Token.as_view(), name='token')
+    path('v1/auth/token/', Token.as_view(), name='token'),
+    path('v1/export/<str:table>/', ExportView.as_view(), name='export'),
+    path('v1/changes/', ChangesView.as_view(), name='changes'),
+    path('v1/search/', SearchView.as_view(), name='search'),
 ]
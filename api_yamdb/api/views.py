@@ -1,22 +1,27 @@
+import re
+from urllib.parse import urlencode
+
 from django.conf import settings
-from django.core.mail import send_mail
-from django.contrib.auth.tokens import default_token_generator
-from django.db.models import Avg
+from django.db.models import Avg, Count, F, Q
+from django.db.models.functions import Coalesce
 from django_filters import rest_framework
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import NotFound
-from rest_framework.filters import SearchFilter
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework.views import APIView
 
 from api.serializers import (
     CategorySerializer,
     GenreSerializer,
     TitleReadSerializer,
+    TitleTopSerializer,
+    TitleTrendingSerializer,
+    TitleSimilarSerializer,
+    TitleRecommendationSerializer,
     TitleWriteSerializer,
     CommentSerializer,
     ReviewSerializer,
@@ -25,30 +30,53 @@ from api.serializers import (
     UserSerializer,
     EditUserSerializer
 )
-from reviews.models import Category, Genre, Title, Review, User
-from .base_views import BaseCategoryGenreViewSet
-from .filters import TitleFilter
+from reviews.autocomplete import title_names
+from reviews.changes import read_changes
+from reviews.confirmation import check_confirmation_code
+from reviews.deletion import mark_for_deletion
+from reviews.dictionaries import attach_genre_ids
+from reviews.export import EXPORT_FORMATS, EXPORT_TABLES, export_lines
+from reviews.jobs import submit
+from reviews.models import (VISIBLE_COMMENTS, VISIBLE_REVIEWS, Category,
+                            Comment, ConfirmationCode, Genre, Title, Review,
+                            User)
+from reviews.recommendations import recommend_titles
+from reviews.search import SEARCH_TYPES, search_texts
+from reviews.similarity import get_similar_titles
+from .cache import get_title_list, get_titles
+from .authentication import access_token_for_user
+from .base_views import BaseCategoryGenreViewSet, SparseFieldsViewMixin
+from .bulk import save_titles, validate_titles
+from .filters import TitleFilter, TitleSearchFilter, UserSearchFilter
+from .pagination import TitlePagination, UserPagination
+from .parsers import NDJSONParser
 from .permissions import (
     IsAdminOrReadOnly,
     IsAdminOrSuperUser,
     IsAuthorOrReadOnly, IsStaffOrAuthorOrReadOnly
 )
+from .throttling import (
+    SignupIPRateThrottle,
+    SignupUsernameRateThrottle,
+    TokenIPRateThrottle,
+    TokenUsernameRateThrottle,
+    WriteUserRateThrottle
+)
+
+# Идентификатор в запросе: str.isdigit() пропускает цифры вроде '²',
+# которые int() не разбирает.
+ID_PATTERN = re.compile(r'[0-9]+')
 
 
 class SignupUser(APIView):
     """Отправка кода подтверждения на почту."""
+    throttle_classes = (SignupIPRateThrottle, SignupUsernameRateThrottle)
 
     def post(self, request):
         serializer = SignUpSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user, _ = User.objects.get_or_create(**serializer.validated_data)
-        confirmation_code = default_token_generator.make_token(user)
-        send_mail(
-            subject='Confirmation code from YamDB',
-            message=f'code_confirmation {confirmation_code}',
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-        )
+        submit('send_confirmation_code', {'user_id': user.pk})
         return Response(
             {
                 'username': user.username,
@@ -60,16 +88,21 @@ class SignupUser(APIView):
 
 class Token(APIView):
     """Выдача токена после отправки кода подтверждения."""
+    throttle_classes = (TokenIPRateThrottle, TokenUsernameRateThrottle)
 
     def post(self, request):
         serializer = TokenSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         username = serializer.validated_data['username']
-        user = get_object_or_404(User, username=username)
         confirmation_code = serializer.validated_data['confirmation_code']
-        if default_token_generator.check_token(user, confirmation_code):
+        try:
+            user = check_confirmation_code(username, confirmation_code)
+        except ConfirmationCode.DoesNotExist:
+            get_object_or_404(User, username=username)
+            user = None
+        if user is not None:
             return Response(
-                {'Token': str(AccessToken.for_user(user))},
+                {'Token': str(access_token_for_user(user))},
                 status=status.HTTP_200_OK
             )
         return Response(
@@ -78,17 +111,154 @@ class Token(APIView):
         )
 
 
+class ExportView(APIView):
+    """
+    Потоковая выгрузка таблицы в формате CSV или NDJSON.
+    Строки читаются из БД порциями и сразу отправляются клиенту.
+    """
+    permission_classes = (IsAdminOrSuperUser,)
+    content_types = {
+        'csv': 'text/csv; charset=utf-8',
+        'ndjson': 'application/x-ndjson; charset=utf-8',
+    }
+
+    def get(self, request, table):
+        if table not in EXPORT_TABLES:
+            raise NotFound(f'Таблица {table} не найдена.')
+        export_format = request.query_params.get('output', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {'output': f'Допустимые форматы: {", ".join(EXPORT_FORMATS)}.'}
+            )
+        response = StreamingHttpResponse(
+            export_lines(table, export_format),
+            content_type=self.content_types[export_format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{table}.{export_format}"'
+        )
+        return response
+
+
+class ChangesView(APIView):
+    """
+    Лента изменений каталога для инкрементальной синхронизации.
+    Клиент передает курсор since из предыдущего ответа и получает
+    только изменившиеся с тех пор объекты и новый курсор.
+    """
+    synced = {
+        'title': (
+            Title.objects.annotate(rating=F('rating_stats__average')),
+            TitleReadSerializer,
+            None
+        ),
+        'review': (
+            Review.objects.filter(VISIBLE_REVIEWS),
+            ReviewSerializer,
+            'title_id'
+        ),
+        'comment': (
+            Comment.objects.filter(VISIBLE_COMMENTS),
+            CommentSerializer,
+            'review_id'
+        ),
+        'category': (Category.objects.all(), CategorySerializer, None),
+        'genre': (Genre.objects.all(), GenreSerializer, None),
+    }
+
+    def get_int_param(self, name, default):
+        try:
+            return max(0, int(self.request.query_params.get(name, default)))
+        except ValueError:
+            raise ValidationError({name: 'Ожидается целое число.'})
+
+    def get(self, request):
+        since = self.get_int_param('since', 0)
+        limit = min(
+            self.get_int_param('limit', settings.CHANGES_PAGE_SIZE)
+            or settings.CHANGES_PAGE_SIZE,
+            settings.CHANGES_MAX_PAGE_SIZE
+        )
+        entries, cursor, has_more = read_changes(since, limit)
+        changed_ids = {}
+        for entry in entries:
+            if entry.action != 'deleted':
+                changed_ids.setdefault(entry.model, []).append(
+                    entry.object_id
+                )
+        objects = {
+            model: self.synced[model][0].in_bulk(ids)
+            for model, ids in changed_ids.items()
+        }
+        attach_genre_ids(objects.get('title', {}).values())
+        changes = []
+        for entry in entries:
+            change = {
+                'type': entry.model,
+                'id': entry.object_id,
+                'action': entry.action,
+            }
+            obj = objects.get(entry.model, {}).get(entry.object_id)
+            if entry.action != 'deleted' and obj is None:
+                change['action'] = 'deleted'
+            elif obj is not None:
+                _, serializer_class, parent = self.synced[entry.model]
+                if parent:
+                    change[parent] = getattr(obj, parent)
+                change['data'] = serializer_class(obj).data
+            changes.append(change)
+        return Response(
+            {'cursor': cursor, 'has_more': has_more, 'changes': changes},
+            status=status.HTTP_200_OK
+        )
+
+
+class SearchView(APIView):
+    """
+    Полнотекстовый поиск по отзывам и комментариям.
+    Параметры: q — строка поиска, type — review или comment
+    (по умолчанию оба типа), limit — количество результатов.
+    """
+
+    def get(self, request):
+        search_type = request.query_params.get('type')
+        if search_type is not None and search_type not in SEARCH_TYPES:
+            raise ValidationError(
+                {'type': f'Допустимые значения: {", ".join(SEARCH_TYPES)}.'}
+            )
+        try:
+            limit = int(request.query_params.get(
+                'limit', settings.SEARCH_RESULTS_COUNT
+            ))
+        except ValueError:
+            raise ValidationError({'limit': 'Ожидается целое число.'})
+        limit = max(1, min(limit, settings.SEARCH_MAX_RESULTS))
+        results = search_texts(
+            request.query_params.get('q', ''),
+            (search_type,) if search_type else SEARCH_TYPES,
+            limit
+        )
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+
 class UserViewSet(viewsets.ModelViewSet):
     """Управление пользователями админом и суперпользователем."""
     queryset = User.objects.all()
     serializer_class = UserSerializer
-    filter_backends = (SearchFilter,)
+    filter_backends = (UserSearchFilter,)
     lookup_field = 'username'
     search_fields = ('username',)
     permission_classes = (IsAdminOrSuperUser, IsAuthorOrReadOnly)
-    pagination_class = PageNumberPagination
+    pagination_class = UserPagination
     http_method_names = ('get', 'post', 'patch', 'delete',)
 
+    def perform_destroy(self, instance):
+        """
+        Пользователь скрывается сразу, его отзывы и комментарии
+        удаляются пачками командой process_deletions.
+        """
+        mark_for_deletion(instance)
+
     """Ресурс для управлением собственным профилем
     авторизованного пользователя."""
     @action(
@@ -97,7 +267,7 @@ class UserViewSet(viewsets.ModelViewSet):
         url_path='me',
         permission_classes=[permissions.IsAuthenticated],)
     def me(self, request):
-        user = request.user
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == "GET":
             serializer = UserSerializer(
                 user, data=request.data, partial=True)
@@ -108,6 +278,36 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(
+        methods=('get',),
+        detail=False,
+        url_path='me/recommendations',
+        permission_classes=[permissions.IsAuthenticated],)
+    def recommendations(self, request):
+        """
+        Персональные рекомендации произведений, которые пользователь
+        еще не оценивал. Ранжирование выполняется по матрице признаков
+        в памяти, из БД загружаются только итоговые произведения.
+        """
+        try:
+            limit = int(request.query_params.get(
+                'limit', settings.RECOMMENDATIONS_COUNT
+            ))
+        except ValueError:
+            raise ValidationError({'limit': 'Ожидается целое число.'})
+        limit = max(1, min(limit, settings.RECOMMENDATIONS_MAX_COUNT))
+        relevance = dict(recommend_titles(request.user, limit))
+        titles = Title.objects.filter(pk__in=relevance).annotate(
+            rating=F('rating_stats__average')
+        )
+        for title in titles:
+            title.relevance = relevance[title.pk]
+        serializer = TitleRecommendationSerializer(
+            sorted(titles, key=lambda item: -item.relevance),
+            many=True
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 
 class CategoryViewSet(BaseCategoryGenreViewSet):
     """ViewSet для работы с категориями."""
@@ -121,20 +321,177 @@ class GenreViewSet(BaseCategoryGenreViewSet):
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet для работы с произведениями.
     В процессе получения данных для произведений
     вычисляется рейтинг на основе оценок в отзывах.
+    Параметры ?fields= и ?expand= сокращают ответ и запрос к БД.
     """
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).order_by('-rating')
+    queryset = Title.objects.all()
     permission_classes = (IsAdminOrReadOnly,)
     filterset_class = TitleFilter
-    filter_backends = (rest_framework.DjangoFilterBackend, SearchFilter)
+    filter_backends = (
+        rest_framework.DjangoFilterBackend, TitleSearchFilter
+    )
     search_fields = ('name',)
+    pagination_class = TitlePagination
     http_method_names = ['get', 'post', 'delete', 'patch']
+    concrete_fields = {
+        'name': ('name',),
+        'year': ('year',),
+        'description': ('description',),
+        'category': ('category',),
+    }
+
+    def get_queryset(self):
+        """
+        Возвращает queryset произведений.
+        Агрегат рейтинга вычисляется, только если поле rating запрошено;
+        иначе сортировка идет по предрасчитанной средней оценке.
+        """
+        if self.wants_field('rating'):
+            # Отзывы пользователей, ожидающих удаления, не учитываются.
+            queryset = Title.objects.annotate(rating=Avg(
+                'reviews__score',
+                filter=Q(reviews__author__deleted_at__isnull=True)
+            )).order_by('-rating')
+        else:
+            queryset = Title.objects.order_by(
+                F('rating_stats__average').desc(nulls_last=True)
+            )
+        return self.expand_queryset(queryset)
+
+    def expand_queryset(self, queryset):
+        """Ограничивает поля и добавляет запрошенные дополнительные поля."""
+        only = self.get_only_fields(self.concrete_fields)
+        if only is not None:
+            queryset = queryset.only(*only)
+        if 'reviews_count' in self.get_expanded_fields():
+            queryset = queryset.annotate(
+                reviews_count=Coalesce('rating_stats__reviews_count', 0)
+            )
+        return queryset
+
+    def get_batch_ids(self):
+        """
+        Список id из параметра ?ids= в порядке запроса без повторов
+        или None, если параметр не передан.
+        """
+        if 'ids' not in self.request.query_params:
+            return None
+        values = [
+            value.strip()
+            for value in self.request.query_params['ids'].split(',')
+            if value.strip()
+        ]
+        if not all(ID_PATTERN.fullmatch(value) for value in values):
+            raise ValidationError({'ids': ['Ожидается список целых чисел.']})
+        ids = list(dict.fromkeys(map(int, values)))
+        if len(ids) > settings.TITLES_BATCH_MAX_IDS:
+            raise ValidationError({'ids': [
+                'Слишком много произведений, максимум '
+                f'{settings.TITLES_BATCH_MAX_IDS}.'
+            ]})
+        return ids
+
+    def is_sparse(self):
+        return (
+            self.get_requested_fields() is not None
+            or bool(self.get_expanded_fields())
+        )
+
+    def load_titles(self, ids):
+        """
+        Возвращает словарь id -> ответ для существующих произведений.
+        Полные ответы берутся из кеша, недостающие загружаются одним
+        запросом; ответы с ?fields= и ?expand= не кешируются.
+        """
+        if self.is_sparse():
+            return self.serialize_titles(ids)
+        return get_titles(ids, self.serialize_titles)
+
+    def serialize_titles(self, ids):
+        titles = list(self.get_queryset().filter(pk__in=ids))
+        data = self.get_serializer(titles, many=True).data
+        return dict(zip((title.pk for title in titles), data))
+
+    def list(self, request, *args, **kwargs):
+        """
+        Список произведений; с параметром ?ids=1,2,3 возвращает
+        произведения в порядке запроса и список отсутствующих id.
+        Страницы списка для анонимных пользователей кешируются.
+        """
+        ids = self.get_batch_ids()
+        if ids is None:
+            return self.list_page(request, *args, **kwargs)
+        found = self.load_titles(ids)
+        response = Response({
+            'results': [found[pk] for pk in ids if pk in found],
+            'missing': [pk for pk in ids if pk not in found],
+        })
+        return self.mark_cached(response, 'titles')
+
+    def list_page(self, request, *args, **kwargs):
+        list_page = super().list
+        if request.user.is_authenticated or self.is_sparse():
+            return list_page(request, *args, **kwargs)
+        base_url = request.build_absolute_uri(request.path)
+        params = self.get_list_cache_params()
+        # Ссылки на соседние страницы строятся только из параметров,
+        # входящих в ключ кеша.
+        self.paginator.base_url = (
+            f'{base_url}?{urlencode(params)}' if params else base_url
+        )
+        data = get_title_list(
+            base_url,
+            params,
+            lambda: list_page(request, *args, **kwargs).data
+        )
+        return self.mark_cached(Response(data), 'title_list')
+
+    def get_list_cache_params(self):
+        """
+        Нормализованные параметры списка: только влияющие на ответ,
+        по алфавиту, без пустых значений и первой страницы.
+        """
+        names = (
+            *self.filterset_class.Meta.fields, 'search', 'search_mode', 'page'
+        )
+        params = []
+        for name in sorted(names):
+            value = self.request.query_params.get(name, '')
+            if value == '' or (name == 'page' and value == '1'):
+                continue
+            params.append((name, value))
+        return tuple(params)
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = self.kwargs['pk']
+        found = {}
+        if ID_PATTERN.fullmatch(pk):
+            found = self.load_titles([int(pk)])
+        if not found:
+            raise NotFound()
+        return self.mark_cached(
+            Response(next(iter(found.values()))), 'title'
+        )
+
+    def mark_cached(self, response, name):
+        """
+        Помечает ответ, собранный из кеша ответов: сжатые байты такого
+        ответа кешируются в CompressionMiddleware.
+        """
+        if not self.is_sparse():
+            response.api_cache_key = name
+        return response
+
+    def perform_destroy(self, instance):
+        """
+        Произведение скрывается сразу, его отзывы и комментарии
+        удаляются пачками командой process_deletions.
+        """
+        mark_for_deletion(instance)
 
     def get_serializer_class(self):
         """
@@ -144,16 +501,143 @@ class TitleViewSet(viewsets.ModelViewSet):
         """
         if self.action in ('list', 'retrieve'):
             return TitleReadSerializer
+        if self.action == 'top':
+            return TitleTopSerializer
+        if self.action == 'trending':
+            return TitleTrendingSerializer
+        if self.action == 'similar':
+            return TitleSimilarSerializer
         return TitleWriteSerializer
 
+    @action(
+        methods=('post',),
+        detail=False,
+        url_path='bulk',
+        parser_classes=(JSONParser, NDJSONParser),
+        permission_classes=(IsAdminOrSuperUser,),)
+    def bulk(self, request):
+        """
+        Пакетное создание и изменение произведений.
+        Принимает JSON-массив или NDJSON; элементы с id изменяют
+        существующие произведения. Корректные элементы сохраняются
+        в одной транзакции, для каждого возвращается результат.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError(
+                {'non_field_errors': ['Ожидается список произведений.']}
+            )
+        if len(items) > settings.TITLES_BULK_MAX_ITEMS:
+            raise ValidationError({'non_field_errors': [
+                'Слишком много произведений, максимум '
+                f'{settings.TITLES_BULK_MAX_ITEMS}.'
+            ]})
+        results, creates, updates = validate_titles(items)
+        saved = save_titles(creates, updates)
+        for index, _ in creates:
+            results[index] = {
+                'index': index, 'status': 'created', 'id': saved[index]
+            }
+        for index, title_id, _ in updates:
+            results[index] = {
+                'index': index, 'status': 'updated', 'id': title_id
+            }
+        return Response(
+            {
+                'created': len(creates),
+                'updated': len(updates),
+                'errors': len(items) - len(creates) - len(updates),
+                'results': results
+            },
+            status=status.HTTP_200_OK
+        )
+
+    @action(detail=False, url_path='autocomplete')
+    def autocomplete(self, request):
+        """
+        Автодополнение названий произведений по ?q=.
+        Ответ строится по индексу названий в памяти без запросов к БД.
+        """
+        try:
+            limit = int(request.query_params.get(
+                'limit', settings.TITLES_AUTOCOMPLETE_COUNT
+            ))
+        except ValueError:
+            raise ValidationError({'limit': 'Ожидается целое число.'})
+        limit = max(1, min(limit, settings.TITLES_AUTOCOMPLETE_MAX_COUNT))
+        return Response(
+            title_names.search(request.query_params.get('q', ''), limit)
+        )
+
+    @action(detail=False, url_path='top')
+    def top(self, request):
+        """
+        Лучшие произведения по взвешенному (байесовскому) рейтингу.
+        Рейтинг предрасчитан в TitleRating, поэтому сортировка идет
+        по индексу без агрегации отзывов.
+        """
+        queryset = self.filter_queryset(self.expand_queryset(
+            Title.objects.filter(
+                rating_stats__reviews_count__gt=0
+            ).annotate(
+                rating=F('rating_stats__average'),
+                weighted_rating=F('rating_stats__weighted')
+            ).order_by('-rating_stats__weighted', 'pk')
+        ))
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, url_path='trending')
+    def trending(self, request):
+        """
+        Популярные произведения по недавней активности в отзывах
+        и комментариях. Значения берутся из периодически обновляемой
+        таблицы TitleTrend.
+        """
+        queryset = self.filter_queryset(self.expand_queryset(
+            Title.objects.filter(trend__score__gt=0).annotate(
+                rating=F('rating_stats__average'),
+                trending_score=F('trend__score')
+            ).order_by('-trend__score', 'pk')
+        ))
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, url_path='similar')
+    def similar(self, request, pk=None):
+        """
+        Похожие произведения из предрасчитанной таблицы SimilarTitle.
+        Список соседей кешируется в памяти процесса.
+        """
+        title = get_object_or_404(Title, pk=pk)
+        similarities = dict(get_similar_titles(title.pk))
+        titles = self.expand_queryset(
+            Title.objects.filter(pk__in=similarities).annotate(
+                rating=F('rating_stats__average')
+            )
+        )
+        for similar_title in titles:
+            similar_title.similarity = similarities[similar_title.pk]
+        serializer = self.get_serializer(
+            sorted(titles, key=lambda item: -item.similarity),
+            many=True
+        )
+        return Response(serializer.data)
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
-    """Вьюсет для объектов модели Review."""
+class ReviewViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
+    """
+    Вьюсет для объектов модели Review.
+    Параметры ?fields= и ?expand= сокращают ответ и запрос к БД.
+    """
     serializer_class = ReviewSerializer
     permission_classes = (
         permissions.IsAuthenticatedOrReadOnly,
         IsStaffOrAuthorOrReadOnly
     )
+    throttle_classes = (WriteUserRateThrottle,)
     http_method_names = ['get', 'post', 'patch', 'delete', 'head']
 
     def get_title(self):
@@ -168,10 +652,26 @@ class ReviewViewSet(viewsets.ModelViewSet):
             raise NotFound('title_id отсутствует в параметрах запроса.')
         return get_object_or_404(Title, pk=title_id)
 
+    concrete_fields = {
+        'text': ('text',),
+        'author': ('author', 'author__username'),
+        'score': ('score',),
+        'pub_date': ('pub_date',),
+    }
+
     def get_queryset(self):
         """Возвращает queryset с отзывами для текущего произведения."""
-        title = self.get_title()
-        return title.reviews.select_related('author')
+        queryset = self.get_title().reviews.filter(
+            author__deleted_at__isnull=True
+        )
+        if self.wants_field('author'):
+            queryset = queryset.select_related('author')
+        only = self.get_only_fields(self.concrete_fields)
+        if only is not None:
+            queryset = queryset.only(*only)
+        if 'comments_count' in self.get_expanded_fields():
+            queryset = queryset.annotate(comments_count=Count('comments'))
+        return queryset
 
     def perform_create(self, serializer):
         """
@@ -179,15 +679,19 @@ class ReviewViewSet(viewsets.ModelViewSet):
         где автором является текущий пользователь.
         """
         serializer.save(
-            author=self.request.user,
+            author_id=self.request.user.id,
             title=self.get_title()
         )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
-    """Вьюсет для объектов модели Comment."""
+class CommentViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
+    """
+    Вьюсет для объектов модели Comment.
+    Параметр ?fields= сокращает ответ и запрос к БД.
+    """
     serializer_class = CommentSerializer
     permission_classes = (IsStaffOrAuthorOrReadOnly,)
+    throttle_classes = (WriteUserRateThrottle,)
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_review(self):
@@ -200,11 +704,31 @@ class CommentViewSet(viewsets.ModelViewSet):
         review_id = self.kwargs.get('review_id')
         if not review_id:
             raise ValueError('review_id отсутствует в параметрах запроса.')
-        return get_object_or_404(Review, pk=review_id)
+        return get_object_or_404(
+            Review.objects.filter(
+                title__deleted_at__isnull=True,
+                author__deleted_at__isnull=True
+            ),
+            pk=review_id
+        )
+
+    concrete_fields = {
+        'text': ('text',),
+        'author': ('author', 'author__username'),
+        'pub_date': ('pub_date',),
+    }
 
     def get_queryset(self):
         """Возвращает queryset с комментариями для текущего отзыва."""
-        return self.get_review().comments.select_related('author').all()
+        queryset = self.get_review().comments.filter(
+            author__deleted_at__isnull=True
+        )
+        if self.wants_field('author'):
+            queryset = queryset.select_related('author')
+        only = self.get_only_fields(self.concrete_fields)
+        if only is not None:
+            queryset = queryset.only(*only)
+        return queryset
 
     def perform_create(self, serializer):
         """
@@ -212,6 +736,6 @@ class CommentViewSet(viewsets.ModelViewSet):
         где автором является текущий пользователь.
         """
         serializer.save(
-            author=self.request.user,
+            author_id=self.request.user.id,
             review=self.get_review()
         )
@@ -0,0 +1,132 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.test import RequestFactory
+from django.urls import reverse
+
+from reviews.autocomplete import title_names
+from reviews.dictionaries import categories, genres
+from reviews.models import Title
+from .views import TitleViewSet
+
+title_list_view = TitleViewSet.as_view({'get': 'list'})
+
+
+def request_titles(base_url, params):
+    """
+    Выполняет анонимный GET-запрос к списку произведений: ответ
+    строится и кешируется так же, как для клиента с этим адресом.
+    """
+    scheme, host = urlsplit(base_url)[:2]
+    request = RequestFactory().get(
+        reverse('titles-list'),
+        params,
+        secure=scheme == 'https',
+        HTTP_HOST=host
+    )
+    response = title_list_view(request)
+    if response.status_code not in (HTTPStatus.OK, HTTPStatus.NOT_FOUND):
+        raise RuntimeError(f'ответ {response.status_code}')
+
+
+def warm_tasks(top, pages, base_url, local=False):
+    """
+    Задачи прогрева: top самых обсуждаемых произведений (пачками ?ids=)
+    и первые pages страниц списка — всего, по каждой категории и по
+    каждому жанру. С local=True добавляются копии в памяти текущего
+    процесса: справочники и индекс автодополнения.
+    Возвращает список пар (название, функция).
+    """
+    tasks = [
+        ('categories', categories.refresh),
+        ('genres', genres.refresh),
+        ('autocomplete', title_names.refresh),
+    ] if local else []
+    ids = list(
+        Title.objects.order_by(
+            F('rating_stats__reviews_count').desc(nulls_last=True), 'pk'
+        ).values_list('pk', flat=True)[:top]
+    )
+    size = settings.TITLES_BATCH_MAX_IDS
+    for start in range(0, len(ids), size):
+        chunk = ids[start:start + size]
+        tasks.append((
+            f'titles {start + 1}-{start + len(chunk)}',
+            partial(
+                request_titles, base_url, {'ids': ','.join(map(str, chunk))}
+            )
+        ))
+    filters = [{}] + [
+        {'category': category.slug} for category in categories.all()
+    ] + [
+        {'genre': genre.slug} for genre in genres.all()
+    ]
+    for params in filters:
+        for page in range(1, pages + 1):
+            page_params = {**params, 'page': page} if page > 1 else params
+            name = ' '.join(
+                f'{key}={value}' for key, value in page_params.items()
+            )
+            tasks.append((
+                f'list {name}'.strip(),
+                partial(request_titles, base_url, page_params)
+            ))
+    return tasks
+
+
+def run_task(task):
+    name, func = task
+    started = time.monotonic()
+    error = None
+    try:
+        func()
+    except Exception as exception:
+        error = f'{type(exception).__name__}: {exception}'
+    finally:
+        # У каждого потока пула свое соединение с БД.
+        connection.close()
+    return name, time.monotonic() - started, error
+
+
+def warm_cache(top=None, pages=None, threads=None, base_url=None,
+               local=False):
+    """
+    Заполняет кеши ответов произведений и страниц списка, с local=True —
+    и копии в памяти процесса, выполняя задачи в пуле потоков.
+    Возвращает список (название, секунды, ошибка) и общее время.
+    """
+    tasks = warm_tasks(
+        settings.CACHE_WARM_TOP_TITLES if top is None else top,
+        settings.CACHE_WARM_PAGES if pages is None else pages,
+        base_url or settings.CACHE_WARM_BASE_URL,
+        local
+    )
+    started = time.monotonic()
+    with ThreadPoolExecutor(
+        max_workers=threads or settings.CACHE_WARM_THREADS
+    ) as executor:
+        results = list(executor.map(run_task, tasks))
+    return results, time.monotonic() - started
+
+
+def warm_in_background():
+    """
+    Прогревает кеш и копии в памяти процесса в фоновом потоке,
+    не задерживая запуск процесса. Для кеша в памяти процесса это
+    единственный способ прогреть каждый воркер.
+    """
+    thread = threading.Thread(
+        target=warm_cache,
+        kwargs={'local': True},
+        name='warm_cache',
+        daemon=True
+    )
+    thread.start()
+    return thread
@@ -32,6 +32,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -71,6 +72,20 @@ DATABASES = {
     }
 }
 
+# Кеш используется для версий справочников и ответов API. Для нескольких
+# процессов нужен общий бэкенд (Redis, Memcached), иначе изменения
+# не будут видны в соседних процессах.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Копии справочников и индексов в памяти процесса проверяют версию в кеше.
+# С кешем в памяти процесса версии соседних процессов не видны, поэтому
+# такие копии перечитываются не реже чем раз в LOCAL_COPY_TIMEOUT секунд.
+LOCAL_COPY_TIMEOUT = 30
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'email_confirmation_code')
 
@@ -119,8 +134,16 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     "PAGE_SIZE": 10,
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     ],
+    # Емкость и скорость пополнения корзин api.throttling.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': '60/hour',
+        'signup_username': '10/hour',
+        'token_ip': '60/min',
+        'token_username': '10/min',
+        'write_user': '30/min',
+    },
 }
 
 
@@ -131,3 +154,116 @@ SIMPLE_JWT = {
 }
 
 DEFAULT_FROM_EMAIL = 'api_yamdb@mail.ru'
+
+# Взвешенный (байесовский) рейтинг: число «виртуальных» оценок
+# и их значение, которые добавляются к оценкам каждого произведения.
+RATING_PRIOR_WEIGHT = 10
+RATING_PRIOR_MEAN = 5.5
+
+# Популярность произведений: период полураспада веса отзыва, вес комментария
+# относительно отзыва и порог, ниже которого популярность считается нулевой.
+TRENDING_HALF_LIFE = timedelta(days=3)
+TRENDING_COMMENT_WEIGHT = 0.5
+TRENDING_MIN_SCORE = 0.01
+
+# Похожие произведения: число соседей, минимальное число общих оценщиков,
+# размер блока произведений при расчете и размер LRU-кеша в процессе.
+SIMILAR_TITLES_COUNT = 10
+SIMILAR_TITLES_MIN_COMMON = 2
+SIMILAR_TITLES_CHUNK_SIZE = 256
+SIMILAR_TITLES_CACHE_SIZE = 1024
+
+# Персональные рекомендации: файл с признаками произведений (строится
+# командой build_title_features), вес средней оценки произведения
+# и размер выдачи по умолчанию и максимальный.
+TITLE_FEATURES_PATH = BASE_DIR / 'data' / 'title_features.npy'
+RECOMMENDATIONS_RATING_WEIGHT = 1.0
+RECOMMENDATIONS_COUNT = 10
+RECOMMENDATIONS_MAX_COUNT = 100
+
+# Максимальное количество произведений в одном запросе /titles/bulk/.
+TITLES_BULK_MAX_ITEMS = 10000
+
+# Размер пачки изменений в /changes/ по умолчанию и максимальный.
+CHANGES_PAGE_SIZE = 500
+CHANGES_MAX_PAGE_SIZE = 2000
+
+# Время жизни кеша ответов по отдельным произведениям (секунды)
+# и максимальное количество id в запросе /titles/?ids=.
+TITLE_CACHE_TIMEOUT = 300
+TITLES_BATCH_MAX_IDS = 100
+
+# Сжатие ответов API: минимальный размер ответа для сжатия (байты)
+# и время жизни сжатых ответов из кеша ответов (секунды).
+API_COMPRESS_MIN_SIZE = 1024
+API_COMPRESS_CACHE_TIMEOUT = 300
+
+# Время жизни кеша статистики категорий и жанров (секунды).
+STATS_CACHE_TIMEOUT = 300
+
+# Время жизни кеша страниц списка произведений для анонимных
+# пользователей (секунды).
+TITLE_LIST_CACHE_TIMEOUT = 60
+
+# Single-flight для кеша ответов: сколько устаревшая запись отдается,
+# пока ее пересчитывает один процесс, время жизни блокировки пересчета,
+# максимальное время ожидания чужого пересчета и интервал опроса.
+SINGLE_FLIGHT_STALE_TIMEOUT = 60
+SINGLE_FLIGHT_LOCK_TIMEOUT = 10
+SINGLE_FLIGHT_WAIT_TIMEOUT = 5
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+
+# Код подтверждения: срок действия (секунды) и количество неудачных
+# попыток ввода, после которого код перестает действовать.
+CONFIRMATION_CODE_LIFETIME = 60 * 60
+CONFIRMATION_CODE_MAX_ATTEMPTS = 5
+
+# Время жизни закешированной версии токенов пользователя (секунды);
+# с кешем в памяти процесса — не больше LOCAL_COPY_TIMEOUT.
+TOKEN_VERSION_CACHE_TIMEOUT = 300
+
+# Автодополнение названий: размер выдачи по умолчанию и максимальный.
+TITLES_AUTOCOMPLETE_COUNT = 10
+TITLES_AUTOCOMPLETE_MAX_COUNT = 50
+# Сколько изменения индекса хранятся в кеше (секунды): процесс, который
+# не обращался к индексу дольше, перестраивает его целиком.
+TITLES_AUTOCOMPLETE_CHANGES_TIMEOUT = 60 * 60
+
+# Нечеткий поиск по триграммам: минимальное сходство названия с запросом
+# и максимальное количество найденных произведений.
+FUZZY_SEARCH_THRESHOLD = 0.3
+FUZZY_SEARCH_MAX_RESULTS = 100
+
+# Полнотекстовый поиск /search/: количество результатов по умолчанию
+# и максимальное.
+SEARCH_RESULTS_COUNT = 20
+SEARCH_MAX_RESULTS = 100
+
+# Фоновое удаление произведений и пользователей: количество отзывов
+# или комментариев, удаляемых одной транзакцией.
+DELETION_BATCH_SIZE = 1000
+
+# Очередь фоновых заданий (run_worker). JOBS_DEFERRED — типы работы,
+# которые ставятся в очередь; остальные выполняются сразу в запросе.
+JOBS_DEFERRED = ('process_deletions',)
+# Аренда взятого задания (секунды): после нее задание незавершившегося
+# воркера снова доступно другим.
+JOB_LEASE_TIMEOUT = 300
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_DELAY = 60
+JOB_POLL_INTERVAL = 1
+# Сколько хранятся выполненные задания (секунды), по ним считаются
+# метрики очереди. Старые задания удаляются простаивающим воркером раз
+# в JOB_MAINTENANCE_INTERVAL секунд.
+JOB_RETENTION = 24 * 60 * 60
+JOB_MAINTENANCE_INTERVAL = 60 * 60
+
+# Прогрев кеша (warm_cache): количество самых обсуждаемых произведений,
+# страниц списка на фильтр и потоков. Адрес сайта входит в ключи кеша
+# страниц списка (ссылки next/previous). CACHE_WARM_ON_STARTUP —
+# прогревать кеш в фоне при запуске каждого WSGI-процесса.
+CACHE_WARM_TOP_TITLES = 200
+CACHE_WARM_PAGES = 1
+CACHE_WARM_THREADS = 4
+CACHE_WARM_BASE_URL = 'http://localhost:8000'
+CACHE_WARM_ON_STARTUP = False
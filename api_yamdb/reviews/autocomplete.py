@@ -0,0 +1,180 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Title
+from .versions import LocalCopyVersion
+
+# Верхняя граница для диапазона строк с заданным префиксом.
+PREFIX_END = '\U0010ffff'
+
+
+def normalize(name):
+    """Имя в нижнем регистре, ё заменена на е, пробелы схлопнуты."""
+    return ' '.join(name.lower().replace('ё', 'е').split())
+
+
+def name_keys(name):
+    """Название целиком и его окончания, начинающиеся с каждого слова."""
+    words = normalize(name).split()
+    return [' '.join(words[index:]) for index in range(len(words))]
+
+
+def title_entry(pk, name, year, rating):
+    """
+    Запись индекса: ключ сортировки по рейтингу, ответ API
+    и средняя оценка.
+    """
+    return (
+        (rating is None, -(rating or 0), name, pk),
+        {
+            'id': pk,
+            'name': name,
+            'year': year,
+            'rating': None if rating is None else int(rating)
+        },
+        rating
+    )
+
+
+class TitleNameIndex:
+    """
+    Отсортированный индекс нормализованных названий произведений
+    в памяти процесса для автодополнения. В индекс попадает название
+    целиком и его окончания, начинающиеся с каждого слова, поэтому
+    запрос совпадает с началом любого слова названия.
+
+    Изменения отдельных произведений (название, рейтинг, удаление)
+    публикуются в ленту в кеше, и каждый процесс применяет их к своему
+    индексу без полного перестроения. Индекс перестраивается целиком
+    после пакетных изменений, при пропуске в ленте и, если кеш не общий
+    между процессами, раз в LOCAL_COPY_TIMEOUT секунд.
+    """
+
+    changes_key = 'title_name_index_changes'
+    change_key = 'title_name_index_change:{number}'
+
+    def __init__(self):
+        self.version = LocalCopyVersion('title_name_index_version')
+        self._lock = threading.Lock()
+        self._applied = 0
+        self._keys = []
+        self._titles = {}
+
+    def refresh(self):
+        """Перестраивает индекс или применяет к нему новые изменения."""
+        version = self.version.stale()
+        if version is not None:
+            self.build(version)
+            return
+        number = cache.get(self.changes_key) or 0
+        if number == self._applied:
+            return
+        numbers = range(self._applied + 1, number + 1)
+        changes = cache.get_many(
+            [self.change_key.format(number=item) for item in numbers]
+        )
+        if number < self._applied or len(changes) < len(numbers):
+            # Лента сброшена или часть изменений вытеснена из кеша.
+            self.build(self.version.current())
+            return
+        with self._lock:
+            for item in numbers:
+                # Изменения могли быть применены параллельным потоком.
+                if item > self._applied:
+                    self.apply(
+                        *changes[self.change_key.format(number=item)]
+                    )
+            self._applied = max(self._applied, number)
+
+    def build(self, version):
+        # Номер последнего изменения читается до загрузки: изменения,
+        # сделанные во время загрузки, будут применены повторно.
+        applied = cache.get(self.changes_key) or 0
+        rows = Title.objects.values_list(
+            'id', 'name', 'year', 'rating_stats__average'
+        )
+        titles = {row[0]: title_entry(*row) for row in rows.iterator()}
+        keys = sorted(
+            (key, pk)
+            for pk, (_, data, _) in titles.items()
+            for key in name_keys(data['name'])
+        )
+        with self._lock:
+            self._keys = keys
+            self._titles = titles
+            self._applied = applied
+            self.version.mark_loaded(version)
+
+    def apply(self, pk, change):
+        """
+        Применяет изменение произведения: словарь с новыми значениями
+        name, year и/или rating или None для удаления из индекса.
+        """
+        old = self._titles.pop(pk, None)
+        if old is not None:
+            for key in name_keys(old[1]['name']):
+                index = bisect_left(self._keys, (key, pk))
+                if self._keys[index:index + 1] == [(key, pk)]:
+                    del self._keys[index]
+        if change is None:
+            return
+        fields = {} if old is None else {
+            'name': old[1]['name'], 'year': old[1]['year'], 'rating': old[2]
+        }
+        fields.update(change)
+        if 'name' not in fields:
+            # Рейтинг произведения, которого еще нет в индексе: оно
+            # попадет в индекс со своим изменением.
+            return
+        self._titles[pk] = title_entry(
+            pk, fields['name'], fields['year'], fields.get('rating')
+        )
+        for key in name_keys(fields['name']):
+            insort(self._keys, (key, pk))
+
+    def publish(self, pk, change):
+        """
+        Записывает изменение произведения в ленту (формат — как в apply).
+        Вызывается после фиксации транзакции, изменившей произведение
+        или его рейтинг.
+        """
+        cache.add(self.changes_key, 0, None)
+        try:
+            number = cache.incr(self.changes_key)
+        except ValueError:
+            self.invalidate()
+            return
+        cache.set(
+            self.change_key.format(number=number),
+            (pk, change),
+            settings.TITLES_AUTOCOMPLETE_CHANGES_TIMEOUT
+        )
+
+    def invalidate(self):
+        """Требует полного перестроения индекса во всех процессах."""
+        self.version.bump()
+
+    def search(self, query, limit):
+        """
+        До limit произведений, в названии которых есть слово,
+        начинающееся с query, в порядке убывания рейтинга.
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        self.refresh()
+        with self._lock:
+            start = bisect_left(self._keys, (prefix,))
+            end = bisect_left(self._keys, (prefix + PREFIX_END,), start)
+            found = [
+                self._titles[pk]
+                for pk in {pk for _, pk in self._keys[start:end]}
+            ]
+        return [data for _, data, _ in heapq.nsmallest(limit, found)]
+
+
+title_names = TitleNameIndex()
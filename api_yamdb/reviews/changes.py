@@ -0,0 +1,35 @@
+from .models import ChangeLog
+
+
+def record_changes(model, object_ids, action):
+    """Записывает в журнал изменения объектов модели одной вставкой."""
+    ChangeLog.objects.bulk_create(
+        [
+            ChangeLog(
+                model=model._meta.model_name,
+                object_id=object_id,
+                action=action
+            )
+            for object_id in object_ids
+        ],
+        batch_size=1000
+    )
+
+
+def read_changes(since, limit):
+    """
+    Возвращает изменения после курсора since, не больше limit записей.
+    Несколько изменений одного объекта сворачиваются в последнее.
+    Результат — (изменения по порядку, новый курсор, есть ли еще записи).
+    """
+    entries = list(
+        ChangeLog.objects.filter(id__gt=since).order_by('id')[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    latest = {}
+    for entry in entries:
+        latest.pop((entry.model, entry.object_id), None)
+        latest[(entry.model, entry.object_id)] = entry
+    cursor = entries[-1].id if entries else since
+    return list(latest.values()), cursor, has_more
@@ -0,0 +1,71 @@
+import hashlib
+import hmac
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from . import constants
+from .models import ConfirmationCode
+
+
+def hash_code(user_id, code):
+    return hmac.new(
+        settings.SECRET_KEY.encode(),
+        f'{user_id}:{code}'.encode(),
+        hashlib.sha256
+    ).hexdigest()
+
+
+def issue_confirmation_code(user):
+    """
+    Создает новый код подтверждения для пользователя и возвращает его.
+    Предыдущий код пользователя перестает действовать.
+    """
+    code = str(
+        secrets.randbelow(10 ** constants.CONFIRMATION_CODE_DIGITS)
+    ).zfill(constants.CONFIRMATION_CODE_DIGITS)
+    ConfirmationCode.objects.update_or_create(
+        user=user,
+        defaults={
+            'code_hash': hash_code(user.pk, code),
+            'expires_at': timezone.now() + timedelta(
+                seconds=settings.CONFIRMATION_CODE_LIFETIME
+            ),
+            'attempts': 0,
+        }
+    )
+    return code
+
+
+def check_confirmation_code(username, code):
+    """
+    Проверяет код подтверждения одним запросом по уникальному username.
+    Возвращает пользователя, если код верен; использованный код удаляется.
+    Возвращает None для неверного или истекшего кода; после
+    CONFIRMATION_CODE_MAX_ATTEMPTS неудачных попыток код удаляется.
+    Если для username нет ожидающего кода, выбрасывает
+    ConfirmationCode.DoesNotExist.
+    """
+    pending = ConfirmationCode.objects.select_related('user').get(
+        user__username=username
+    )
+    codes = ConfirmationCode.objects.filter(pk=pending.pk)
+    if pending.expires_at <= timezone.now():
+        codes.delete()
+        return None
+    if hmac.compare_digest(
+        pending.code_hash, hash_code(pending.user_id, code)
+    ):
+        # Код принимается только тем запросом, который его удалил.
+        deleted, _ = codes.delete()
+        return pending.user if deleted else None
+    # Счетчик увеличивается условным UPDATE: параллельные неудачные
+    # попытки не могут превысить лимит, прочитав одно и то же значение.
+    if not codes.filter(
+        attempts__lt=settings.CONFIRMATION_CODE_MAX_ATTEMPTS - 1
+    ).update(attempts=F('attempts') + 1):
+        codes.delete()
+    return None
@@ -3,3 +3,11 @@ FIELD_LENGTH = 256
 NAME_LENGHT = 150
 SLUG_LENGTH = 50
 EMAIL_LENGHT = 254
+CHANGE_MODEL_LENGTH = 20
+CHANGE_ACTION_LENGTH = 7
+CONFIRMATION_CODE_DIGITS = 6
+CONFIRMATION_CODE_HASH_LENGTH = 64
+TRIGRAM_LENGTH = 3
+JOB_KIND_LENGTH = 50
+JOB_STATUS_LENGTH = 7
+JOB_LOCK_LENGTH = 100
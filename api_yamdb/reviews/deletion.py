@@ -0,0 +1,121 @@
+from functools import partial
+
+from django.db import transaction
+from django.utils import timezone
+
+from .changes import record_changes
+from .jobs import submit
+from .models import Comment, Review, Title, User
+from .signals import reviews_bulk_deleted
+
+
+def mark_for_deletion(instance):
+    """
+    Помечает произведение или пользователя как ожидающего удаления.
+    Объект сразу скрывается из выдачи, отзывы и комментарии удаляются
+    позже пачками фоновым заданием process_deletions.
+    """
+    instance.deleted_at = timezone.now()
+    instance.save(update_fields=['deleted_at'])
+    if isinstance(instance, User):
+        # Отзывы пользователя перестают учитываться в рейтингах сразу.
+        reviews_bulk_deleted.send(sender=Review, title_ids=set(
+            Review.objects.filter(author_id=instance.pk).values_list(
+                'title_id', flat=True
+            )
+        ))
+    submit('process_deletions')
+
+
+def delete_batch(model, ids):
+    """
+    Удаляет пачку объектов одним DELETE без загрузки их в память
+    и без обхода связей: зависимые объекты к этому моменту уже удалены.
+    Возвращает количество удаленных строк.
+    """
+    queryset = model._base_manager.filter(pk__in=ids)
+    title_ids = set()
+    if model is Review:
+        title_ids = set(queryset.values_list('title_id', flat=True))
+        # Комментарии, добавленные к отзывам уже после пометки родителя.
+        delete_batch(Comment, list(
+            Comment.objects.filter(review_id__in=ids).values_list(
+                'pk', flat=True
+            )
+        ))
+    record_changes(model, ids, 'deleted')
+    deleted = queryset._raw_delete(queryset.db)
+    if title_ids:
+        reviews_bulk_deleted.send(sender=Review, title_ids=title_ids)
+    return deleted
+
+
+def delete_in_batches(queryset, batch_size, progress=None):
+    """
+    Удаляет объекты queryset пачками по batch_size, каждую в своей
+    транзакции, чтобы не держать блокировку записи долго.
+    После каждой пачки вызывает progress(model, удалено всего).
+    """
+    model = queryset.model
+    total = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                queryset.order_by('pk').values_list('pk', flat=True)[
+                    :batch_size
+                ]
+            )
+            if not ids:
+                return total
+            total += delete_batch(model, ids)
+        if progress is not None:
+            progress(model, total)
+
+
+def delete_title(title, batch_size, progress=None):
+    """Удаляет комментарии и отзывы произведения, затем его само."""
+    delete_in_batches(
+        Comment.objects.filter(review__title_id=title.pk),
+        batch_size, progress
+    )
+    delete_in_batches(
+        Review.objects.filter(title_id=title.pk), batch_size, progress
+    )
+    title.delete()
+
+
+def delete_user(user, batch_size, progress=None):
+    """
+    Удаляет комментарии пользователя, комментарии к его отзывам
+    и сами отзывы, затем пользователя.
+    """
+    delete_in_batches(
+        Comment.objects.filter(author_id=user.pk), batch_size, progress
+    )
+    delete_in_batches(
+        Comment.objects.filter(review__author_id=user.pk),
+        batch_size, progress
+    )
+    delete_in_batches(
+        Review.objects.filter(author_id=user.pk), batch_size, progress
+    )
+    user.delete()
+
+
+def process_deletions(batch_size=1000, progress=None):
+    """
+    Удаляет все произведения и всех пользователей, ожидающих удаления.
+    progress(родитель, model, удалено всего) вызывается после каждой пачки.
+    Возвращает количество удаленных произведений и пользователей.
+    """
+    titles = list(
+        Title.all_objects.filter(deleted_at__isnull=False).order_by('pk')
+    )
+    for title in titles:
+        delete_title(title, batch_size, progress and partial(progress, title))
+    users = list(
+        User.all_objects.filter(deleted_at__isnull=False).order_by('pk')
+    )
+    for user in users:
+        delete_user(user, batch_size, progress and partial(progress, user))
+    return len(titles), len(users)
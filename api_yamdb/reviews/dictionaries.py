@@ -0,0 +1,99 @@
+import threading
+
+from .models import Category, Genre, Title
+from .versions import LocalCopyVersion
+
+
+class DictionaryCache:
+    """
+    Кеш всех объектов небольшой справочной модели в памяти процесса.
+    Актуальность проверяется по версии в кеше не чаще раза за запрос:
+    при изменении справочника версия меняется, и каждый процесс
+    перечитывает таблицу при следующем обращении.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.version = LocalCopyVersion(
+            f'dictionary_version:{model._meta.label_lower}'
+        )
+        self._lock = threading.Lock()
+        self._by_id = {}
+        self._by_slug = {}
+
+    def __deepcopy__(self, memo):
+        # Кеш общий для процесса: поля сериализаторов, которые DRF копирует
+        # при создании каждого сериализатора, должны ссылаться на него же.
+        return self
+
+    def refresh(self):
+        """Перечитывает справочник, если его версия изменилась."""
+        version = self.version.stale()
+        if version is None:
+            return
+        with self._lock:
+            objects = list(self.model.objects.all())
+            self._by_id = {obj.pk: obj for obj in objects}
+            self._by_slug = {obj.slug: obj for obj in objects}
+            self.version.mark_loaded(version)
+
+    def invalidate(self):
+        self.version.bump()
+
+    def get(self, pk):
+        """
+        Объект по id. Отсутствующий в кеше id проверяется запросом:
+        объект мог быть создан в другом процессе после загрузки.
+        """
+        self.refresh()
+        obj = self._by_id.get(pk)
+        if obj is None and pk is not None:
+            obj = self.model.objects.filter(pk=pk).first()
+        return obj
+
+    def get_by_slug(self, slug):
+        return self.get_many_by_slug([slug]).get(slug)
+
+    def get_many_by_slug(self, slugs):
+        """
+        Возвращает словарь slug -> объект для найденных slug.
+        Отсутствующие в кеше slug проверяются одним запросом slug__in:
+        справочник мог измениться в другом процессе после загрузки.
+        """
+        self.refresh()
+        found = {
+            slug: self._by_slug[slug] for slug in slugs
+            if slug in self._by_slug
+        }
+        missing = set(slugs) - set(found)
+        if missing:
+            found.update(
+                (obj.slug, obj)
+                for obj in self.model.objects.filter(slug__in=missing)
+            )
+        return found
+
+    def all(self):
+        self.refresh()
+        return list(self._by_id.values())
+
+
+categories = DictionaryCache(Category)
+genres = DictionaryCache(Genre)
+
+
+def attach_genre_ids(titles):
+    """
+    Загружает id жанров для списка произведений одним запросом
+    к промежуточной таблице и сохраняет их в атрибуте genre_ids.
+    """
+    titles = [title for title in titles if title is not None]
+    genre_ids = {title.pk: [] for title in titles}
+    links = Title.genre.through.objects.filter(
+        title_id__in=genre_ids
+    ).order_by('id').values_list('title_id', 'genre_id')
+    for title_id, genre_id in links:
+        genre_ids[title_id].append(genre_id)
+    for title in titles:
+        title.genre_ids = genre_ids[title.pk]
+    return titles
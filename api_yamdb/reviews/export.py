@@ -0,0 +1,90 @@
+import csv
+import json
+from datetime import datetime
+
+from django.db.models import Q
+
+from .models import (VISIBLE_COMMENTS, VISIBLE_REVIEWS, Category, Comment,
+                     Genre, Review, Title, User)
+
+# Таблицы и столбцы в формате CSV-файлов команды import_csv_to_db:
+# имя файла без расширения -> (модель, [(столбец, поле модели)]).
+EXPORT_TABLES = {
+    'category': (Category, (
+        ('id', 'id'), ('name', 'name'), ('slug', 'slug'),
+    )),
+    'genre': (Genre, (
+        ('id', 'id'), ('name', 'name'), ('slug', 'slug'),
+    )),
+    'titles': (Title, (
+        ('id', 'id'), ('name', 'name'), ('year', 'year'),
+        ('category', 'category_id'), ('description', 'description'),
+    )),
+    'genre_title': (Title.genre.through, (
+        ('id', 'id'), ('title_id', 'title_id'), ('genre_id', 'genre_id'),
+    )),
+    'review': (Review, (
+        ('id', 'id'), ('title_id', 'title_id'), ('text', 'text'),
+        ('author', 'author_id'), ('score', 'score'),
+        ('pub_date', 'pub_date'),
+    )),
+    'comments': (Comment, (
+        ('id', 'id'), ('review_id', 'review_id'), ('text', 'text'),
+        ('author', 'author_id'), ('pub_date', 'pub_date'),
+    )),
+    'users': (User, (
+        ('id', 'id'), ('username', 'username'), ('email', 'email'),
+        ('role', 'role'), ('bio', 'bio'), ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+    )),
+}
+EXPORT_FORMATS = ('csv', 'ndjson')
+# Объекты, ожидающие удаления, и зависящие от них строки не выгружаются.
+EXPORT_FILTERS = {
+    'genre_title': Q(title__deleted_at__isnull=True),
+    'review': VISIBLE_REVIEWS,
+    'comments': VISIBLE_COMMENTS,
+}
+
+
+class Echo:
+    """Псевдобуфер для csv.writer: возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat().replace('+00:00', 'Z')
+    return value
+
+
+def export_rows(table, chunk_size=2000):
+    """
+    Построчно читает таблицу, не загружая ее в память целиком.
+    Возвращает генератор кортежей значений в порядке столбцов.
+    """
+    model, columns = EXPORT_TABLES[table]
+    rows = model.objects.filter(
+        EXPORT_FILTERS.get(table, Q())
+    ).order_by('id').values_list(
+        *(field for _, field in columns)
+    ).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield tuple(map(export_value, row))
+
+
+def export_lines(table, export_format='csv', chunk_size=2000):
+    """Генератор строк выгрузки таблицы в формате CSV или NDJSON."""
+    columns = [column for column, _ in EXPORT_TABLES[table][1]]
+    rows = export_rows(table, chunk_size)
+    if export_format == 'ndjson':
+        for row in rows:
+            yield json.dumps(dict(zip(columns, row)), ensure_ascii=False)
+            yield '\n'
+        return
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
@@ -0,0 +1,318 @@
+import math
+import os
+import socket
+import time
+import uuid
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import OperationalError
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Job
+
+JobHandler = namedtuple('JobHandler', ('func', 'batch_size', 'priority'))
+
+# Сколько раз повторяется запись статуса заданий, если БД заблокирована
+# другим воркером (SQLite).
+LOCKED_RETRIES = 5
+
+# Обработчики заданий по типу. Обработчик получает список параметров
+# (payload) пачки заданий одного типа.
+JOB_HANDLERS = {}
+
+
+def job_handler(kind, batch_size=1, priority=0):
+    """
+    Регистрирует обработчик заданий типа kind.
+    batch_size — сколько заданий этого типа воркер берет за раз,
+    priority — приоритет заданий по умолчанию (больше — раньше).
+    """
+    def decorator(func):
+        JOB_HANDLERS[kind] = JobHandler(func, batch_size, priority)
+        return func
+    return decorator
+
+
+def enqueue(kind, payload=None, priority=None, delay=0):
+    """Ставит задание в очередь; оно сохраняется в текущей транзакции."""
+    if priority is None:
+        priority = JOB_HANDLERS[kind].priority
+    return Job.objects.create(
+        kind=kind,
+        payload=payload or {},
+        priority=priority,
+        run_after=timezone.now() + timedelta(seconds=delay)
+    )
+
+
+def submit(kind, payload=None, priority=None):
+    """
+    Выполняет работу типа kind сразу или, если тип указан
+    в JOBS_DEFERRED, ставит ее в очередь фоновых заданий.
+    """
+    if kind in settings.JOBS_DEFERRED:
+        return enqueue(kind, payload, priority)
+    JOB_HANDLERS[kind].func([payload or {}])
+    return None
+
+
+def claimable_jobs(now):
+    """
+    Задания, готовые к выполнению, и задания с истекшей арендой,
+    у которых остались попытки.
+    """
+    return Job.objects.filter(
+        Q(status='pending', run_after__lte=now)
+        | Q(
+            status='running',
+            locked_until__lt=now,
+            attempts__lt=settings.JOB_MAX_ATTEMPTS
+        )
+    )
+
+
+def claim_jobs(worker, kinds=None):
+    """
+    Берет пачку заданий одного типа с наибольшим приоритетом.
+    Задания захватываются одним UPDATE с повторной проверкой условий,
+    поэтому одно задание не достается двум воркерам. Возвращает
+    (тип, список заданий) или (None, []), если заданий нет.
+    """
+    now = timezone.now()
+    claimable = claimable_jobs(now).filter(
+        kind__in=kinds if kinds is not None else list(JOB_HANDLERS)
+    )
+    kind = claimable.order_by('-priority', 'id').values_list(
+        'kind', flat=True
+    ).first()
+    if kind is None:
+        return None, []
+    token = f'{worker}:{uuid.uuid4().hex}'
+    batch = claimable.filter(kind=kind).order_by(
+        '-priority', 'id'
+    ).values('pk')[:JOB_HANDLERS[kind].batch_size]
+    claimed = claimable.filter(kind=kind, pk__in=batch).update(
+        status='running',
+        locked_by=token,
+        locked_until=now + timedelta(seconds=settings.JOB_LEASE_TIMEOUT),
+        started_at=now,
+        attempts=F('attempts') + 1
+    )
+    if not claimed:
+        return kind, []
+    return kind, list(Job.objects.filter(locked_by=token).order_by('id'))
+
+
+def retry_locked(func):
+    """
+    Выполняет запись, повторяя ее через JOB_POLL_INTERVAL секунд,
+    пока БД заблокирована. Обработчик уже выполнен, поэтому статус
+    нужно записать, а не ждать повторного выполнения заданий после
+    истечения аренды.
+    """
+    for attempt in range(LOCKED_RETRIES):
+        try:
+            return func()
+        except OperationalError:
+            if attempt == LOCKED_RETRIES - 1:
+                raise
+            time.sleep(settings.JOB_POLL_INTERVAL)
+
+
+def run_jobs(kind, jobs):
+    """
+    Выполняет пачку заданий одним вызовом обработчика.
+    При ошибке задания возвращаются в очередь через JOB_RETRY_DELAY
+    секунд, после JOB_MAX_ATTEMPTS попыток помечаются как failed.
+    Параметры завершенных заданий очищаются: в них могут быть
+    персональные данные. Возвращает текст ошибки или None.
+    """
+    ids = [job.pk for job in jobs]
+    owned = Job.objects.filter(pk__in=ids, locked_by=jobs[0].locked_by)
+    try:
+        JOB_HANDLERS[kind].func([job.payload for job in jobs])
+    except Exception as error:
+        message = f'{type(error).__name__}: {error}'
+        retry_locked(lambda: owned.filter(
+            attempts__gte=settings.JOB_MAX_ATTEMPTS
+        ).update(
+            status='failed',
+            payload={},
+            locked_until=None,
+            finished_at=timezone.now(),
+            last_error=message
+        ))
+        retry_locked(lambda: owned.filter(status='running').update(
+            status='pending',
+            locked_until=None,
+            run_after=timezone.now() + timedelta(
+                seconds=settings.JOB_RETRY_DELAY
+            ),
+            last_error=message
+        ))
+        return message
+    retry_locked(lambda: owned.update(
+        status='done',
+        payload={},
+        locked_until=None,
+        finished_at=timezone.now()
+    ))
+    return None
+
+
+def fail_abandoned_jobs():
+    """
+    Помечает как failed задания с истекшей арендой, исчерпавшие
+    JOB_MAX_ATTEMPTS попыток: воркер каждый раз падал на них, не успев
+    записать результат. Возвращает количество таких заданий.
+    """
+    now = timezone.now()
+    return Job.objects.filter(
+        status='running',
+        locked_until__lt=now,
+        attempts__gte=settings.JOB_MAX_ATTEMPTS
+    ).update(
+        status='failed',
+        payload={},
+        locked_until=None,
+        finished_at=now,
+        last_error='Истекла аренда задания'
+    )
+
+
+def purge_jobs(retention=None):
+    """Удаляет выполненные задания старше JOB_RETENTION секунд."""
+    if retention is None:
+        retention = settings.JOB_RETENTION
+    return Job.objects.filter(
+        status='done',
+        finished_at__lt=timezone.now() - timedelta(seconds=retention)
+    ).delete()[0]
+
+
+def percentile(values, share):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, math.ceil(share * len(values)) - 1)]
+
+
+def job_stats(window=3600):
+    """
+    Метрики очереди по типам заданий за последние window секунд:
+    количество заданий по статусам, пропускная способность (заданий
+    в секунду), ожидание в очереди и время выполнения (секунды).
+    Считаются по таблице заданий, поэтому включают все воркеры.
+    """
+    since = timezone.now() - timedelta(seconds=window)
+    stats = {
+        row['kind']: {
+            'pending': row['pending'],
+            'running': row['running'],
+            'failed': row['failed'],
+            'done': 0,
+            'throughput': 0.0,
+            'wait_avg': None,
+            'run_avg': None,
+            'run_p95': None,
+        }
+        for row in Job.objects.values('kind').annotate(
+            pending=Count('pk', filter=Q(status='pending')),
+            running=Count('pk', filter=Q(status='running')),
+            failed=Count('pk', filter=Q(status='failed')),
+        ).order_by('kind')
+    }
+    finished = {}
+    for kind, created_at, started_at, finished_at in Job.objects.filter(
+        status='done', finished_at__gte=since
+    ).values_list('kind', 'created_at', 'started_at', 'finished_at'):
+        waits, runs = finished.setdefault(kind, ([], []))
+        waits.append((started_at - created_at).total_seconds())
+        runs.append((finished_at - started_at).total_seconds())
+    for kind, (waits, runs) in finished.items():
+        stats[kind].update(
+            done=len(runs),
+            throughput=len(runs) / window,
+            wait_avg=sum(waits) / len(waits),
+            run_avg=sum(runs) / len(runs),
+            run_p95=percentile(runs, 0.95)
+        )
+    return stats
+
+
+class Worker:
+    """
+    Воркер очереди: берет пачки заданий и выполняет их.
+    Несколько воркеров (процессов или машин) могут работать
+    с одной очередью одновременно.
+    """
+
+    def __init__(self, name=None, kinds=None, report=None):
+        self.name = name or f'{socket.gethostname()}-{os.getpid()}'
+        self.kinds = kinds
+        self.report = report
+        self.stopping = False
+        self.maintained_at = None
+
+    def stop(self, *args):
+        """Завершает работу после текущей пачки."""
+        self.stopping = True
+
+    def run_once(self):
+        """Выполняет одну пачку. Возвращает количество заданий в ней."""
+        try:
+            kind, jobs = claim_jobs(self.name, self.kinds)
+        except OperationalError:
+            # Очередь занята другим воркером (блокировка SQLite).
+            return 0
+        if not jobs:
+            return 0
+        started = time.monotonic()
+        try:
+            error = run_jobs(kind, jobs)
+        except OperationalError as exception:
+            # Статус не записан: задания снова возьмут после аренды.
+            error = f'{type(exception).__name__}: {exception}'
+        if self.report is not None:
+            self.report(kind, len(jobs), time.monotonic() - started, error)
+        return len(jobs)
+
+    def maintain(self):
+        """
+        Обслуживание очереди — не чаще раза в JOB_MAINTENANCE_INTERVAL
+        секунд: задания с исчерпанными попытками и удаление старых.
+        """
+        now = time.monotonic()
+        if (
+            self.maintained_at is not None
+            and now - self.maintained_at < settings.JOB_MAINTENANCE_INTERVAL
+        ):
+            return
+        self.maintained_at = now
+        try:
+            fail_abandoned_jobs()
+            purge_jobs()
+        except OperationalError:
+            # Повторится при следующем простое.
+            self.maintained_at = None
+
+    def run(self, burst=False):
+        """
+        Выполняет задания, пока не вызван stop(). В режиме burst
+        завершается, как только готовых заданий не осталось.
+        Возвращает количество выполненных заданий.
+        """
+        total = 0
+        while not self.stopping:
+            count = self.run_once()
+            total += count
+            if count:
+                continue
+            if burst:
+                break
+            self.maintain()
+            time.sleep(settings.JOB_POLL_INTERVAL)
+        return total
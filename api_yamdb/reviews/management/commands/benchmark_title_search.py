@@ -0,0 +1,109 @@
+import random
+import time
+
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title
+from reviews.trigrams import index_titles, search_titles
+
+SYLLABLES = (
+    'ка', 'ро', 'ли', 'на', 'мо', 'ве', 'ст', 'тор', 'ми', 'ра', 'ло', 'зе',
+    'ba', 'ri', 'to', 'la', 'me', 'no', 'ster', 'ga', 'vi', 'ton', 'el', 'du',
+)
+
+
+def random_word(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def misspell(name, rng):
+    """Одна опечатка: замена, пропуск или перестановка соседних букв."""
+    letters = list(name)
+    index = rng.randrange(len(letters) - 1)
+    kind = rng.choice(('replace', 'delete', 'swap'))
+    if kind == 'replace':
+        letters[index] = rng.choice('аеиоуaeiou')
+    elif kind == 'delete':
+        del letters[index]
+    else:
+        letters[index], letters[index + 1] = (
+            letters[index + 1], letters[index]
+        )
+    return ''.join(letters)
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+class Command(BaseCommand):
+    """
+    Замер времени нечеткого поиска на синтетическом каталоге.
+    Произведения создаются в транзакции, которая откатывается
+    в конце замера, поэтому данные в БД не меняются.
+    """
+
+    help = 'Измеряет время нечеткого поиска произведений по триграммам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--titles',
+            type=int,
+            default=100000,
+            help='Количество синтетических произведений.'
+        )
+        parser.add_argument(
+            '--queries',
+            type=int,
+            default=200,
+            help='Количество поисковых запросов с опечатками.'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Начальное значение генератора случайных чисел.'
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        names = [
+            ' '.join(random_word(rng) for _ in range(rng.randint(1, 3)))
+            for _ in range(options['titles'])
+        ]
+        with transaction.atomic():
+            started = time.perf_counter()
+            last_pk = Title.objects.order_by('-pk').values_list(
+                'pk', flat=True
+            ).first() or 0
+            Title.objects.bulk_create(
+                (Title(name=name, year=2000) for name in names),
+                batch_size=1000
+            )
+            index_titles(
+                Title.objects.filter(pk__gt=last_pk).values_list(
+                    'pk', 'name'
+                ).iterator(),
+                created=True
+            )
+            self.stdout.write(
+                f'Каталог: {len(names)} произведений, индекс построен за '
+                f'{time.perf_counter() - started:.1f} с'
+            )
+            timings = []
+            found = 0
+            for _ in range(options['queries']):
+                query = misspell(rng.choice(names), rng)
+                started = time.perf_counter()
+                results = search_titles(query)
+                timings.append((time.perf_counter() - started) * 1000)
+                found += bool(results)
+            transaction.set_rollback(True)
+        self.stdout.write(self.style.SUCCESS(
+            f'Запросов: {len(timings)}, с результатами: {found}; '
+            f'p50 {percentile(timings, 0.5):.1f} мс, '
+            f'p95 {percentile(timings, 0.95):.1f} мс, '
+            f'max {max(timings):.1f} мс'
+        ))
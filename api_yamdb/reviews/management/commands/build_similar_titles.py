@@ -0,0 +1,36 @@
+from django.core.management import BaseCommand
+
+from reviews.similarity import rebuild_similar_titles
+
+
+class Command(BaseCommand):
+    """Построение списков похожих произведений по оценкам пользователей."""
+
+    help = 'Пересчитывает таблицу похожих произведений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k',
+            type=int,
+            help='Количество соседей для каждого произведения.'
+        )
+        parser.add_argument(
+            '--min-common',
+            type=int,
+            help='Минимальное число пользователей, оценивших оба произведения.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Количество произведений, обрабатываемых за один шаг.'
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_similar_titles(
+            top_k=options['top_k'],
+            min_common=options['min_common'],
+            chunk_size=options['chunk_size']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Сохранено {count} пар похожих произведений'
+        ))
@@ -0,0 +1,24 @@
+from django.core.management import BaseCommand
+
+from reviews.recommendations import build_title_features
+
+
+class Command(BaseCommand):
+    """Построение матрицы признаков произведений для рекомендаций."""
+
+    help = (
+        'Сохраняет признаки произведений (жанры, категория, рейтинг) '
+        'в файл, который веб-процессы отображают в память.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            help='Путь к файлу признаков (по умолчанию TITLE_FEATURES_PATH).'
+        )
+
+    def handle(self, *args, **options):
+        count = build_title_features(options['path'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Признаки сохранены для {count} произведений'
+        ))
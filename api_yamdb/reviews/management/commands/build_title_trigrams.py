@@ -0,0 +1,26 @@
+from django.core.management import BaseCommand
+
+from reviews.trigrams import rebuild_title_trigrams
+
+
+class Command(BaseCommand):
+    """Перестроение индекса триграмм названий произведений."""
+
+    help = (
+        'Перестраивает индекс триграмм для нечеткого поиска произведений '
+        '(например, после import_csv_to_db).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество произведений в одной пачке.'
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_title_trigrams(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Индекс триграмм перестроен: произведений {count}'
+        ))
@@ -0,0 +1,54 @@
+import os
+
+from django.core.management import BaseCommand
+
+from reviews.export import EXPORT_FORMATS, EXPORT_TABLES, export_lines
+
+
+class Command(BaseCommand):
+    """Выгрузка данных из БД в файлы CSV или NDJSON."""
+
+    help = (
+        'Выгружает таблицы в формате файлов import_csv_to_db. '
+        'Данные читаются порциями, память не зависит от размера таблиц.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=EXPORT_FORMATS,
+            default='csv',
+            help='Формат файлов.'
+        )
+        parser.add_argument(
+            '--output-dir',
+            default='export',
+            help='Папка для файлов выгрузки.'
+        )
+        parser.add_argument(
+            '--tables',
+            nargs='+',
+            choices=list(EXPORT_TABLES),
+            default=list(EXPORT_TABLES),
+            help='Выгружаемые таблицы.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Количество строк, читаемых из БД за один раз.'
+        )
+
+    def handle(self, *args, **options):
+        export_format = options['format']
+        os.makedirs(options['output_dir'], exist_ok=True)
+        for table in options['tables']:
+            path = os.path.join(
+                options['output_dir'], f'{table}.{export_format}'
+            )
+            self.stdout.write(f'Выгрузка {table} в {path}...')
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                f.writelines(export_lines(
+                    table, export_format, options['chunk_size']
+                ))
+        self.stdout.write(self.style.SUCCESS('Все данные успешно выгружены'))
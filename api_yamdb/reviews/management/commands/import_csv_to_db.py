@@ -30,7 +30,8 @@ class Command(BaseCommand):
 
         for key, (file_path, model) in data_files.items():
             self.stdout.write(f'Очистка данных для модели {key}...')
-            model.objects.all().delete()
+            # Базовый менеджер видит и объекты, ожидающие удаления.
+            model._base_manager.all().delete()
 
             self.stdout.write(f'Загрузка данных для модели {key}...')
             self.load_data(file_path, model, key)
@@ -59,6 +60,8 @@ class Command(BaseCommand):
             return self.process_comments_row(row)
         if key == 'reviews':
             return self.process_reviews_row(row)
+        if key == 'users':
+            return self.process_users_row(row)
         return row
 
     def process_titles_row(self, row):
@@ -99,3 +102,12 @@ class Command(BaseCommand):
                 f"Пользователь с id={user_id} не найден. Пропуск строки."
             )
             return None
+
+    def process_users_row(self, row):
+        """
+        Обрабатывает строку для модели User: bulk_create не вызывает
+        User.save(), поэтому колонки для поиска заполняются здесь.
+        """
+        row['username_lower'] = row['username'].lower()
+        row['email_lower'] = row['email'].lower()
+        return row
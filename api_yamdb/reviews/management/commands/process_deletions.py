@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from reviews.deletion import process_deletions
+
+
+class Command(BaseCommand):
+    """Удаление произведений и пользователей, помеченных на удаление."""
+
+    help = (
+        'Удаляет пачками отзывы и комментарии произведений и пользователей, '
+        'ожидающих удаления, затем их самих.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.DELETION_BATCH_SIZE,
+            help='Количество записей, удаляемых одной транзакцией.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Повторять обработку с этим интервалом (секунды).'
+        )
+
+    def progress(self, parent, model, total):
+        self.stdout.write(
+            f'{parent._meta.model_name} {parent.pk}: '
+            f'{model._meta.model_name} удалено {total}'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            titles, users = process_deletions(
+                options['batch_size'], self.progress
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f'Удалено произведений: {titles}, пользователей: {users}'
+            ))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
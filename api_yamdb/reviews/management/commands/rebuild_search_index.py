@@ -0,0 +1,23 @@
+from django.core.management import BaseCommand
+
+from reviews.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """Перестроение полнотекстовых индексов отзывов и комментариев."""
+
+    help = 'Перестраивает индексы FTS5 по текстам отзывов и комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество записей в одной пачке.'
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_search_index(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Полнотекстовый индекс перестроен: записей {count}'
+        ))
@@ -0,0 +1,16 @@
+from django.core.management import BaseCommand
+
+from reviews.stats import refresh_catalog_stats
+
+
+class Command(BaseCommand):
+    """Пакетный пересчет статистики категорий и жанров."""
+
+    help = 'Пересчитывает статистику произведений по категориям и жанрам.'
+
+    def handle(self, *args, **options):
+        categories_count, genres_count = refresh_catalog_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'Статистика обновлена: категорий {categories_count}, '
+            f'жанров {genres_count}'
+        ))
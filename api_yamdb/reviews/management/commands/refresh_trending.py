@@ -0,0 +1,18 @@
+from django.core.management import BaseCommand
+
+from reviews.trending import refresh_trending
+
+
+class Command(BaseCommand):
+    """Инкрементальный пересчет популярности произведений."""
+
+    help = (
+        'Обновляет популярность произведений по отзывам и комментариям, '
+        'опубликованным после предыдущего запуска.'
+    )
+
+    def handle(self, *args, **options):
+        count = refresh_trending()
+        self.stdout.write(self.style.SUCCESS(
+            f'Популярность обновлена, новая активность у {count} произведений'
+        ))
@@ -0,0 +1,99 @@
+import multiprocessing
+import signal
+
+from django.core.management import BaseCommand
+from django.db import connections
+
+from reviews.jobs import Worker, job_stats
+
+
+class Command(BaseCommand):
+    """Воркер очереди фоновых заданий."""
+
+    help = (
+        'Выполняет фоновые задания из очереди в БД. Несколько процессов '
+        'и экземпляров команды могут работать одновременно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=1,
+            help='Количество процессов-воркеров.'
+        )
+        parser.add_argument(
+            '--kind',
+            action='append',
+            dest='kinds',
+            help='Выполнять только задания этого типа (можно повторять).'
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Завершиться, когда готовых заданий не останется.'
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Вывести метрики очереди по типам заданий и завершиться.'
+        )
+        parser.add_argument(
+            '--window',
+            type=int,
+            default=3600,
+            help='Окно для метрик пропускной способности (секунды).'
+        )
+
+    def report(self, kind, count, duration, error):
+        if error is None:
+            self.stdout.write(f'{kind}: {count} за {duration:.3f} с')
+        else:
+            self.stderr.write(f'{kind}: {count} с ошибкой {error}')
+
+    def run_worker(self, name, options):
+        worker = Worker(name, options['kinds'], self.report)
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+        worker.run(burst=options['burst'])
+
+    def write_stats(self, window):
+        for kind, stats in job_stats(window).items():
+            self.stdout.write(
+                f'{kind}: в очереди {stats["pending"]}, '
+                f'выполняется {stats["running"]}, '
+                f'ошибок {stats["failed"]}, выполнено {stats["done"]} '
+                f'({stats["throughput"] * 60:.2f} в минуту)'
+            )
+            if stats['done']:
+                self.stdout.write(
+                    f'  ожидание {stats["wait_avg"]:.3f} с, выполнение '
+                    f'{stats["run_avg"]:.3f} с (p95 {stats["run_p95"]:.3f} с)'
+                )
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.write_stats(options['window'])
+            return
+        if options['processes'] <= 1:
+            self.run_worker(None, options)
+            return
+        # Соединения с БД не должны разделяться дочерними процессами.
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(
+                target=self.run_worker, args=(None, options)
+            )
+            for _ in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+
+        def terminate(*args):
+            # Воркеры завершаются после текущей пачки.
+            for process in processes:
+                process.terminate()
+
+        signal.signal(signal.SIGTERM, terminate)
+        for process in processes:
+            process.join()
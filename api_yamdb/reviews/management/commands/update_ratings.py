@@ -0,0 +1,23 @@
+from django.core.management import BaseCommand
+
+from reviews.ratings import recalculate_ratings
+
+
+class Command(BaseCommand):
+    """Пересчет предрасчитанных рейтингов всех произведений."""
+
+    help = 'Пересчитывает средний и взвешенный рейтинги произведений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Размер пачки при записи рейтингов.'
+        )
+
+    def handle(self, *args, **options):
+        count = recalculate_ratings(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинги пересчитаны для {count} произведений'
+        ))
@@ -0,0 +1,57 @@
+# Generated by Django 3.2 on 2026-10-19 10:41
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+
+
+def fill_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleRating = apps.get_model('reviews', 'TitleRating')
+    prior_weight = settings.RATING_PRIOR_WEIGHT
+    prior_mean = settings.RATING_PRIOR_MEAN
+    ratings = []
+    totals = Title.objects.annotate(
+        score_sum=Sum('reviews__score'),
+        reviews_count=Count('reviews')
+    ).values_list('id', 'score_sum', 'reviews_count')
+    for title_id, score_sum, reviews_count in totals:
+        score_sum = score_sum or 0
+        ratings.append(TitleRating(
+            title_id=title_id,
+            reviews_count=reviews_count,
+            score_sum=score_sum,
+            average=score_sum / reviews_count if reviews_count else None,
+            weighted=(
+                (prior_weight * prior_mean + score_sum)
+                / (prior_weight + reviews_count)
+                if reviews_count else None
+            )
+        ))
+    TitleRating.objects.bulk_create(ratings, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_alter_review_managers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleRating',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_stats', serialize=False, to='reviews.title', verbose_name='произведение')),
+                ('reviews_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('score_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('average', models.FloatField(null=True, verbose_name='Средняя оценка')),
+                ('weighted', models.FloatField(db_index=True, null=True, verbose_name='Взвешенный рейтинг')),
+            ],
+            options={
+                'verbose_name': 'Рейтинг произведения',
+                'verbose_name_plural': 'Рейтинги произведений',
+            },
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
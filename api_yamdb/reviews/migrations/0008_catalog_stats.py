@@ -0,0 +1,46 @@
+# Generated by Django 3.2 on 2026-10-19 10:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_similartitle'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryStats',
+            fields=[
+                ('titles_count', models.PositiveIntegerField(default=0, verbose_name='Количество произведений')),
+                ('reviews_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('average_rating', models.FloatField(null=True, verbose_name='Средняя оценка')),
+                ('min_year', models.IntegerField(null=True, verbose_name='Первый год')),
+                ('max_year', models.IntegerField(null=True, verbose_name='Последний год')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата пересчета')),
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.category', verbose_name='категория')),
+            ],
+            options={
+                'verbose_name': 'Статистика категории',
+                'verbose_name_plural': 'Статистика категорий',
+            },
+        ),
+        migrations.CreateModel(
+            name='GenreStats',
+            fields=[
+                ('titles_count', models.PositiveIntegerField(default=0, verbose_name='Количество произведений')),
+                ('reviews_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('average_rating', models.FloatField(null=True, verbose_name='Средняя оценка')),
+                ('min_year', models.IntegerField(null=True, verbose_name='Первый год')),
+                ('max_year', models.IntegerField(null=True, verbose_name='Последний год')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата пересчета')),
+                ('genre', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.genre', verbose_name='жанр')),
+            ],
+            options={
+                'verbose_name': 'Статистика жанра',
+                'verbose_name_plural': 'Статистика жанров',
+            },
+        ),
+    ]
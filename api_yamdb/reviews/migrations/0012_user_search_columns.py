@@ -0,0 +1,38 @@
+# Generated by Django 3.2 on 2026-10-19 11:22
+
+from django.db import migrations, models
+
+
+def fill_search_columns(apps, schema_editor):
+    # Нижний регистр вычисляется в Python: lower() в SQLite меняет
+    # только ASCII-символы и не совпадает с str.lower() для кириллицы.
+    User = apps.get_model('reviews', 'User')
+    users = []
+    for user in User.objects.only('username', 'email').iterator():
+        user.username_lower = user.username.lower()
+        user.email_lower = user.email.lower()
+        users.append(user)
+    User.objects.bulk_update(
+        users, ('username_lower', 'email_lower'), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_lower',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='username_lower',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=150),
+        ),
+        migrations.RunPython(fill_search_columns, migrations.RunPython.noop),
+    ]
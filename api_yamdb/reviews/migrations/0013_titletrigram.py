@@ -0,0 +1,58 @@
+# Generated by Django 3.2 on 2026-10-19 11:26
+
+import re
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def title_trigrams(name):
+    result = set()
+    normalized = ' '.join(name.lower().replace('ё', 'е').split())
+    for word in re.findall(r'\w+', normalized):
+        padded = f'  {word} '
+        result.update(
+            padded[index:index + 3] for index in range(len(padded) - 2)
+        )
+    return result
+
+
+def fill_trigrams(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleTrigram = apps.get_model('reviews', 'TitleTrigram')
+    rows = []
+    for pk, name in Title.objects.values_list('pk', 'name').iterator():
+        trigrams = title_trigrams(name)
+        rows.extend(
+            TitleTrigram(title_id=pk, trigram=trigram, title_size=len(trigrams))
+            for trigram in trigrams
+        )
+    TitleTrigram.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_user_search_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3, verbose_name='Триграмма')),
+                ('title_size', models.PositiveSmallIntegerField(verbose_name='Количество триграмм названия')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='reviews.title', verbose_name='произведение')),
+            ],
+            options={
+                'verbose_name': 'Триграмма названия',
+                'verbose_name_plural': 'Триграммы названий',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titletrigram',
+            index=models.Index(fields=['trigram', 'title', 'title_size'], name='title_trigram_lookup_idx'),
+        ),
+        migrations.RunPython(fill_trigrams, migrations.RunPython.noop),
+    ]
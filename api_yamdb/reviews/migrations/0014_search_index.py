@@ -0,0 +1,53 @@
+# Generated by Django 3.2 on 2026-10-19 11:40
+
+from django.db import migrations
+
+# Полнотекстовые индексы FTS5 по текстам отзывов и комментариев.
+# Индексы хранят только термы (external content), тексты берутся из
+# исходных таблиц; триггеры поддерживают индексы при любых изменениях.
+INDEXED_TABLES = ('reviews_review', 'reviews_comment')
+
+CREATE_SQL = (
+    "CREATE VIRTUAL TABLE {table}_fts USING fts5("
+    "text, content='{table}', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER {table}_fts_insert AFTER INSERT ON {table} BEGIN "
+    "INSERT INTO {table}_fts(rowid, text) VALUES (new.id, new.text); END",
+    "CREATE TRIGGER {table}_fts_delete AFTER DELETE ON {table} BEGIN "
+    "INSERT INTO {table}_fts({table}_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER {table}_fts_update AFTER UPDATE OF text ON {table} "
+    "BEGIN "
+    "INSERT INTO {table}_fts({table}_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO {table}_fts(rowid, text) VALUES (new.id, new.text); END",
+    "INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')",
+)
+
+DROP_SQL = (
+    "DROP TRIGGER IF EXISTS {table}_fts_insert",
+    "DROP TRIGGER IF EXISTS {table}_fts_delete",
+    "DROP TRIGGER IF EXISTS {table}_fts_update",
+    "DROP TABLE IF EXISTS {table}_fts",
+)
+
+
+def run_sql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for table in INDEXED_TABLES:
+            for statement in statements:
+                schema_editor.execute(statement.format(table=table))
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_titletrigram'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sql(CREATE_SQL), run_sql(DROP_SQL)),
+    ]
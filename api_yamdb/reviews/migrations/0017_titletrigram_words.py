@@ -0,0 +1,91 @@
+# Generated by Django 3.2 on 2026-10-19 13:05
+
+import re
+
+from django.db import migrations, models
+
+
+def word_trigrams(name):
+    result = []
+    normalized = ' '.join(name.lower().replace('ё', 'е').split())
+    for word in re.findall(r'\w+', normalized):
+        padded = f'  {word} '
+        result.append({
+            padded[index:index + 3] for index in range(len(padded) - 2)
+        })
+    return result
+
+
+def fill_word_trigrams(apps, schema_editor):
+    # Триграммы теперь хранятся по словам, поэтому индекс
+    # перестраивается целиком.
+    Title = apps.get_model('reviews', 'Title')
+    TitleTrigram = apps.get_model('reviews', 'TitleTrigram')
+    TitleTrigram.objects.all().delete()
+    rows = []
+    for pk, name in Title.objects.values_list('pk', 'name').iterator():
+        words = word_trigrams(name)
+        title_size = len(set().union(*words))
+        rows.extend(
+            TitleTrigram(
+                title_id=pk,
+                trigram=trigram,
+                title_size=title_size,
+                word=word,
+                word_size=len(word_set)
+            )
+            for word, word_set in enumerate(words)
+            for trigram in word_set
+        )
+    TitleTrigram.objects.bulk_create(rows, batch_size=1000)
+
+
+def fill_title_trigrams(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleTrigram = apps.get_model('reviews', 'TitleTrigram')
+    TitleTrigram.objects.all().delete()
+    rows = []
+    for pk, name in Title.objects.values_list('pk', 'name').iterator():
+        trigrams = set().union(*word_trigrams(name))
+        rows.extend(
+            TitleTrigram(
+                title_id=pk,
+                trigram=trigram,
+                title_size=len(trigrams),
+                word=0,
+                word_size=0
+            )
+            for trigram in trigrams
+        )
+    TitleTrigram.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0016_job_queue'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='titletrigram',
+            name='title_trigram_lookup_idx',
+        ),
+        migrations.AddField(
+            model_name='titletrigram',
+            name='word',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Номер слова в названии'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='titletrigram',
+            name='word_size',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Количество триграмм слова'),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='titletrigram',
+            index=models.Index(fields=['trigram', 'title', 'word', 'word_size', 'title_size'], name='title_trigram_lookup_idx'),
+        ),
+        migrations.RunPython(fill_word_trigrams, fill_title_trigrams),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
-from django.contrib.auth.models import AbstractUser
+from django.db.models import Q
+from django.contrib.auth.models import AbstractUser, UserManager
+from django.core.exceptions import NON_FIELD_ERRORS
 from django.core.validators import MaxValueValidator, MinValueValidator
 
 from . import constants
@@ -11,6 +13,46 @@ ROLES = (
     ('user', 'user'),
 )
 
+CHANGE_ACTIONS = (
+    ('created', 'created'),
+    ('updated', 'updated'),
+    ('deleted', 'deleted'),
+)
+
+JOB_STATUSES = (
+    ('pending', 'pending'),
+    ('running', 'running'),
+    ('done', 'done'),
+    ('failed', 'failed'),
+)
+
+
+class ActiveManager(models.Manager):
+    """
+    Менеджер без объектов, ожидающих удаления.
+    Такие объекты скрыты сразу, а удаляются вместе с зависимыми
+    командой process_deletions.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class ActiveUserManager(ActiveManager, UserManager):
+    pass
+
+
+# Отзывы и комментарии, видимые в API: ни автор, ни произведение
+# (и для комментария — автор отзыва) не ожидают удаления.
+VISIBLE_REVIEWS = Q(
+    author__deleted_at__isnull=True, title__deleted_at__isnull=True
+)
+VISIBLE_COMMENTS = Q(
+    author__deleted_at__isnull=True,
+    review__author__deleted_at__isnull=True,
+    review__title__deleted_at__isnull=True
+)
+
 
 class User(AbstractUser):
     email = models.EmailField(max_length=constants.EMAIL_LENGHT, unique=True)
@@ -24,6 +66,93 @@ class User(AbstractUser):
         blank=True,
         choices=ROLES
     )
+    # Увеличивается при изменении прав: выданные ранее токены с claims
+    # роли перестают приниматься.
+    token_version = models.PositiveIntegerField(default=0)
+    # Имя и почта в нижнем регистре для поиска по префиксу по индексу.
+    username_lower = models.CharField(
+        max_length=constants.NAME_LENGHT,
+        db_index=True,
+        editable=False,
+        default=''
+    )
+    email_lower = models.CharField(
+        max_length=constants.EMAIL_LENGHT,
+        db_index=True,
+        editable=False,
+        default=''
+    )
+    # Момент запроса на удаление: пользователь уже скрыт, его отзывы
+    # и комментарии еще удаляются.
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = ActiveUserManager()
+    all_objects = UserManager()
+
+    # Поля, от которых зависят claims токена.
+    TOKEN_RIGHTS_FIELDS = ('role', 'is_superuser', 'is_active')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.saved_rights = instance.token_rights()
+        return instance
+
+    def token_rights(self):
+        return tuple(
+            self.__dict__.get(field) for field in self.TOKEN_RIGHTS_FIELDS
+        )
+
+    def save(self, *args, **kwargs):
+        self.username_lower = self.username.lower()
+        self.email_lower = self.email.lower()
+        rights = self.token_rights()
+        rights_changed = (
+            not self._state.adding
+            and getattr(self, 'saved_rights', rights) != rights
+        )
+        if rights_changed:
+            self.token_version += 1
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'username' in update_fields:
+                update_fields.add('username_lower')
+            if 'email' in update_fields:
+                update_fields.add('email_lower')
+            if rights_changed:
+                update_fields.add('token_version')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+        self.saved_rights = rights
+
+    def _perform_unique_checks(self, unique_checks):
+        """
+        Django проверяет уникальность через менеджер по умолчанию,
+        который не видит пользователей, ожидающих удаления: их имя
+        и почта прошли бы проверку и нарушили ограничение в БД.
+        """
+        errors = super()._perform_unique_checks(unique_checks)
+        for model_class, unique_check in unique_checks:
+            if any(field in errors for field in unique_check):
+                continue
+            lookup = {
+                field: getattr(self, self._meta.get_field(field).attname)
+                for field in unique_check
+            }
+            if None in lookup.values():
+                continue
+            pending = User.all_objects.filter(
+                deleted_at__isnull=False, **lookup
+            ).exclude(pk=self.pk)
+            if pending.exists():
+                key = unique_check[0] if len(unique_check) == 1 else (
+                    NON_FIELD_ERRORS
+                )
+                errors.setdefault(key, []).append(
+                    self.unique_error_message(model_class, unique_check)
+                )
+        return errors
 
     @property
     def is_admin(self):
@@ -61,6 +190,63 @@ class Genre(models.Model):
         return self.name
 
 
+class CatalogStats(models.Model):
+    """
+    Агрегированная статистика по группе произведений.
+    Пересчитывается пакетно командой refresh_catalog_stats.
+    """
+
+    titles_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество произведений'
+    )
+    reviews_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество отзывов'
+    )
+    average_rating = models.FloatField(
+        null=True,
+        verbose_name='Средняя оценка'
+    )
+    min_year = models.IntegerField(null=True, verbose_name='Первый год')
+    max_year = models.IntegerField(null=True, verbose_name='Последний год')
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата пересчета'
+    )
+
+    class Meta:
+        abstract = True
+
+
+class CategoryStats(CatalogStats):
+    category = models.OneToOneField(
+        Category,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='категория'
+    )
+
+    class Meta:
+        verbose_name = 'Статистика категории'
+        verbose_name_plural = 'Статистика категорий'
+
+
+class GenreStats(CatalogStats):
+    genre = models.OneToOneField(
+        Genre,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='жанр'
+    )
+
+    class Meta:
+        verbose_name = 'Статистика жанра'
+        verbose_name_plural = 'Статистика жанров'
+
+
 class Title(models.Model):
     name = models.CharField(max_length=constants.FIELD_LENGTH)
     year = models.IntegerField()
@@ -71,6 +257,10 @@ class Title(models.Model):
         on_delete=models.SET_NULL,
         null=True
     )
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
 
     class Meta:
         verbose_name = 'Произведение'
@@ -79,6 +269,192 @@ class Title(models.Model):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Название на момент загрузки: триграммы пересчитываются,
+        # только если оно изменилось.
+        instance.indexed_name = instance.__dict__.get('name')
+        return instance
+
+    def set_genres(self, genre_ids, created=False):
+        """
+        Записывает связи с жанрами по разнице с текущими связями:
+        не больше одной выборки, одного удаления и одной пакетной вставки.
+        """
+        through = Title.genre.through
+        genre_ids = list(dict.fromkeys(genre_ids))
+        current = [] if created else list(
+            through.objects.filter(title_id=self.pk).order_by(
+                'id'
+            ).values_list('genre_id', flat=True)
+        )
+        removed = set(current) - set(genre_ids)
+        if removed:
+            through.objects.filter(
+                title_id=self.pk, genre_id__in=removed
+            ).delete()
+        added = [
+            genre_id for genre_id in genre_ids if genre_id not in current
+        ]
+        through.objects.bulk_create(
+            [through(title_id=self.pk, genre_id=genre_id)
+             for genre_id in added]
+        )
+        self.genre_ids = [
+            genre_id for genre_id in current if genre_id not in removed
+        ] + added
+
+
+class TitleTrigram(models.Model):
+    """
+    Триграмма слова в названии произведения для нечеткого поиска.
+    title_size и word_size — количество триграмм названия и слова,
+    нужны для расчета сходства без обращения к таблице произведений.
+    """
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='trigrams',
+        verbose_name='произведение'
+    )
+    trigram = models.CharField(
+        max_length=constants.TRIGRAM_LENGTH,
+        verbose_name='Триграмма'
+    )
+    title_size = models.PositiveSmallIntegerField(
+        verbose_name='Количество триграмм названия'
+    )
+    word = models.PositiveSmallIntegerField(
+        verbose_name='Номер слова в названии'
+    )
+    word_size = models.PositiveSmallIntegerField(
+        verbose_name='Количество триграмм слова'
+    )
+
+    class Meta:
+        verbose_name = 'Триграмма названия'
+        verbose_name_plural = 'Триграммы названий'
+        indexes = (
+            models.Index(
+                fields=(
+                    'trigram', 'title', 'word', 'word_size', 'title_size'
+                ),
+                name='title_trigram_lookup_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.trigram}: {self.title_id}'
+
+
+class TitleRating(models.Model):
+    """
+    Предрасчитанный рейтинг произведения.
+    Хранит сумму и количество оценок, среднюю оценку и взвешенный
+    (байесовский) рейтинг, по которому строится список лучших произведений.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rating_stats',
+        verbose_name='произведение'
+    )
+    reviews_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество отзывов'
+    )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Сумма оценок'
+    )
+    average = models.FloatField(null=True, verbose_name='Средняя оценка')
+    weighted = models.FloatField(
+        null=True,
+        db_index=True,
+        verbose_name='Взвешенный рейтинг'
+    )
+
+    class Meta:
+        verbose_name = 'Рейтинг произведения'
+        verbose_name_plural = 'Рейтинги произведений'
+
+    def __str__(self):
+        return f'{self.title_id}: {self.weighted}'
+
+
+class TitleTrend(models.Model):
+    """
+    Предрасчитанная «популярность» произведения.
+    Сумма отзывов и комментариев, вес которых экспоненциально убывает
+    с возрастом; значение приведено к моменту refreshed_at.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trend',
+        verbose_name='произведение'
+    )
+    score = models.FloatField(
+        default=0,
+        db_index=True,
+        verbose_name='Популярность'
+    )
+    refreshed_at = models.DateTimeField(verbose_name='Дата пересчета')
+
+    class Meta:
+        verbose_name = 'Популярность произведения'
+        verbose_name_plural = 'Популярность произведений'
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score}'
+
+
+class SimilarTitle(models.Model):
+    """
+    Похожее произведение из предрасчитанного списка соседей.
+    Похожесть — косинусная мера между центрированными оценками
+    пользователей, оценивших оба произведения.
+    """
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='similar_titles',
+        verbose_name='произведение'
+    )
+    similar = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='похожее произведение'
+    )
+    similarity = models.FloatField(verbose_name='Похожесть')
+
+    class Meta:
+        verbose_name = 'Похожее произведение'
+        verbose_name_plural = 'Похожие произведения'
+        constraints = (
+            models.UniqueConstraint(
+                fields=['title', 'similar'],
+                name='unique_title_similar'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=['title', '-similarity'],
+                name='similar_title_rank_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.title_id} -> {self.similar_id}: {self.similarity}'
+
 
 class Review(models.Model):
     """Класс отзывов."""
@@ -154,3 +530,122 @@ class Comment(models.Model):
 
     def __str__(self):
         return self.text[:constants.SLUG_LENGTH]
+
+
+class ChangeLog(models.Model):
+    """
+    Журнал изменений каталога для инкрементальной синхронизации.
+    id записи монотонно растет и служит курсором для клиентов.
+    """
+
+    model = models.CharField(
+        max_length=constants.CHANGE_MODEL_LENGTH,
+        verbose_name='Модель'
+    )
+    object_id = models.PositiveBigIntegerField(verbose_name='id объекта')
+    action = models.CharField(
+        max_length=constants.CHANGE_ACTION_LENGTH,
+        choices=CHANGE_ACTIONS,
+        verbose_name='Действие'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата изменения'
+    )
+
+    class Meta:
+        verbose_name = 'Изменение'
+        verbose_name_plural = 'Журнал изменений'
+        ordering = ('id',)
+
+    def __str__(self):
+        return f'{self.id}: {self.action} {self.model} {self.object_id}'
+
+
+class ConfirmationCode(models.Model):
+    """
+    Код подтверждения, ожидающий использования.
+    Для пользователя хранится один код; в БД записывается только его хеш.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='confirmation_code',
+        verbose_name='Пользователь'
+    )
+    code_hash = models.CharField(
+        max_length=constants.CONFIRMATION_CODE_HASH_LENGTH,
+        verbose_name='Хеш кода'
+    )
+    expires_at = models.DateTimeField(verbose_name='Действует до')
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Неудачные попытки'
+    )
+
+    class Meta:
+        verbose_name = 'Код подтверждения'
+        verbose_name_plural = 'Коды подтверждения'
+
+    def __str__(self):
+        return f'{self.user_id}: до {self.expires_at}'
+
+
+class Job(models.Model):
+    """
+    Задание фоновой очереди, выполняется командой run_worker.
+    Взятое задание принадлежит воркеру до locked_until; если воркер
+    не завершил его к этому времени, задание снова доступно другим.
+    """
+
+    kind = models.CharField(
+        max_length=constants.JOB_KIND_LENGTH,
+        verbose_name='Тип'
+    )
+    payload = models.JSONField(default=dict, verbose_name='Параметры')
+    priority = models.SmallIntegerField(default=0, verbose_name='Приоритет')
+    status = models.CharField(
+        max_length=constants.JOB_STATUS_LENGTH,
+        choices=JOB_STATUSES,
+        default='pending',
+        verbose_name='Статус'
+    )
+    run_after = models.DateTimeField(verbose_name='Выполнить не раньше')
+    locked_by = models.CharField(
+        max_length=constants.JOB_LOCK_LENGTH,
+        blank=True,
+        verbose_name='Воркер'
+    )
+    locked_until = models.DateTimeField(
+        null=True,
+        verbose_name='Аренда до'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попытки'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата постановки'
+    )
+    started_at = models.DateTimeField(null=True, verbose_name='Дата начала')
+    finished_at = models.DateTimeField(
+        null=True,
+        db_index=True,
+        verbose_name='Дата завершения'
+    )
+
+    class Meta:
+        verbose_name = 'Фоновое задание'
+        verbose_name_plural = 'Фоновые задания'
+        indexes = (
+            models.Index(
+                fields=('status', '-priority', 'id'),
+                name='job_claim_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.id}: {self.kind} ({self.status})'
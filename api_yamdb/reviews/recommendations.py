@@ -0,0 +1,133 @@
+import os
+
+import numpy as np
+from django.conf import settings
+
+from .models import Category, Genre, Review, Title, TitleRating
+
+_features_cache = {}
+
+
+def build_title_features(path=None):
+    """
+    Строит матрицу признаков произведений и сохраняет ее в файл .npy.
+    Каждая строка — id произведения и вектор признаков: one-hot жанров,
+    one-hot категории и средняя оценка, приведенная к [0, 1].
+    Возвращает количество произведений.
+    """
+    path = path or settings.TITLE_FEATURES_PATH
+    genre_ids = list(Genre.objects.order_by('id').values_list('id', flat=True))
+    category_ids = list(
+        Category.objects.order_by('id').values_list('id', flat=True)
+    )
+    title_rows = list(
+        Title.objects.order_by('id').values_list('id', 'category_id')
+    )
+    width = len(genre_ids) + len(category_ids) + 1
+    features = np.zeros(
+        len(title_rows),
+        dtype=[('id', np.int64), ('vector', np.float32, (width,))]
+    )
+    title_ids = np.array([row[0] for row in title_rows], dtype=np.int64)
+    features['id'] = title_ids
+    vectors = features['vector']
+
+    genre_columns = np.zeros(max(genre_ids, default=0) + 1, dtype=np.int64)
+    genre_columns[genre_ids] = np.arange(len(genre_ids))
+    links = np.array(
+        # Связи и рейтинги берутся только для произведений из title_ids:
+        # номер строки ищется по id через searchsorted.
+        Title.genre.through.objects.filter(
+            title__deleted_at__isnull=True
+        ).values_list('title_id', 'genre_id'),
+        dtype=np.int64
+    ).reshape(-1, 2)
+    vectors[
+        np.searchsorted(title_ids, links[:, 0]), genre_columns[links[:, 1]]
+    ] = 1
+
+    category_columns = {
+        category_id: len(genre_ids) + column
+        for column, category_id in enumerate(category_ids)
+    }
+    for row, (_, category_id) in enumerate(title_rows):
+        if category_id is not None:
+            vectors[row, category_columns[category_id]] = 1
+
+    vectors[:, -1] = settings.RATING_PRIOR_MEAN / 10
+    ratings = np.array(
+        TitleRating.objects.filter(
+            average__isnull=False, title__deleted_at__isnull=True
+        ).values_list(
+            'title_id', 'average'
+        ),
+        dtype=np.float64
+    ).reshape(-1, 2)
+    vectors[
+        np.searchsorted(title_ids, ratings[:, 0].astype(np.int64)), -1
+    ] = ratings[:, 1] / 10
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f'{path}.tmp'
+    with open(temporary_path, 'wb') as f:
+        np.save(f, features)
+    os.replace(temporary_path, path)
+    return len(title_rows)
+
+
+def load_title_features(path=None):
+    """
+    Возвращает матрицу признаков, отображенную в память (mmap).
+    Файл открывается заново только после его пересборки.
+    """
+    path = path or settings.TITLE_FEATURES_PATH
+    try:
+        modified = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _features_cache.get(path)
+    if cached is None or cached[0] != modified:
+        cached = (modified, np.load(path, mmap_mode='r'))
+        _features_cache[path] = cached
+    return cached[1]
+
+
+def recommend_titles(user, limit):
+    """
+    Ранжирует весь каталог для пользователя одной векторной операцией.
+    Профиль пользователя — сумма признаков оцененных им произведений
+    с весами (оценка - RATING_PRIOR_MEAN); к сходству с профилем
+    добавляется взвешенная средняя оценка произведения. Оцененные
+    пользователем произведения исключаются.
+    Возвращает список пар (id произведения, оценка релевантности).
+    """
+    features = load_title_features()
+    if features is None or not len(features):
+        return []
+    title_ids = features['id']
+    vectors = features['vector']
+    reviewed = np.array(
+        Review.objects.filter(
+            author_id=user.pk, title__isnull=False
+        ).values_list('title_id', 'score'),
+        dtype=np.int64
+    ).reshape(-1, 2)
+    rows = np.searchsorted(title_ids, reviewed[:, 0])
+    known = rows < len(title_ids)
+    known[known] = title_ids[rows[known]] == reviewed[known, 0]
+    rows = rows[known]
+
+    relevance = settings.RECOMMENDATIONS_RATING_WEIGHT * vectors[:, -1]
+    if len(rows):
+        weights = reviewed[known, 1] - settings.RATING_PRIOR_MEAN
+        profile = weights @ vectors[rows, :-1] / len(rows)
+        relevance = relevance + vectors[:, :-1] @ profile
+        relevance[rows] = -np.inf
+    limit = min(limit, len(title_ids) - len(rows))
+    if limit < 1:
+        return []
+    best = np.argpartition(-relevance, limit - 1)[:limit]
+    best = best[np.argsort(-relevance[best], kind='stable')]
+    return [
+        (int(title_ids[row]), float(relevance[row])) for row in best
+    ]
@@ -0,0 +1,136 @@
+import html
+import re
+
+from django.db import connection, transaction
+
+from .models import Comment, Review, Title, User
+
+WORD_PATTERN = re.compile(r'\w+')
+# Маркеры совпадений в snippet(): заменяются на <mark> после
+# экранирования текста.
+MARK_START = '\x02'
+MARK_END = '\x03'
+SNIPPET_TOKENS = 16
+
+SEARCH_SQL = {
+    'review': (
+        'SELECT review.id, review.title_id, NULL, '
+        'snippet({table}_fts, 0, %s, %s, %s, %s), '
+        'bm25({table}_fts) AS score '
+        'FROM {table}_fts '
+        'JOIN {table} AS review ON review.id = {table}_fts.rowid '
+        'JOIN {user_table} AS author ON author.id = review.author_id '
+        'LEFT JOIN {title_table} AS title ON title.id = review.title_id '
+        'WHERE {table}_fts MATCH %s AND title.deleted_at IS NULL '
+        'AND author.deleted_at IS NULL '
+        'ORDER BY score LIMIT %s'
+    ).format(
+        table=Review._meta.db_table,
+        user_table=User._meta.db_table,
+        title_table=Title._meta.db_table
+    ),
+    'comment': (
+        'SELECT comment.id, review.title_id, comment.review_id, '
+        'snippet({table}_fts, 0, %s, %s, %s, %s), '
+        'bm25({table}_fts) AS score '
+        'FROM {table}_fts '
+        'JOIN {table} AS comment ON comment.id = {table}_fts.rowid '
+        'JOIN {review_table} AS review ON review.id = comment.review_id '
+        'JOIN {user_table} AS author ON author.id = comment.author_id '
+        'JOIN {user_table} AS review_author '
+        'ON review_author.id = review.author_id '
+        'LEFT JOIN {title_table} AS title ON title.id = review.title_id '
+        'WHERE {table}_fts MATCH %s AND title.deleted_at IS NULL '
+        'AND author.deleted_at IS NULL '
+        'AND review_author.deleted_at IS NULL '
+        'ORDER BY score LIMIT %s'
+    ).format(
+        table=Comment._meta.db_table,
+        review_table=Review._meta.db_table,
+        user_table=User._meta.db_table,
+        title_table=Title._meta.db_table
+    ),
+}
+SEARCH_TYPES = tuple(SEARCH_SQL)
+INDEXED_MODELS = {'review': Review, 'comment': Comment}
+
+
+def match_query(text):
+    """
+    Запрос FTS5 из пользовательской строки: каждое слово берется
+    в кавычки, поэтому синтаксис FTS5 во вводе не интерпретируется.
+    Все слова должны встретиться в тексте, последнее — как префикс.
+    """
+    words = WORD_PATTERN.findall(text)
+    if not words:
+        return None
+    return ' '.join(
+        [f'"{word}"' for word in words[:-1]] + [f'"{words[-1]}"*']
+    )
+
+
+def highlight(snippet):
+    return html.escape(snippet).replace(
+        MARK_START, '<mark>'
+    ).replace(MARK_END, '</mark>')
+
+
+def search_texts(text, types=SEARCH_TYPES, limit=20):
+    """
+    Полнотекстовый поиск по отзывам и комментариям.
+    Возвращает до limit совпадений, упорядоченных по релевантности
+    (bm25), с фрагментом текста, где совпадения выделены <mark>.
+    """
+    query = match_query(text)
+    if query is None:
+        return []
+    hits = []
+    with connection.cursor() as cursor:
+        for kind in types:
+            cursor.execute(SEARCH_SQL[kind], (
+                MARK_START, MARK_END, '…', SNIPPET_TOKENS, query, limit
+            ))
+            hits.extend(
+                {
+                    'type': kind,
+                    'id': pk,
+                    'title_id': title_id,
+                    'review_id': pk if kind == 'review' else review_id,
+                    'snippet': highlight(snippet),
+                    'score': -score,
+                }
+                for pk, title_id, review_id, snippet, score in cursor
+            )
+    # bm25() тем меньше, чем релевантнее запись; в ответе знак обратный.
+    hits.sort(key=lambda hit: -hit['score'])
+    return hits[:limit]
+
+
+def rebuild_search_index(batch_size=1000):
+    """
+    Перестраивает индексы FTS5 пачками по id, не загружая таблицы
+    в память целиком. Возвращает количество проиндексированных записей.
+    """
+    count = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        for model in INDEXED_MODELS.values():
+            table = model._meta.db_table
+            cursor.execute(
+                f"INSERT INTO {table}_fts({table}_fts) VALUES ('delete-all')"
+            )
+            last_pk = 0
+            while True:
+                rows = list(
+                    model.objects.filter(pk__gt=last_pk).order_by(
+                        'pk'
+                    ).values_list('pk', 'text')[:batch_size]
+                )
+                if not rows:
+                    break
+                cursor.executemany(
+                    f'INSERT INTO {table}_fts(rowid, text) VALUES (%s, %s)',
+                    rows
+                )
+                count += len(rows)
+                last_pk = rows[-1][0]
+    return count
@@ -0,0 +1,139 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from .changes import record_changes
+from .autocomplete import title_names
+from .dictionaries import categories, genres
+from .jobs import submit
+from .models import Category, Comment, Genre, Review, Title
+from .trigrams import index_titles
+
+# Пакетное сохранение произведений (bulk_create/bulk_update) не вызывает
+# post_save. Сигнал отправляется внутри транзакции сохранения со списками
+# id созданных (created) и измененных (updated) произведений.
+titles_bulk_saved = Signal()
+
+# Отправляется после пересчета статистики категорий и жанров.
+catalog_stats_refreshed = Signal()
+
+# Пакетное удаление отзывов в обход ORM (process_deletions) не вызывает
+# post_delete. Сигнал передает id произведений удаленных отзывов; он же
+# отправляется, когда отзывы автора, помеченного на удаление, перестают
+# учитываться.
+reviews_bulk_deleted = Signal()
+
+SYNCED_MODELS = (Title, Review, Comment, Category, Genre)
+
+
+@receiver((post_save, post_delete), sender=Review)
+def review_changed(sender, instance, **kwargs):
+    """Обновляет предрасчитанный рейтинг произведения при изменении отзыва."""
+    if instance.title_id:
+        submit('update_title_ratings', {'title_id': instance.title_id})
+
+
+@receiver((post_save, post_delete), sender=Category)
+def category_changed(sender, **kwargs):
+    """Сбрасывает кеш категорий во всех процессах после фиксации изменений."""
+    transaction.on_commit(categories.invalidate)
+
+
+@receiver((post_save, post_delete), sender=Genre)
+def genre_changed(sender, **kwargs):
+    """Сбрасывает кеш жанров во всех процессах после фиксации изменений."""
+    transaction.on_commit(genres.invalidate)
+
+
+@receiver(post_save, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    """Обновляет произведение в индексе автодополнения после фиксации."""
+    change = None if instance.deleted_at else {
+        'name': instance.name, 'year': instance.year
+    }
+    transaction.on_commit(
+        partial(title_names.publish, instance.pk, change)
+    )
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    transaction.on_commit(partial(title_names.publish, instance.pk, None))
+
+
+@receiver(post_save, sender=Title)
+def title_trigrams_changed(sender, instance, created, **kwargs):
+    """Пересчитывает триграммы названия, если оно изменилось."""
+    if created or instance.name != getattr(instance, 'indexed_name', None):
+        index_titles([(instance.pk, instance.name)], created=created)
+        instance.indexed_name = instance.name
+
+
+def log_saved(sender, instance, created, **kwargs):
+    """
+    Записывает в журнал создание или изменение объекта каталога.
+    Пометка на удаление записывается как удаление: объект уже скрыт.
+    """
+    if created:
+        action = 'created'
+    elif getattr(instance, 'deleted_at', None):
+        action = 'deleted'
+    else:
+        action = 'updated'
+    record_changes(sender, [instance.pk], action)
+
+
+def log_deleted(sender, instance, **kwargs):
+    """Записывает в журнал удаление объекта каталога."""
+    record_changes(sender, [instance.pk], 'deleted')
+
+
+for model in SYNCED_MODELS:
+    post_save.connect(log_saved, sender=model)
+    post_delete.connect(log_deleted, sender=model)
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Genre)
+def log_titles_unlinked(sender, instance, **kwargs):
+    """
+    Удаление категории или жанра меняет произведения без их сохранения
+    (SET_NULL и удаление связей), поэтому они записываются в журнал явно.
+    """
+    titles = (
+        instance.title_set if sender is Category else instance.titles
+    )
+    record_changes(
+        Title, titles.values_list('pk', flat=True), 'updated'
+    )
+
+
+@receiver(titles_bulk_saved)
+def log_titles_bulk_saved(sender, created, updated, **kwargs):
+    record_changes(Title, created, 'created')
+    record_changes(Title, updated, 'updated')
+
+
+@receiver(titles_bulk_saved)
+def index_titles_bulk_saved(sender, created, updated, **kwargs):
+    """Обновляет поисковые индексы названий после пакетного сохранения."""
+    transaction.on_commit(title_names.invalidate)
+    if updated:
+        index_titles(
+            Title.objects.filter(pk__in=updated).values_list('pk', 'name')
+        )
+    if created:
+        index_titles(
+            Title.objects.filter(pk__in=created).values_list('pk', 'name'),
+            created=True
+        )
+
+
+@receiver(reviews_bulk_deleted)
+def update_ratings_bulk_deleted(sender, title_ids, **kwargs):
+    """Пересчитывает рейтинги произведений после пакетного удаления."""
+    for title_id in title_ids:
+        if title_id:
+            submit('update_title_ratings', {'title_id': title_id})
@@ -0,0 +1,178 @@
+from functools import lru_cache
+from itertools import chain
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from .models import Review, SimilarTitle
+from .versions import LocalCopyVersion
+
+# Версия таблицы похожих произведений для кеша в памяти процесса.
+similar_titles_version = LocalCopyVersion('similar_titles_version')
+
+
+def load_scores():
+    """
+    Загружает тройки (автор, произведение, оценка) в массивы NumPy
+    без создания объектов моделей.
+    """
+    rows = Review.objects.filter(title__isnull=False).values_list(
+        'author_id', 'title_id', 'score'
+    ).iterator(chunk_size=10000)
+    data = np.fromiter(chain.from_iterable(rows), dtype=np.int64)
+    return data.reshape(-1, 3)
+
+
+def compressed_rows(row_idx, col_idx, values, rows_count):
+    """
+    Раскладывает разреженную матрицу по строкам (формат CSR):
+    возвращает указатели начала строк, индексы столбцов и значения.
+    """
+    order = np.argsort(row_idx, kind='stable')
+    pointers = np.zeros(rows_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_idx, minlength=rows_count), out=pointers[1:])
+    return pointers, col_idx[order], values[order]
+
+
+def chunk_similarities(start, stop, by_title, by_user, norms):
+    """
+    Считает похожесть произведений [start, stop) со всеми произведениями.
+    Перемножает только пары оценок одного пользователя, поэтому плотной
+    остается лишь матрица chunk × titles, а не users × titles.
+    Возвращает матрицы похожести и количества общих оценщиков.
+    """
+    title_ptr, title_users, title_values = by_title
+    user_ptr, user_titles, user_values = by_user
+    titles_count = len(norms)
+    lo, hi = title_ptr[start], title_ptr[stop]
+    rows = np.repeat(
+        np.arange(stop - start), np.diff(title_ptr[start:stop + 1])
+    )
+    users = title_users[lo:hi]
+    lengths = user_ptr[users + 1] - user_ptr[users]
+    offsets = (
+        np.arange(lengths.sum())
+        - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        + np.repeat(user_ptr[users], lengths)
+    )
+    cells = np.repeat(rows, lengths) * titles_count + user_titles[offsets]
+    size = (stop - start) * titles_count
+    dots = np.bincount(
+        cells,
+        weights=np.repeat(title_values[lo:hi], lengths) * user_values[offsets],
+        minlength=size
+    ).reshape(stop - start, titles_count)
+    common = np.bincount(cells, minlength=size).reshape(
+        stop - start, titles_count
+    )
+    denominators = np.outer(norms[start:stop], norms)
+    similarities = np.divide(
+        dots,
+        denominators,
+        out=np.zeros_like(dots),
+        where=denominators > 0
+    )
+    return similarities, common
+
+
+def build_neighbours(data, top_k, min_common, chunk_size):
+    """
+    Строит списки top_k ближайших соседей для каждого произведения.
+    Оценки центрируются по среднему пользователя (adjusted cosine).
+    Возвращает список троек (title_id, similar_id, similarity).
+    """
+    if not len(data):
+        return []
+    user_ids, user_idx = np.unique(data[:, 0], return_inverse=True)
+    title_ids, title_idx = np.unique(data[:, 1], return_inverse=True)
+    scores = data[:, 2].astype(np.float64)
+    user_means = (
+        np.bincount(user_idx, weights=scores)
+        / np.bincount(user_idx)
+    )
+    values = scores - user_means[user_idx]
+    titles_count = len(title_ids)
+    norms = np.sqrt(
+        np.bincount(title_idx, weights=values ** 2, minlength=titles_count)
+    )
+    by_title = compressed_rows(title_idx, user_idx, values, titles_count)
+    by_user = compressed_rows(user_idx, title_idx, values, len(user_ids))
+    top_k = min(top_k, titles_count - 1)
+    neighbours = []
+    if top_k < 1:
+        return neighbours
+    for start in range(0, titles_count, chunk_size):
+        stop = min(start + chunk_size, titles_count)
+        similarities, common = chunk_similarities(
+            start, stop, by_title, by_user, norms
+        )
+        similarities[common < min_common] = 0
+        similarities[np.arange(stop - start), np.arange(start, stop)] = 0
+        best = np.argpartition(-similarities, top_k - 1, axis=1)[:, :top_k]
+        for row, columns in enumerate(best):
+            columns = columns[np.argsort(-similarities[row, columns])]
+            for column in columns:
+                similarity = similarities[row, column]
+                if similarity <= 0:
+                    break
+                neighbours.append((
+                    int(title_ids[start + row]),
+                    int(title_ids[column]),
+                    float(similarity)
+                ))
+    return neighbours
+
+
+def rebuild_similar_titles(top_k=None, min_common=None, chunk_size=None):
+    """
+    Пересчитывает таблицу похожих произведений по всем отзывам.
+    Возвращает количество сохраненных пар.
+    """
+    if top_k is None:
+        top_k = settings.SIMILAR_TITLES_COUNT
+    if min_common is None:
+        min_common = settings.SIMILAR_TITLES_MIN_COMMON
+    neighbours = build_neighbours(
+        load_scores(),
+        top_k,
+        min_common,
+        chunk_size or settings.SIMILAR_TITLES_CHUNK_SIZE
+    )
+    with transaction.atomic():
+        SimilarTitle.objects.all().delete()
+        SimilarTitle.objects.bulk_create(
+            [
+                SimilarTitle(
+                    title_id=title_id,
+                    similar_id=similar_id,
+                    similarity=similarity
+                )
+                for title_id, similar_id, similarity in neighbours
+            ],
+            batch_size=1000
+        )
+    similar_titles_version.bump()
+    return len(neighbours)
+
+
+@lru_cache(maxsize=settings.SIMILAR_TITLES_CACHE_SIZE)
+def _similar_titles(title_id):
+    return tuple(
+        SimilarTitle.objects.filter(title_id=title_id).order_by(
+            '-similarity'
+        ).values_list('similar_id', 'similarity')
+    )
+
+
+def get_similar_titles(title_id):
+    """
+    Возвращает пары (id похожего произведения, похожесть).
+    Результат кешируется в памяти процесса до следующего пересчета
+    (с кешем в памяти процесса — не дольше LOCAL_COPY_TIMEOUT секунд).
+    """
+    version = similar_titles_version.stale()
+    if version is not None:
+        _similar_titles.cache_clear()
+        similar_titles_version.mark_loaded(version)
+    return _similar_titles(title_id)
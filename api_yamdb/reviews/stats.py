@@ -0,0 +1,74 @@
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Sum
+
+from .models import Category, CategoryStats, Genre, GenreStats, Title
+from .signals import catalog_stats_refreshed
+
+
+def build_stats(stats_model, key, ids, totals):
+    """
+    Создает объекты статистики для всех ids.
+    Группы без произведений получают нулевую статистику.
+    """
+    stats = {pk: stats_model(**{key: pk}) for pk in ids}
+    for row in totals:
+        item = stats.get(row[key])
+        if item is None:
+            continue
+        item.titles_count = row['titles_count']
+        item.reviews_count = row['reviews_count'] or 0
+        item.average_rating = (
+            row['score_sum'] / item.reviews_count
+            if item.reviews_count else None
+        )
+        item.min_year = row['min_year']
+        item.max_year = row['max_year']
+    return list(stats.values())
+
+
+def refresh_catalog_stats(batch_size=1000):
+    """
+    Пересчитывает статистику категорий и жанров.
+    Оценки берутся из предрасчитанных TitleRating, поэтому таблица отзывов
+    не сканируется. Произведения, ожидающие удаления, не учитываются.
+    Возвращает количество категорий и жанров.
+    """
+    category_totals = Title.objects.filter(
+        category__isnull=False
+    ).values('category_id').annotate(
+        titles_count=Count('id'),
+        reviews_count=Sum('rating_stats__reviews_count'),
+        score_sum=Sum('rating_stats__score_sum'),
+        min_year=Min('year'),
+        max_year=Max('year')
+    ).order_by()
+    genre_totals = Title.objects.filter(
+        genre__isnull=False
+    ).values(genre_id=F('genre')).annotate(
+        titles_count=Count('id'),
+        reviews_count=Sum('rating_stats__reviews_count'),
+        score_sum=Sum('rating_stats__score_sum'),
+        min_year=Min('year'),
+        max_year=Max('year')
+    ).order_by()
+    category_stats = build_stats(
+        CategoryStats,
+        'category_id',
+        Category.objects.values_list('id', flat=True),
+        category_totals
+    )
+    genre_stats = build_stats(
+        GenreStats,
+        'genre_id',
+        Genre.objects.values_list('id', flat=True),
+        genre_totals
+    )
+    with transaction.atomic():
+        CategoryStats.objects.all().delete()
+        CategoryStats.objects.bulk_create(
+            category_stats, batch_size=batch_size
+        )
+        GenreStats.objects.all().delete()
+        GenreStats.objects.bulk_create(genre_stats, batch_size=batch_size)
+    catalog_stats_refreshed.send(sender=None)
+    return len(category_stats), len(genre_stats)
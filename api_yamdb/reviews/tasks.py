@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.mail import send_mass_mail
+
+from .confirmation import issue_confirmation_code
+from .deletion import process_deletions
+from .jobs import job_handler
+from .models import User
+from .ratings import update_title_rating
+
+
+@job_handler('send_confirmation_code', batch_size=50, priority=10)
+def send_confirmation_codes(payloads):
+    """
+    Выдает коды подтверждения и отправляет их пачкой писем.
+    Код создается при выполнении задания, поэтому в очередь попадает
+    только id пользователя; каждый новый код заменяет предыдущий.
+    """
+    users = User.objects.filter(
+        pk__in=[payload['user_id'] for payload in payloads]
+    )
+    send_mass_mail([
+        (
+            'Confirmation code from YamDB',
+            f'code_confirmation {issue_confirmation_code(user)}',
+            settings.DEFAULT_FROM_EMAIL,
+            [user.email]
+        )
+        for user in users
+    ])
+
+
+@job_handler('update_title_ratings', batch_size=100, priority=5)
+def update_title_ratings(payloads):
+    """Пересчитывает рейтинги; каждое произведение пересчитывается раз."""
+    for title_id in dict.fromkeys(
+        payload['title_id'] for payload in payloads
+    ):
+        update_title_rating(title_id)
+
+
+@job_handler('process_deletions', batch_size=100)
+def delete_pending(payloads):
+    """Одна обработка удаляет все объекты, ожидающие удаления."""
+    process_deletions(settings.DELETION_BATCH_SIZE)
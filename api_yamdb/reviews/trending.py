@@ -0,0 +1,90 @@
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from .models import Comment, Review, TitleTrend
+
+
+def decay(age):
+    """Вес события возраста age (timedelta) с периодом полураспада."""
+    return 0.5 ** (age / settings.TRENDING_HALF_LIFE)
+
+
+def horizon():
+    """
+    Возраст, после которого вклад одного события меньше TRENDING_MIN_SCORE.
+    Более старые события при первом расчете не учитываются.
+    """
+    return settings.TRENDING_HALF_LIFE * math.log2(
+        1 / settings.TRENDING_MIN_SCORE
+    )
+
+
+def collect_activity(since, now):
+    """
+    Считает вклад новых отзывов и комментариев с pub_date в (since, now].
+    Использует индексы по pub_date и не загружает модели целиком.
+    """
+    increments = defaultdict(float)
+    sources = (
+        (Review.objects.values_list('title_id', 'pub_date'), 1),
+        (
+            Comment.objects.values_list('review__title_id', 'pub_date'),
+            settings.TRENDING_COMMENT_WEIGHT
+        ),
+    )
+    for queryset, weight in sources:
+        events = queryset.filter(
+            pub_date__gt=since,
+            pub_date__lte=now
+        ).iterator(chunk_size=2000)
+        for title_id, pub_date in events:
+            if title_id is not None:
+                increments[title_id] += weight * decay(now - pub_date)
+    return increments
+
+
+def refresh_trending(now=None):
+    """
+    Инкрементально обновляет таблицу TitleTrend.
+    Накопленные значения умножаются на общий множитель затухания с момента
+    прошлого пересчета, затем добавляется вклад событий, опубликованных
+    после него. Возвращает количество произведений с новой активностью.
+    """
+    now = now or timezone.now()
+    last_refresh = TitleTrend.objects.aggregate(
+        last=Max('refreshed_at')
+    )['last']
+    since = now - horizon()
+    if last_refresh and last_refresh > since:
+        since = last_refresh
+    increments = collect_activity(since, now)
+
+    with transaction.atomic():
+        if last_refresh:
+            TitleTrend.objects.update(
+                score=F('score') * decay(now - last_refresh),
+                refreshed_at=now
+            )
+        trends = TitleTrend.objects.in_bulk(list(increments))
+        for title_id, trend in trends.items():
+            trend.score += increments[title_id]
+        TitleTrend.objects.bulk_update(
+            trends.values(), ['score'], batch_size=500
+        )
+        TitleTrend.objects.bulk_create(
+            [
+                TitleTrend(title_id=title_id, score=score, refreshed_at=now)
+                for title_id, score in increments.items()
+                if title_id not in trends
+            ],
+            batch_size=500
+        )
+        TitleTrend.objects.filter(
+            score__lt=settings.TRENDING_MIN_SCORE
+        ).delete()
+    return len(increments)
@@ -0,0 +1,123 @@
+import re
+
+from django.conf import settings
+from django.db.models import Count, FloatField, Max, Value
+from django.db.models.functions import Cast
+
+from .autocomplete import normalize
+from .models import Title, TitleTrigram
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def word_trigrams(text):
+    """
+    Множества триграмм слов текста. Каждое слово дополняется двумя
+    пробелами в начале и одним в конце, как в pg_trgm, поэтому начало
+    слова весит больше его окончания.
+    """
+    result = []
+    for word in WORD_PATTERN.findall(normalize(text)):
+        padded = f'  {word} '
+        result.append({
+            padded[index:index + 3] for index in range(len(padded) - 2)
+        })
+    return result
+
+
+def trigrams(text):
+    """Множество триграмм текста."""
+    return set().union(*word_trigrams(text))
+
+
+def index_titles(titles, created=False, batch_size=1000):
+    """
+    Пересчитывает триграммы для списка пар (id, название).
+    Триграммы хранятся по словам: одна и та же триграмма разных слов
+    записывается несколько раз. Для только что созданных произведений
+    удаление не выполняется.
+    """
+    titles = list(titles)
+    if not created:
+        TitleTrigram.objects.filter(
+            title_id__in=[pk for pk, _ in titles]
+        ).delete()
+    rows = []
+    for pk, name in titles:
+        words = word_trigrams(name)
+        title_size = len(set().union(*words))
+        rows.extend(
+            TitleTrigram(
+                title_id=pk,
+                trigram=trigram,
+                title_size=title_size,
+                word=word,
+                word_size=len(word_set)
+            )
+            for word, word_set in enumerate(words)
+            for trigram in word_set
+        )
+    TitleTrigram.objects.bulk_create(rows, batch_size=batch_size)
+
+
+def rebuild_title_trigrams(batch_size=1000):
+    """Перестраивает индекс триграмм всех произведений."""
+    TitleTrigram.objects.all().delete()
+    count = 0
+    last_pk = 0
+    while True:
+        titles = list(
+            Title.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+                'pk', 'name'
+            )[:batch_size]
+        )
+        if not titles:
+            return count
+        index_titles(titles, created=True, batch_size=batch_size)
+        count += len(titles)
+        last_pk = titles[-1][0]
+
+
+def search_titles(query, limit=None):
+    """
+    Нечеткий поиск по названиям. Кандидаты отбираются одним
+    агрегирующим запросом по индексу триграмм, сходство — коэффициент
+    Жаккара множеств триграмм. Запрос из одного слова сравнивается
+    с лучше всего совпавшим словом названия, как word_similarity
+    в pg_trgm: опечатка в одном слове длинного названия не опускает
+    сходство ниже порога. Запрос из нескольких слов сравнивается
+    с названием целиком. Возвращает список пар (id произведения,
+    сходство) по убыванию сходства, не ниже FUZZY_SEARCH_THRESHOLD;
+    при равном сходстве короткие названия идут первыми.
+    """
+    words = word_trigrams(query)
+    if not words:
+        return []
+    query_trigrams = set().union(*words)
+    matches = TitleTrigram.objects.filter(trigram__in=query_trigrams)
+    if len(words) == 1:
+        shared = Count('id')
+        size = Max('word_size')
+        matches = matches.values('title_id', 'word')
+    else:
+        # Одна триграмма может входить в несколько слов названия.
+        shared = Count('trigram', distinct=True)
+        size = Max('title_size')
+        matches = matches.values('title_id')
+    limit = limit or settings.FUZZY_SEARCH_MAX_RESULTS
+    best = {}
+    for pk, similarity in matches.annotate(
+        similarity=Cast(shared, FloatField()) / (
+            Value(len(query_trigrams)) + size - shared
+        ),
+        title_size=Max('title_size')
+    ).filter(
+        similarity__gte=settings.FUZZY_SEARCH_THRESHOLD
+    ).order_by('-similarity', 'title_size', 'title_id').values_list(
+        'title_id', 'similarity'
+    ).iterator():
+        # Лучшее слово произведения идет в выдаче первым.
+        best.setdefault(pk, similarity)
+        if len(best) == limit:
+            break
+    return list(best.items())
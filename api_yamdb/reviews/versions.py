@@ -0,0 +1,97 @@
+import threading
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished, request_started
+
+# Бэкенды кеша, данные которых видит только текущий процесс.
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Ключи версий, уже проверенные в текущем запросе этого потока;
+# None вне запроса.
+_request = threading.local()
+
+
+def cache_is_shared():
+    """Общий ли кеш у всех процессов (Redis, Memcached, БД)."""
+    return settings.CACHES['default']['BACKEND'] not in LOCAL_CACHE_BACKENDS
+
+
+def begin_request(**kwargs):
+    _request.checked = set()
+
+
+def end_request(**kwargs):
+    _request.checked = None
+
+
+request_started.connect(begin_request)
+request_finished.connect(end_request)
+
+
+class LocalCopyVersion:
+    """
+    Версия данных, копия которых хранится в памяти процесса.
+    Версия хранится в кеше и проверяется не чаще раза за запрос.
+    Если кеш не общий, изменения в соседних процессах по версии
+    не видны, поэтому копия устаревает через LOCAL_COPY_TIMEOUT секунд
+    после загрузки.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.loaded = None
+        self.loaded_at = 0
+
+    def current(self):
+        version = cache.get(self.key)
+        if version is None:
+            cache.add(self.key, uuid4().hex, None)
+            version = cache.get(self.key)
+        return version
+
+    def expired(self):
+        return (
+            not cache_is_shared()
+            and time.monotonic() - self.loaded_at
+            > settings.LOCAL_COPY_TIMEOUT
+        )
+
+    def stale(self):
+        """
+        Новая версия, если копию нужно перечитать, иначе None.
+        В течение запроса после первой проверки возвращает None
+        без обращения к кешу.
+        """
+        checked = getattr(_request, 'checked', None)
+        if checked is not None and self.key in checked:
+            return None
+        version = self.current()
+        if version == self.loaded and not self.expired():
+            if checked is not None:
+                checked.add(self.key)
+            return None
+        return version
+
+    def mark_loaded(self, version):
+        self.loaded = version
+        self.loaded_at = time.monotonic()
+        checked = getattr(_request, 'checked', None)
+        if checked is not None:
+            checked.add(self.key)
+
+    def bump(self):
+        """
+        Меняет версию. Копия текущего процесса устаревает сразу,
+        в том числе в середине запроса.
+        """
+        cache.set(self.key, uuid4().hex, None)
+        self.loaded = None
+        checked = getattr(_request, 'checked', None)
+        if checked is not None:
+            checked.discard(self.key)
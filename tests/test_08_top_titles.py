@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TopTitlesAPI:
+
+    TOP_TITLES_URL = '/api/v1/titles/top/'
+
+    def test_01_top_titles_not_auth(self, client):
+        response = client.get(self.TOP_TITLES_URL)
+        assert response.status_code != HTTPStatus.NOT_FOUND, (
+            f'Эндпоинт `{self.TOP_TITLES_URL}` не найден. Проверьте настройки '
+            'в *urls.py*.'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{self.TOP_TITLES_URL}` возвращает ответ со статусом 200.'
+        )
+
+    def test_02_top_titles_weighted_order(self, admin_client, user_client,
+                                          moderator_client, client):
+        titles, categories, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Шедевр', 10)
+        for author_client in (admin_client, user_client, moderator_client):
+            create_single_review(
+                author_client, titles[1]['id'], 'Отлично', 9
+            )
+
+        response = client.get(self.TOP_TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            f'Проверьте, что `{self.TOP_TITLES_URL}` сортирует произведения '
+            'по взвешенному рейтингу: много высоких оценок должны быть выше '
+            'единственной максимальной.'
+        )
+        assert results[0]['rating'] == 9
+        assert results[0]['weighted_rating'] < results[0]['rating']
+
+        response = client.get(
+            f'{self.TOP_TITLES_URL}?category={categories[0]["slug"]}'
+        )
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [titles[0]['id']], (
+            f'Проверьте, что `{self.TOP_TITLES_URL}` поддерживает фильтрацию '
+            'по slug категории.'
+        )
+
+    def test_03_top_titles_rating_updated_on_review_delete(
+            self, admin_client, user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        response = create_single_review(
+            user_client, titles[0]['id'], 'Шедевр', 10
+        )
+        review_id = response.json()['id']
+        response = client.get(self.TOP_TITLES_URL)
+        assert len(response.json()['results']) == 1
+
+        user_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{review_id}/'
+        )
+        response = client.get(self.TOP_TITLES_URL)
+        assert response.json()['results'] == [], (
+            'Проверьте, что после удаления отзыва предрасчитанный рейтинг '
+            'произведения обновляется.'
+        )
@@ -0,0 +1,70 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import Review, TitleTrend
+from tests.utils import (
+    create_single_comment, create_single_review, create_titles
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TrendingTitlesAPI:
+
+    TRENDING_URL = '/api/v1/titles/trending/'
+
+    def test_01_trending_not_auth(self, client):
+        response = client.get(self.TRENDING_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{self.TRENDING_URL}` возвращает ответ со статусом 200.'
+        )
+
+    def test_02_trending_order(self, admin_client, user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        old_review = create_single_review(
+            user_client, titles[0]['id'], 'Давно смотрел', 7
+        ).json()
+        Review.objects.filter(pk=old_review['id']).update(
+            pub_date=timezone.now() - timedelta(days=5)
+        )
+        review = create_single_review(
+            user_client, titles[1]['id'], 'Только что', 8
+        ).json()
+        create_single_comment(
+            admin_client, titles[1]['id'], review['id'], 'Согласен'
+        )
+
+        response = client.get(self.TRENDING_URL)
+        assert response.json()['results'] == [], (
+            f'Проверьте, что `{self.TRENDING_URL}` использует предрасчитанную '
+            'таблицу популярности.'
+        )
+
+        call_command('refresh_trending')
+        results = client.get(self.TRENDING_URL).json()['results']
+        assert [title['id'] for title in results] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            f'Проверьте, что `{self.TRENDING_URL}` сортирует произведения '
+            'по популярности с учетом давности отзывов и комментариев.'
+        )
+        assert results[0]['trending_score'] > 1
+
+    def test_03_trending_incremental_refresh(self, admin_client,
+                                             user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+        call_command('refresh_trending')
+        score = TitleTrend.objects.get(title_id=titles[0]['id']).score
+
+        create_single_review(moderator_client, titles[0]['id'], 'Еще', 6)
+        call_command('refresh_trending')
+        new_score = TitleTrend.objects.get(title_id=titles[0]['id']).score
+        assert new_score == pytest.approx(score + 1, rel=1e-3), (
+            'Проверьте, что повторный пересчет популярности учитывает только '
+            'новые отзывы.'
+        )
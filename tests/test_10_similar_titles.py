@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import SimilarTitle
+from reviews.similarity import rebuild_similar_titles
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10SimilarTitlesAPI:
+
+    SIMILAR_URL_TEMPLATE = '/api/v1/titles/{title_id}/similar/'
+
+    def test_01_similar_not_found(self, client):
+        response = client.get(self.SIMILAR_URL_TEMPLATE.format(title_id=999))
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос похожих произведений для несуществующего '
+            'произведения возвращает ответ со статусом 404.'
+        )
+
+    def test_02_similar_titles(self, admin_client, user_client,
+                               moderator_client, client):
+        titles, categories, genres = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        third = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        }).json()['id']
+        url = self.SIMILAR_URL_TEMPLATE.format(title_id=first)
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == [], (
+            'Проверьте, что до построения модели список похожих '
+            'произведений пуст.'
+        )
+
+        create_single_review(user_client, first, 'Прекрасно', 10)
+        create_single_review(user_client, second, 'Прекрасно', 10)
+        create_single_review(user_client, third, 'Плохо', 2)
+        create_single_review(moderator_client, first, 'Плохо', 3)
+        create_single_review(moderator_client, second, 'Плохо', 3)
+        create_single_review(moderator_client, third, 'Прекрасно', 9)
+        call_command('build_similar_titles', min_common=2)
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [title['id'] for title in data] == [second], (
+            f'Проверьте, что `{url}` возвращает произведения с похожими '
+            'оценками пользователей.'
+        )
+        assert data[0]['similarity'] == pytest.approx(1)
+
+    def test_03_min_common_zero_and_local_copy_timeout(
+            self, admin_client, user_client, client, settings):
+        titles, categories, genres = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        third = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        }).json()['id']
+        create_single_review(user_client, first, 'Прекрасно', 10)
+        create_single_review(user_client, second, 'Прекрасно', 10)
+        create_single_review(user_client, third, 'Плохо', 2)
+        assert rebuild_similar_titles() == 0
+        assert rebuild_similar_titles(min_common=0) == 2, (
+            'Проверьте, что min_common=0 не заменяется значением '
+            'из настроек.'
+        )
+        url = self.SIMILAR_URL_TEMPLATE.format(title_id=first)
+        assert len(client.get(url).json()) == 1
+
+        # Пересчет в другом процессе не меняет версию в кеше этого
+        # процесса: копия должна устареть по LOCAL_COPY_TIMEOUT.
+        SimilarTitle.objects.all().delete()
+        settings.LOCAL_COPY_TIMEOUT = 0
+        assert client.get(url).json() == [], (
+            'Проверьте, что список похожих произведений в памяти процесса '
+            'устаревает через LOCAL_COPY_TIMEOUT секунд.'
+        )
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+
+from reviews.recommendations import build_title_features
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.fixture
+def title_features_path(settings, tmp_path):
+    settings.TITLE_FEATURES_PATH = str(tmp_path / 'title_features.npy')
+    return settings.TITLE_FEATURES_PATH
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11RecommendationsAPI:
+
+    RECOMMENDATIONS_URL = '/api/v1/users/me/recommendations/'
+
+    def test_01_recommendations_not_auth(self, client):
+        response = client.get(self.RECOMMENDATIONS_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{self.RECOMMENDATIONS_URL}` возвращает ответ со статусом 401.'
+        )
+
+    def test_02_recommendations(self, admin_client, user_client,
+                                title_features_path):
+        titles, categories, genres = create_titles(admin_client)
+        similar = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        }).json()
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 10)
+        call_command('build_title_features')
+
+        response = user_client.get(self.RECOMMENDATIONS_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос авторизованного пользователя к '
+            f'`{self.RECOMMENDATIONS_URL}` возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert [title['id'] for title in data] == [
+            similar['id'], titles[1]['id']
+        ], (
+            f'Проверьте, что `{self.RECOMMENDATIONS_URL}` исключает уже '
+            'оцененные произведения и ставит выше произведения любимых '
+            'жанров и категорий.'
+        )
+        assert data[0]['relevance'] > data[1]['relevance']
+
+        response = user_client.get(f'{self.RECOMMENDATIONS_URL}?limit=1')
+        assert len(response.json()) == 1
+
+    def test_03_features_skip_pending_titles(self, admin_client, user_client,
+                                             title_features_path):
+        titles, _, genres = create_titles(admin_client)
+        create_single_review(user_client, titles[1]['id'], 'Отлично', 10)
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert build_title_features() == 1, (
+            'Проверьте, что в матрицу признаков не попадают произведения, '
+            'ожидающие удаления.'
+        )
+        features = np.load(title_features_path)
+        assert features['id'].tolist() == [titles[0]['id']]
+        # Жанры 0 и 1 первого произведения; жанр 2 — удаляемого.
+        assert features['vector'][0][:len(genres)].tolist() == [1, 1, 0]
@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12CatalogStatsAPI:
+
+    CATEGORY_STATS_URL_TEMPLATE = '/api/v1/categories/{slug}/stats/'
+    GENRE_STATS_URL_TEMPLATE = '/api/v1/genres/{slug}/stats/'
+
+    def test_01_stats_not_found(self, client):
+        for template in (self.CATEGORY_STATS_URL_TEMPLATE,
+                         self.GENRE_STATS_URL_TEMPLATE):
+            url = template.format(slug='unexisting')
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` для несуществующего '
+                'slug возвращает ответ со статусом 404.'
+            )
+
+    def test_02_stats(self, admin_client, user_client, moderator_client,
+                      client):
+        titles, categories, genres = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Хорошо', 8)
+        create_single_review(moderator_client, titles[0]['id'], 'Так', 5)
+        create_single_review(user_client, titles[1]['id'], 'Ужасно', 1)
+
+        url = self.CATEGORY_STATS_URL_TEMPLATE.format(
+            slug=categories[0]['slug']
+        )
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        assert response.json()['titles_count'] == 0, (
+            f'Проверьте, что `{url}` возвращает предрасчитанную статистику.'
+        )
+
+        call_command('refresh_catalog_stats')
+        data = client.get(url).json()
+        expected = {
+            'name': categories[0]['name'],
+            'slug': categories[0]['slug'],
+            'titles_count': 1,
+            'reviews_count': 2,
+            'average_rating': 6.5,
+            'min_year': 1984,
+            'max_year': 1984,
+        }
+        for field, value in expected.items():
+            assert data[field] == value, (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                f'корректное значение поля `{field}`.'
+            )
+
+        url = self.GENRE_STATS_URL_TEMPLATE.format(slug=genres[2]['slug'])
+        data = client.get(url).json()
+        assert data['titles_count'] == 1
+        assert data['reviews_count'] == 1
+        assert data['average_rating'] == 1
+        assert data['min_year'] == data['max_year'] == 1988
+
+    def test_03_pending_titles_skipped(self, admin_client, client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        call_command('refresh_catalog_stats')
+        for template, slug in (
+            (self.CATEGORY_STATS_URL_TEMPLATE, categories[1]['slug']),
+            (self.GENRE_STATS_URL_TEMPLATE, genres[2]['slug']),
+        ):
+            data = client.get(template.format(slug=slug)).json()
+            assert data['titles_count'] == 0, (
+                'Проверьте, что статистика не учитывает произведения, '
+                'ожидающие удаления.'
+            )
+        url = self.GENRE_STATS_URL_TEMPLATE.format(slug=genres[0]['slug'])
+        assert client.get(url).json()['titles_count'] == 1
@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+from reviews.models import Category
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13DictionaryCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_title_list_queries(self, admin_client, client,
+                                   django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        with django_assert_max_num_queries(3):
+            response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()['results']
+        title = next(item for item in data if item['id'] == titles[0]['id'])
+        assert title['category']['slug'] == titles[0]['category'], (
+            'Проверьте, что категория произведения берется из кеша '
+            'справочника.'
+        )
+        assert [genre['slug'] for genre in title['genre']] == (
+            titles[0]['genre']
+        ), 'Проверьте, что жанры произведения берутся из кеша справочника.'
+
+    def test_02_cache_invalidated_on_write(self, admin_client, client):
+        titles, categories, _ = create_titles(admin_client)
+        client.get(self.TITLES_URL)
+
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Игры', 'slug': 'games'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'category': 'games'}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новая категория доступна сразу после создания.'
+        )
+
+        admin_client.delete(f'/api/v1/categories/{categories[1]["slug"]}/')
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            data={'category': categories[1]['slug']}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что удаленная категория сразу исчезает из кеша.'
+        )
+
+    def test_03_version_checked_once_per_request(self, admin_client, client,
+                                                 monkeypatch):
+        create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        keys = []
+        get = cache.get
+
+        def counting_get(key, *args, **kwargs):
+            keys.append(key)
+            return get(key, *args, **kwargs)
+
+        monkeypatch.setattr(cache, 'get', counting_get)
+        client.get(f'{self.TITLES_URL}?fields=category,genre')
+        versions = [key for key in keys if key.startswith('dictionary')]
+        assert sorted(versions) == [
+            'dictionary_version:reviews.category',
+            'dictionary_version:reviews.genre',
+        ], (
+            'Проверьте, что версия справочника проверяется один раз '
+            'за запрос, а не для каждого поля.'
+        )
+
+    def test_04_local_copy_expires(self, admin_client, client, settings):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/?fields=category'
+        client.get(url)
+        # Изменение в другом процессе: версия в локальном кеше
+        # этого процесса не меняется.
+        Category.objects.filter(slug=titles[0]['category']).update(
+            name='Переименована'
+        )
+        settings.LOCAL_COPY_TIMEOUT = 0
+        assert client.get(url).json()['category']['name'] == (
+            'Переименована'
+        ), (
+            'Проверьте, что при кеше в памяти процесса копия справочника '
+            'устаревает через LOCAL_COPY_TIMEOUT секунд.'
+        )
+
+    def test_05_new_category_from_other_process(self, admin_client, client):
+        _, _, genres = create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        # Создание в другом процессе: версия справочника здесь не меняется.
+        Category.objects.bulk_create([Category(name='Новая', slug='new')])
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Новинка',
+            'year': 2020,
+            'genre': [genres[0]['slug']],
+            'category': 'new',
+        })
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что slug категории, которой нет в копии справочника, '
+            'проверяется запросом к БД.'
+        )
+        title = client.get(f'{self.TITLES_URL}{response.json()["id"]}/')
+        assert title.json()['category'] == {'name': 'Новая', 'slug': 'new'}
@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Genre, Title
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleGenresWrite:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_unknown_genres_listed(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = {
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug'], 'space', 'aliens'],
+            'category': categories[0]['slug'],
+        }
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        message = response.json()['genre'][0]
+        assert 'space' in message and 'aliens' in message, (
+            'Проверьте, что в ошибке перечислены все неизвестные жанры.'
+        )
+        assert genres[0]['slug'] not in message
+        assert not Title.objects.exists()
+
+    def test_02_constant_queries_for_many_genres(
+            self, admin_client, django_assert_max_num_queries):
+        categories = create_categories(admin_client)
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {number}', slug=f'genre-{number}')
+            for number in range(30)
+        )
+        slugs = list(Genre.objects.values_list('slug', flat=True))
+        data = {
+            'name': 'Антология',
+            'year': 2000,
+            'genre': slugs[:20],
+            'category': categories[0]['slug'],
+        }
+        admin_client.post(self.TITLES_URL, data={**data, 'genre': slugs[:1]})
+        with django_assert_max_num_queries(6):
+            response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['genre'] == slugs[:20]
+
+        url = f'{self.TITLES_URL}{response.json()["id"]}/'
+        with django_assert_max_num_queries(9):
+            response = admin_client.patch(url, data={'genre': slugs[10:30]})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['genre'] == slugs[10:30], (
+            'Проверьте, что при изменении жанров сохраняются общие связи, '
+            'удаляются лишние и добавляются новые.'
+        )
+        title = Title.objects.get(pk=response.json()['id'])
+        assert set(title.genre.values_list('slug', flat=True)) == set(
+            slugs[10:30]
+        )
@@ -0,0 +1,93 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Title
+from tests.utils import create_categories, create_genre, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitlesBulkAPI:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def test_01_bulk_permissions(self, client, user_client):
+        response = client.post(
+            self.BULK_URL, data='[]', content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.post(self.BULK_URL, data=[], format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что POST-запрос пользователя к `{self.BULK_URL}` '
+            'возвращает ответ со статусом 403.'
+        )
+
+    def test_02_bulk_create_and_update(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        items = [
+            {
+                'name': f'Сериал {number}',
+                'year': 2000 + number,
+                'category': categories[1]['slug'],
+                'genre': [genres[0]['slug'], genres[2]['slug']],
+            }
+            for number in range(50)
+        ]
+        items.append({'name': 'Без года', 'category': categories[0]['slug'],
+                      'genre': []})
+        items.append({'id': titles[0]['id'], 'year': 1985,
+                      'genre': [genres[2]['slug']]})
+        response = admin_client.post(self.BULK_URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert (data['created'], data['updated'], data['errors']) == (
+            50, 1, 1
+        )
+        assert data['results'][50]['status'] == 'error'
+        assert 'year' in data['results'][50]['errors']
+
+        names = Title.objects.in_bulk(
+            [result['id'] for result in data['results'][:50]]
+        )
+        assert [
+            names[result['id']].name for result in data['results'][:50]
+        ] == [item['name'] for item in items[:50]]
+        created = Title.objects.get(pk=data['results'][7]['id'])
+        assert created.name == 'Сериал 7', (
+            'Проверьте, что id в результатах соответствуют созданным '
+            'произведениям.'
+        )
+        assert set(created.genre.values_list('slug', flat=True)) == {
+            genres[0]['slug'], genres[2]['slug']
+        }
+        updated = Title.objects.get(pk=titles[0]['id'])
+        assert updated.year == 1985
+        assert updated.name == titles[0]['name']
+        assert list(updated.genre.values_list('slug', flat=True)) == [
+            genres[2]['slug']
+        ]
+
+    def test_03_bulk_ndjson(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        body = '\n'.join(
+            json.dumps({
+                'name': f'Книга {number}',
+                'year': 1990,
+                'category': categories[1]['slug'],
+                'genre': [genres[1]['slug']],
+            })
+            for number in range(3)
+        )
+        response = admin_client.post(
+            self.BULK_URL,
+            data=body.encode(),
+            content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['created'] == 3
+        assert Title.objects.filter(genre__slug=genres[1]['slug']).count() == 3
@@ -0,0 +1,69 @@
+import csv
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ExportAPI:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/export/{table}/'
+
+    def test_01_export_permissions(self, client, user_client):
+        url = self.EXPORT_URL_TEMPLATE.format(table='users')
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что GET-запрос пользователя к `{url}` возвращает '
+            'ответ со статусом 403.'
+        )
+
+    def test_02_export_unknown_table(self, admin_client):
+        url = self.EXPORT_URL_TEMPLATE.format(table='passwords')
+        assert admin_client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_export_csv(self, admin_client, user, user_client):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        url = self.EXPORT_URL_TEMPLATE.format(table='review')
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            f'Проверьте, что `{url}` отдает выгрузку потоком.'
+        )
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(content.splitlines()))
+        assert list(rows[0]) == [
+            'id', 'title_id', 'text', 'author', 'score', 'pub_date'
+        ], 'Проверьте, что столбцы совпадают с форматом review.csv.'
+        assert rows[0]['text'] == reviews[0]['text']
+        assert rows[0]['author'] == str(user.id)
+
+        url = self.EXPORT_URL_TEMPLATE.format(table='genre_title')
+        content = b''.join(admin_client.get(url).streaming_content).decode()
+        rows = list(csv.DictReader(content.splitlines()))
+        assert len(rows) == 3
+        assert {row['title_id'] for row in rows} == {
+            str(title['id']) for title in titles
+        }
+
+    def test_04_export_ndjson(self, admin_client):
+        url = self.EXPORT_URL_TEMPLATE.format(table='users')
+        response = admin_client.get(f'{url}?output=ndjson')
+        assert response.status_code == HTTPStatus.OK
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert json.loads(lines[0])['username'] == 'TestAdmin'
+
+    def test_05_export_command(self, admin_client, user, user_client,
+                               tmp_path):
+        create_reviews(admin_client, {user: user_client})
+        call_command('export_data', output_dir=str(tmp_path))
+        with open(tmp_path / 'titles.csv', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 2
+        assert rows[0]['category'], (
+            'Проверьте, что столбец category содержит id категории.'
+        )
+        assert (tmp_path / 'genre_title.csv').exists()
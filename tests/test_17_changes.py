@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_comment, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ChangesAPI:
+
+    CHANGES_URL = '/api/v1/changes/'
+
+    def test_01_changes_feed(self, admin_client, user_client, client):
+        response = client.get(self.CHANGES_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.CHANGES_URL}` возвращает '
+            'ответ со статусом 200.'
+        )
+        titles, _, _ = create_titles(admin_client)
+        data = client.get(self.CHANGES_URL).json()
+        changed = {(change['type'], change['id']) for change in data['changes']}
+        assert ('title', titles[0]['id']) in changed
+        assert {change_type for change_type, _ in changed} == {
+            'title', 'category', 'genre'
+        }
+        title = next(
+            change for change in data['changes']
+            if change['type'] == 'title' and change['id'] == titles[0]['id']
+        )
+        assert title['data']['name'] == titles[0]['name']
+        assert not data['has_more']
+
+        cursor = data['cursor']
+        data = client.get(f'{self.CHANGES_URL}?since={cursor}').json()
+        assert data['changes'] == [] and data['cursor'] == cursor, (
+            'Проверьте, что повторный запрос с полученным курсором не '
+            'возвращает уже переданные изменения.'
+        )
+
+        review = user_client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            data={'text': 'Отзыв', 'score': 7}
+        ).json()
+        comment = create_single_comment(
+            user_client, titles[0]['id'], review['id'], 'Комментарий'
+        ).json()
+        admin_client.patch(
+            f'/api/v1/titles/{titles[1]["id"]}/', data={'year': 1989}
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        data = client.get(f'{self.CHANGES_URL}?since={cursor}').json()
+        changes = {
+            (change['type'], change['id']): change
+            for change in data['changes']
+        }
+        assert changes[('review', review['id'])]['title_id'] == (
+            titles[0]['id']
+        )
+        assert changes[('review', review['id'])]['data']['score'] == 7
+        assert changes[('comment', comment['id'])]['review_id'] == (
+            review['id']
+        )
+        assert changes[('title', titles[1]['id'])]['action'] == 'deleted', (
+            'Проверьте, что несколько изменений одного объекта сворачиваются '
+            'в последнее.'
+        )
+        assert 'data' not in changes[('title', titles[1]['id'])]
+
+    def test_02_changes_limit(self, admin_client, client):
+        create_titles(admin_client)
+        data = client.get(f'{self.CHANGES_URL}?limit=2').json()
+        assert len(data['changes']) == 2 and data['has_more']
+        rest = client.get(
+            f'{self.CHANGES_URL}?since={data["cursor"]}&limit=100'
+        ).json()
+        assert not rest['has_more']
+        assert len(rest['changes']) == 5
@@ -0,0 +1,103 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_title_fields(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(f'{self.TITLES_URL}?fields=id,name')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert results and all(
+            set(title) == {'id', 'name'} for title in results
+        ), (
+            'Проверьте, что параметр `fields` оставляет в ответе только '
+            'запрошенные поля произведения.'
+        )
+
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/?fields=name,genre'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()) == {'name', 'genre'}
+        assert response.json()['name'] == titles[0]['name']
+
+    def test_02_title_query_trimmed(self, admin_client, client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{self.TITLES_URL}?fields=id,name')
+        assert response.status_code == HTTPStatus.OK
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'AVG' not in sql, (
+            'Проверьте, что рейтинг не вычисляется, если поле `rating` '
+            'не запрошено.'
+        )
+        assert '"description"' not in sql, (
+            'Проверьте, что незапрошенные поля не выбираются из БД.'
+        )
+
+    def test_03_title_expand(self, admin_client, user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Текст', 7)
+        response = client.get(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        assert 'reviews_count' not in response.json(), (
+            'Проверьте, что дополнительные поля не возвращаются без '
+            'параметра `expand`.'
+        )
+        response = client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/?expand=reviews_count'
+        )
+        assert response.json()['reviews_count'] == 1, (
+            'Проверьте, что параметр `expand=reviews_count` добавляет в '
+            'ответ число отзывов.'
+        )
+        response = client.get(
+            f'{self.TITLES_URL}{titles[1]["id"]}/'
+            '?fields=id&expand=reviews_count'
+        )
+        assert response.json() == {'id': titles[1]['id'], 'reviews_count': 0}
+
+    def test_04_review_fields_and_expand(self, admin_client, user_client,
+                                         client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Текст', 7
+        ).json()
+        create_single_comment(
+            user_client, titles[0]['id'], review['id'], 'Комментарий'
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(f'{url}?fields=id,score&expand=comments_count')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == [
+            {'id': review['id'], 'score': 7, 'comments_count': 1}
+        ], (
+            'Проверьте, что параметры `fields` и `expand` работают для '
+            'отзывов.'
+        )
+
+        comments_url = f'{url}{review["id"]}/comments/?fields=text'
+        response = client.get(comments_url)
+        assert response.json()['results'] == [{'text': 'Комментарий'}]
+
+    def test_05_write_ignores_fields(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/?fields=id',
+            data={'name': 'Новое имя'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['name'] == 'Новое имя', (
+            'Проверьте, что параметр `fields` не влияет на запросы на '
+            'изменение.'
+        )
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TitlesBatch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_order_and_missing(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        ids = [titles[1]['id'], 0, titles[0]['id']]
+        response = client.get(
+            f'{self.TITLES_URL}?ids={",".join(map(str, ids))}'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/?ids=` возвращает '
+            'ответ со статусом 200.'
+        )
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            'Проверьте, что произведения возвращаются в порядке запроса.'
+        )
+        assert data['missing'] == [0], (
+            'Проверьте, что в ответе перечислены отсутствующие id.'
+        )
+        detail = client.get(f'{self.TITLES_URL}{titles[0]["id"]}/').json()
+        assert data['results'][1] == detail
+
+    def test_02_invalid_ids(self, client):
+        response = client.get(f'{self.TITLES_URL}?ids=1,abc')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.get(f'{self.TITLES_URL}?ids=%C2%B2')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что id из символов-цифр Unicode отклоняются.'
+        )
+        response = client.get(f'{self.TITLES_URL}%C2%B2/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        ids = ','.join(map(str, range(1, 200)))
+        response = client.get(f'{self.TITLES_URL}?ids={ids}')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что количество id в запросе ограничено.'
+        )
+
+    def test_03_cache_reused(self, admin_client, client,
+                             django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}?ids={titles[0]["id"]},{titles[1]["id"]}'
+        client.get(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        with django_assert_num_queries(2):
+            client.get(url)
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert len(response.json()['results']) == 2, (
+            'Проверьте, что повторный запрос использует кеш произведений.'
+        )
+
+    def test_04_cache_invalidated(self, admin_client, user_client,
+                                  client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        client.get(url)
+        admin_client.patch(url, data={'name': 'Новое имя'})
+        create_single_review(user_client, titles[0]['id'], 'Текст', 7)
+        response = client.get(f'{self.TITLES_URL}?ids={titles[0]["id"]}')
+        title = response.json()['results'][0]
+        assert title['name'] == 'Новое имя' and title['rating'] == 7, (
+            'Проверьте, что кеш произведения сбрасывается при изменении '
+            'произведения и его отзывов.'
+        )
+        admin_client.patch(url, data={'genre': ['comedy']})
+        assert client.get(url).json()['genre'] == [
+            {'name': 'Комедия', 'slug': 'comedy'}
+        ]
@@ -0,0 +1,65 @@
+import gzip
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+from api import middleware
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Compression:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_gzip(self, admin_client, client, settings):
+        settings.API_COMPRESS_MIN_SIZE = 100
+        create_titles(admin_client)
+        plain = client.get(self.TITLES_URL)
+        assert not plain.has_header('Content-Encoding'), (
+            'Проверьте, что без заголовка Accept-Encoding ответ не сжимается.'
+        )
+        response = client.get(self.TITLES_URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что ответы API сжимаются gzip.'
+        )
+        assert 'Accept-Encoding' in response['Vary']
+        assert json.loads(gzip.decompress(response.content)) == plain.json()
+
+    def test_02_small_response_not_compressed(self, client, settings):
+        settings.API_COMPRESS_MIN_SIZE = 10 ** 6
+        response = client.get(self.TITLES_URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что небольшие ответы не сжимаются.'
+        )
+
+    def test_03_cached_response_compressed_once(
+            self, admin_client, client, settings, monkeypatch):
+        settings.API_COMPRESS_MIN_SIZE = 100
+        titles, _, _ = create_titles(admin_client)
+        calls = []
+
+        def compress(content):
+            calls.append(content)
+            return gzip.compress(content)
+
+        monkeypatch.setitem(middleware.COMPRESSORS, 'gzip', compress)
+        monkeypatch.delitem(middleware.COMPRESSORS, 'br', raising=False)
+        url = f'{self.TITLES_URL}?ids={titles[0]["id"]},{titles[1]["id"]}'
+        first = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        second = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert first.content == second.content
+        assert len(calls) == 1, (
+            'Проверьте, что сжатые ответы из кеша ответов кешируются.'
+        )
+        cache.clear()
+        client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert len(calls) == 2
+
+    def test_04_accept_encoding(self):
+        assert middleware.choose_encoding('gzip;q=0, identity') is None
+        assert middleware.choose_encoding('deflate, gzip;q=0.5') == 'gzip'
+        assert middleware.choose_encoding('') is None
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+
+from api.cache import (get_or_compute_many, single_flight,
+                       single_flight_stats)
+
+
+class Test21SingleFlight:
+
+    def test_01_concurrent_misses_coalesced(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    single_flight('key', compute, 60)
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == ['value'] * 5
+        assert len(calls) == 1, (
+            'Проверьте, что при одновременных промахах кеша значение '
+            'вычисляется один раз.'
+        )
+        stats = single_flight_stats()
+        assert stats['computed'] == 1
+        assert stats['coalesced'] == 4
+
+    def test_02_stale_while_revalidate(self):
+        cache.set('key', ('old', time.time() - 1), 60)
+        cache.add('key:lock', 1, 60)
+        assert single_flight('key', lambda: 'new', 60) == 'old', (
+            'Проверьте, что пока запись пересчитывается, отдается '
+            'устаревшее значение.'
+        )
+        assert single_flight_stats()['stale'] == 1
+        cache.delete('key:lock')
+        assert single_flight('key', lambda: 'new', 60) == 'new'
+        assert single_flight('key', lambda: 'newer', 60) == 'new'
+
+    def test_03_many_keys_computed_once(self):
+        calls = []
+
+        def compute(ids):
+            calls.append(ids)
+            return {pk: pk * 10 for pk in ids if pk != 3}
+
+        keys = {pk: f'item:{pk}' for pk in (1, 2, 3)}
+        assert get_or_compute_many(keys, compute, 60) == {1: 10, 2: 20}
+        assert get_or_compute_many(keys, compute, 60) == {1: 10, 2: 20}
+        assert calls == [[1, 2, 3], [3]], (
+            'Проверьте, что вычисляются только отсутствующие в кеше записи.'
+        )
+
+    def test_04_lock_released_on_error(self):
+        def compute():
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            single_flight('key', compute, 60)
+        assert cache.get('key:lock') is None
@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.pagination import TitlePagination
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleListCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_anonymous_list_cached(self, admin_client, client,
+                                      django_assert_num_queries):
+        _, categories, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}?category={categories[0]["slug"]}&page=1'
+        first = client.get(url)
+        assert first.status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            second = client.get(
+                f'{self.TITLES_URL}?page=1&name='
+                f'&category={categories[0]["slug"]}'
+            )
+        assert second.json() == first.json(), (
+            'Проверьте, что страницы списка для анонимных пользователей '
+            'кешируются по нормализованным параметрам запроса.'
+        )
+
+    def test_02_authenticated_not_cached(self, admin_client,
+                                         django_assert_max_num_queries):
+        create_titles(admin_client)
+        admin_client.get(self.TITLES_URL)
+        with django_assert_max_num_queries(10) as context:
+            admin_client.get(self.TITLES_URL)
+        assert len(context.captured_queries) > 0, (
+            'Проверьте, что список для авторизованных пользователей '
+            'не берется из кеша.'
+        )
+
+    def test_03_invalidation(self, admin_client, user_client, client):
+        titles, _, genres = create_titles(admin_client)
+        url = f'{self.TITLES_URL}?genre={genres[1]["slug"]}'
+        count = client.get(url).json()['count']
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[1]["id"]}/',
+            data={'genre': [genres[1]['slug']]}
+        )
+        assert client.get(url).json()['count'] == count + 1, (
+            'Проверьте, что кеш списка сбрасывается при изменении жанров '
+            'произведения.'
+        )
+
+        create_single_review(user_client, titles[1]['id'], 'Текст', 9)
+        results = client.get(self.TITLES_URL).json()['results']
+        assert results[0]['id'] == titles[1]['id']
+        assert results[0]['rating'] == 9, (
+            'Проверьте, что кеш списка сбрасывается при изменении отзывов.'
+        )
+
+        response = admin_client.delete(f'{self.TITLES_URL}{titles[1]["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert titles[1]['id'] not in [
+            title['id']
+            for title in client.get(self.TITLES_URL).json()['results']
+        ]
+
+    def test_04_links_from_normalized_params(self, admin_client, client,
+                                             monkeypatch):
+        monkeypatch.setattr(TitlePagination, 'page_size', 1)
+        create_titles(admin_client)
+        data = client.get(
+            f'{self.TITLES_URL}?utm_source=mail&category='
+        ).json()
+        assert data['next'] == (
+            f'http://testserver{self.TITLES_URL}?page=2'
+        ), (
+            'Проверьте, что ссылки закешированной страницы не содержат '
+            'параметров, не входящих в ключ кеша.'
+        )
+        assert client.get(self.TITLES_URL).json()['next'] == data['next']
+        data = client.get(f'{self.TITLES_URL}?page=2&ref=x').json()
+        assert data['previous'] == f'http://testserver{self.TITLES_URL}'
@@ -0,0 +1,117 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from django.test import RequestFactory
+
+from api.throttling import (SignupIPRateThrottle, SignupUsernameRateThrottle,
+                            TokenUsernameRateThrottle, WriteUserRateThrottle,
+                            throttle_stats)
+from tests.utils import create_single_review, create_titles
+
+
+def set_rate(monkeypatch, throttle_class, rate):
+    monkeypatch.setattr(throttle_class, 'rate', rate, raising=False)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Throttling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def test_01_signup_by_username(self, client, mailoutbox, monkeypatch):
+        set_rate(monkeypatch, SignupUsernameRateThrottle, '2/hour')
+        data = {'username': 'flood', 'email': 'flood@yamdb.fake'}
+        for _ in range(2):
+            response = client.post(self.URL_SIGNUP, data=data)
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что частота запросов кода подтверждения для одного '
+            'имени пользователя ограничена.'
+        )
+        assert response.has_header('Retry-After')
+        assert len(mailoutbox) == 2
+        response = client.post(
+            self.URL_SIGNUP,
+            data={'username': 'other', 'email': 'other@yamdb.fake'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert throttle_stats()['signup_username'] == {
+            'allowed': 3, 'throttled': 1
+        }
+
+    def test_02_signup_by_ip(self, client, monkeypatch):
+        set_rate(monkeypatch, SignupIPRateThrottle, '1/hour')
+        client.post(self.URL_SIGNUP, data={})
+        response = client.post(self.URL_SIGNUP, data={})
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что частота запросов на регистрацию с одного '
+            'IP-адреса ограничена.'
+        )
+
+    def test_03_token_by_username(self, client, monkeypatch):
+        set_rate(monkeypatch, TokenUsernameRateThrottle, '3/min')
+        data = {'username': 'victim', 'confirmation_code': '12345'}
+        statuses = [
+            client.post(self.URL_TOKEN, data=data).status_code
+            for _ in range(4)
+        ]
+        assert statuses[-1] == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что перебор кодов подтверждения ограничен.'
+        )
+        assert HTTPStatus.TOO_MANY_REQUESTS not in statuses[:3]
+
+    def test_04_review_posts_by_user(self, admin_client, user_client,
+                                     monkeypatch):
+        set_rate(monkeypatch, WriteUserRateThrottle, '1/min')
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Текст', 5)
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        response = user_client.post(url, data={'text': 'Еще', 'score': 5})
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что частота создания отзывов ограничена.'
+        )
+        assert user_client.get(url).status_code == HTTPStatus.OK
+        response = admin_client.post(url, data={'text': 'Еще', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+
+    def test_05_concurrent_requests(self, monkeypatch):
+        set_rate(monkeypatch, SignupIPRateThrottle, '5/hour')
+        request = RequestFactory().post(self.URL_SIGNUP)
+
+        def allow(_):
+            return SignupIPRateThrottle().allow_request(request, None)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            allowed = list(executor.map(allow, range(20)))
+        assert allowed.count(True) == 5, (
+            'Проверьте, что параллельные запросы не проходят сверх ставки.'
+        )
+
+    def test_06_window_refill(self, monkeypatch):
+        set_rate(monkeypatch, SignupIPRateThrottle, '2/min')
+        request = RequestFactory().post(self.URL_SIGNUP)
+        now = [600.0]
+
+        def allow():
+            throttle = SignupIPRateThrottle()
+            throttle.timer = lambda: now[0]
+            return throttle.allow_request(request, None), throttle
+
+        assert allow()[0] and allow()[0]
+        allowed, throttle = allow()
+        assert not allowed
+        assert 0 < throttle.wait() <= 60
+        now[0] += 60
+        allowed, throttle = allow()
+        assert not allowed and throttle.wait() == 30, (
+            'Проверьте, что запросы прошлого окна учитываются в начале '
+            'следующего.'
+        )
+        now[0] += 30
+        assert allow()[0]
+        assert not allow()[0]
+        now[0] += 90
+        assert allow()[0] and allow()[0]
@@ -0,0 +1,95 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+from reviews.models import ConfirmationCode
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ConfirmationCode:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    DATA = {'username': 'coder', 'email': 'coder@yamdb.fake'}
+
+    def signup(self, client):
+        response = client.post(self.URL_SIGNUP, data=self.DATA)
+        assert response.status_code == HTTPStatus.OK
+        return mail.outbox[-1].body.split()[-1]
+
+    def get_token(self, client, code):
+        return client.post(self.URL_TOKEN, data={
+            'username': self.DATA['username'], 'confirmation_code': code
+        })
+
+    def test_01_code_used_once(self, client):
+        code = self.signup(client)
+        assert len(code) == 6 and code.isdigit()
+        pending = ConfirmationCode.objects.get(user__username='coder')
+        assert code not in pending.code_hash, (
+            'Проверьте, что код подтверждения хранится в виде хеша.'
+        )
+        response = self.get_token(client, code)
+        assert response.status_code == HTTPStatus.OK
+        assert 'Token' in response.json()
+        response = self.get_token(client, code)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что код подтверждения можно использовать один раз.'
+        )
+
+    def test_02_new_code_replaces_old(self, client):
+        old_code = self.signup(client)
+        new_code = self.signup(client)
+        assert ConfirmationCode.objects.filter(
+            user__username='coder'
+        ).count() == 1
+        if old_code != new_code:
+            response = self.get_token(client, old_code)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert self.get_token(client, new_code).status_code == HTTPStatus.OK
+
+    def test_03_expired_code(self, client):
+        code = self.signup(client)
+        ConfirmationCode.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        assert self.get_token(client, code).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), 'Проверьте, что истекший код подтверждения не принимается.'
+        assert not ConfirmationCode.objects.exists()
+
+    def test_04_attempts_limited(self, client, settings):
+        settings.CONFIRMATION_CODE_MAX_ATTEMPTS = 3
+        code = self.signup(client)
+        wrong_code = str((int(code) + 1) % 10 ** 6).zfill(6)
+        for _ in range(3):
+            response = self.get_token(client, wrong_code)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert self.get_token(client, code).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), (
+            'Проверьте, что после нескольких неудачных попыток код '
+            'подтверждения перестает действовать.'
+        )
+
+    def test_05_renamed_user_with_pending_code(self, client,
+                                               django_user_model):
+        self.signup(client)
+        django_user_model.objects.filter(username='coder').update(
+            username='renamed'
+        )
+        response = client.post(self.URL_SIGNUP, data={
+            'username': 'coder', 'email': 'other@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что код подтверждения переименованного пользователя '
+            'не мешает регистрации с его прежним username.'
+        )
+        code = mail.outbox[-1].body.split()[-1]
+        response = client.post(self.URL_TOKEN, data={
+            'username': 'coder', 'confirmation_code': code
+        })
+        assert response.status_code == HTTPStatus.OK
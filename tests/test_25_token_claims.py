@@ -0,0 +1,120 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from api.authentication import access_token_for_user
+from tests.utils import create_titles
+
+
+def claims_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {access_token_for_user(user)}'
+    )
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25TokenClaims:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_claims_in_token(self, user):
+        token = access_token_for_user(user)
+        assert token['role'] == user.role
+        assert token['is_superuser'] is False
+        assert token['token_version'] == user.token_version
+
+    def test_02_permissions_without_user_query(
+            self, admin, admin_client, user, django_assert_num_queries):
+        create_titles(admin_client)
+        client = claims_client(admin)
+        client.get('/api/v1/users/')
+        with django_assert_num_queries(2):
+            response = client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что права администратора определяются по claims '
+            'токена без загрузки пользователя.'
+        )
+        response = claims_client(user).get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_03_review_author_from_claims(self, admin_client, user,
+                                          moderator):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        client = claims_client(user)
+        response = client.post(url, data={'text': 'Текст', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        review_url = f'{url}{response.json()["id"]}/'
+        response = client.patch(review_url, data={'text': 'Новый'})
+        assert response.status_code == HTTPStatus.OK
+        response = client.post(url, data={'text': 'Еще', 'score': 5})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = claims_client(moderator).delete(review_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+
+    def test_04_role_change_revokes_claims(self, admin_client, user):
+        client = claims_client(user)
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после изменения роли токены со старыми claims '
+            'не принимаются.'
+        )
+        user.refresh_from_db()
+        response = claims_client(user).get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.OK
+
+    def test_05_deleted_user_rejected(self, admin_client, user):
+        client = claims_client(user)
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    @pytest.mark.parametrize('field, value', (
+        ('role', 'moderator'),
+        ('is_superuser', True),
+        ('is_active', False),
+    ))
+    def test_06_rights_change_outside_api(self, user, field, value):
+        client = claims_client(user)
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
+        user = type(user).objects.get(pk=user.pk)
+        setattr(user, field, value)
+        user.save(update_fields=[field])
+        assert client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            f'Проверьте, что изменение `{field}` при сохранении модели '
+            'отзывает токены с прежними claims.'
+        )
+
+    def test_07_other_changes_keep_tokens(self, user):
+        client = claims_client(user)
+        user = type(user).objects.get(pk=user.pk)
+        user.bio = 'Новое описание'
+        user.save()
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
+
+    def test_08_version_expires_with_local_cache(self, user, settings):
+        settings.LOCAL_COPY_TIMEOUT = 0
+        client = claims_client(user)
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
+        # Изменение в другом процессе: кеш этого процесса не сбрасывается.
+        type(user).objects.filter(pk=user.pk).update(
+            token_version=user.token_version + 1
+        )
+        assert client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что с кешем в памяти процесса версия токенов '
+            'хранится не дольше LOCAL_COPY_TIMEOUT секунд.'
+        )
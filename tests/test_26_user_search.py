@@ -0,0 +1,87 @@
+from http import HTTPStatus
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26UserSearch:
+
+    USERS_URL = '/api/v1/users/'
+
+    @pytest.fixture
+    def users(self):
+        for name in ('alice', 'Alina', 'bob', 'malice'):
+            User.objects.create_user(
+                username=name, email=f'{name.lower()}@yamdb.fake'
+            )
+
+    def search(self, client, query):
+        response = client.get(f'{self.USERS_URL}?{query}')
+        assert response.status_code == HTTPStatus.OK
+        return sorted(item['username'] for item in response.json()['results'])
+
+    def test_01_prefix_search(self, admin_client, users):
+        assert self.search(admin_client, 'search=ALI') == ['Alina', 'alice'], (
+            'Проверьте, что поиск пользователей выполняется по началу имени '
+            'без учета регистра.'
+        )
+        assert self.search(admin_client, 'search=bob@') == ['bob'], (
+            'Проверьте, что поиск пользователей выполняется и по почте.'
+        )
+        assert self.search(
+            admin_client, 'search=lice&search_mode=contains'
+        ) == ['alice', 'malice']
+
+    def test_02_prefix_search_uses_range(self, admin_client, users):
+        with CaptureQueriesContext(connection) as context:
+            admin_client.get(f'{self.USERS_URL}?search=ali')
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert '"username_lower" >=' in sql
+        assert 'LIKE' not in sql, (
+            'Проверьте, что поиск по префиксу не использует LIKE.'
+        )
+
+    def test_03_search_columns_follow_changes(self, admin_client, users):
+        response = admin_client.patch(
+            f'{self.USERS_URL}bob/', data={'username': 'Robert'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.search(admin_client, 'search=rob') == ['Robert']
+
+    def test_04_cursor_pagination(self, admin_client, users):
+        response = admin_client.get(f'{self.USERS_URL}?pagination=cursor')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data and 'next' in data, (
+            'Проверьте, что параметр `pagination=cursor` включает курсорную '
+            'пагинацию.'
+        )
+        usernames = [item['username'] for item in data['results']]
+        next_url = data['next']
+        while next_url:
+            data = admin_client.get(next_url).json()
+            usernames.extend(item['username'] for item in data['results'])
+            next_url = data['next']
+        assert usernames == sorted(User.objects.values_list(
+            'username', flat=True
+        )), 'Проверьте, что курсорная пагинация упорядочена по username.'
+        assert 'count' in admin_client.get(self.USERS_URL).json()
+
+    def test_05_search_columns_filled_in_python(self, admin_client):
+        migration = import_module(
+            'reviews.migrations.0012_user_search_columns'
+        )
+        User.objects.bulk_create([
+            User(username='Иван', email='Ivan@yamdb.fake'),
+        ])
+        migration.fill_search_columns(apps, None)
+        assert self.search(admin_client, 'search=иВ') == ['Иван'], (
+            'Проверьте, что колонки для поиска заполняются str.lower(), '
+            'в том числе для кириллицы.'
+        )
@@ -0,0 +1,112 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.autocomplete import title_names
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Autocomplete:
+
+    URL = '/api/v1/titles/autocomplete/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def names(self, client, query):
+        response = client.get(f'{self.URL}?{query}')
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()]
+
+    def test_01_prefix_matches(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        name = titles[0]['name']
+        words = name.split()
+        assert self.names(client, f'q={words[0][:3].upper()}') == [name], (
+            'Проверьте, что автодополнение находит произведения по началу '
+            'названия без учета регистра.'
+        )
+        assert self.names(client, 'q=') == []
+        assert self.names(client, 'q=zzz') == []
+
+    def test_02_word_prefix_and_rating_order(self, admin_client,
+                                             user_client, client):
+        _, categories, genres = create_titles(admin_client)
+        for name, score in (('Ёлка 2', 3), ('Новая елка', 9), ('Ель', 5)):
+            response = admin_client.post(self.TITLES_URL, data={
+                'name': name,
+                'year': 2000,
+                'genre': [genres[0]['slug']],
+                'category': categories[0]['slug'],
+            })
+            create_single_review(
+                user_client, response.json()['id'], 'Текст', score
+            )
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Елки-палки',
+            'year': 2001,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        })
+        assert self.names(client, 'q=елк') == [
+            'Новая елка', 'Ёлка 2', 'Елки-палки'
+        ], (
+            'Проверьте, что автодополнение находит совпадения с началом '
+            'любого слова и упорядочивает их по рейтингу.'
+        )
+        assert self.names(client, 'q=ел&limit=1') == ['Новая елка']
+
+    def test_03_no_queries(self, admin_client, client,
+                           django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        client.get(f'{self.URL}?q=a')
+        with django_assert_num_queries(0):
+            response = client.get(f'{self.URL}?q={titles[1]["name"][:2]}')
+        assert response.json(), (
+            'Проверьте, что автодополнение не обращается к БД.'
+        )
+
+    def test_04_updated_on_write(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        client.get(f'{self.URL}?q=a')
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            data={'name': 'Уникальное имя'}
+        )
+        assert self.names(client, 'q=уник') == ['Уникальное имя'], (
+            'Проверьте, что индекс автодополнения обновляется при '
+            'изменении произведений.'
+        )
+        admin_client.delete(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        assert self.names(client, 'q=уник') == []
+
+    def test_05_incremental_update_and_rating_order(
+            self, admin_client, user_client, moderator_client, client,
+            monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        for title, name in zip(titles, ('Дом у моря', 'Дом у реки')):
+            admin_client.patch(
+                f'{self.TITLES_URL}{title["id"]}/', data={'name': name}
+            )
+        create_single_review(user_client, titles[0]['id'], 'Текст', 6)
+        assert self.names(client, 'q=дом') == ['Дом у моря', 'Дом у реки']
+
+        builds = []
+        build = title_names.build
+        monkeypatch.setattr(
+            title_names, 'build',
+            lambda version: builds.append(version) or build(version)
+        )
+        create_single_review(moderator_client, titles[1]['id'], 'Текст', 10)
+        assert self.names(client, 'q=дом') == ['Дом у реки', 'Дом у моря'], (
+            'Проверьте, что порядок автодополнения обновляется при '
+            'изменении рейтинга.'
+        )
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Дача'}
+        )
+        assert self.names(client, 'q=да') == ['Дача']
+        assert self.names(client, 'q=дом') == ['Дом у реки']
+        assert builds == [], (
+            'Проверьте, что изменения отдельных произведений применяются '
+            'к индексу без полного перестроения.'
+        )
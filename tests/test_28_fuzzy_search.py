@@ -0,0 +1,104 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title, TitleTrigram
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28FuzzySearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(
+            f'{self.TITLES_URL}?search={query}&search_mode=fuzzy'
+        )
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_misspelled_name(self, admin_client, client):
+        create_titles(admin_client)
+        assert self.search(client, 'Терминтор') == ['Терминатор'], (
+            'Проверьте, что нечеткий поиск находит произведение по названию '
+            'с опечаткой.'
+        )
+        assert self.search(client, 'крепкй арешек') == ['Крепкий орешек']
+        assert self.search(client, 'Матрица') == []
+        assert len(self.search(client, '')) == 2, (
+            'Проверьте, что нечеткий поиск с пустым запросом не фильтрует '
+            'список произведений.'
+        )
+        assert len(self.search(client, '%20-')) == 2
+        response = client.get(f'{self.TITLES_URL}?search=Терминтор')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что без `search_mode=fuzzy` поиск остается точным.'
+        )
+
+    def test_02_similarity_then_rating(self, admin_client, user_client,
+                                       client):
+        _, categories, genres = create_titles(admin_client)
+        ids = {}
+        for name in ('Терминатор 2', 'Терминатор 3'):
+            ids[name] = admin_client.post(self.TITLES_URL, data={
+                'name': name,
+                'year': 1991,
+                'genre': [genres[0]['slug']],
+                'category': categories[0]['slug'],
+            }).json()['id']
+        create_single_review(user_client, ids['Терминатор 3'], 'Текст', 9)
+        create_single_review(user_client, ids['Терминатор 2'], 'Текст', 4)
+        assert self.search(client, 'Терменатор') == [
+            'Терминатор', 'Терминатор 3', 'Терминатор 2'
+        ], (
+            'Проверьте, что результаты нечеткого поиска упорядочены по '
+            'сходству, а затем по рейтингу.'
+        )
+
+    def test_03_index_follows_writes(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Чужой'}
+        )
+        assert self.search(client, 'Терминатор') == []
+        assert self.search(client, 'Чужй') == ['Чужой'], (
+            'Проверьте, что индекс триграмм обновляется при изменении '
+            'названия.'
+        )
+        response = admin_client.post(
+            f'{self.TITLES_URL}bulk/',
+            data=[{'id': titles[1]['id'], 'name': 'Бегущий по лезвию'}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.search(client, 'бегущй по лезвию') == ['Бегущий по лезвию']
+
+    def test_04_commands(self, admin_client, client):
+        create_titles(admin_client)
+        TitleTrigram.objects.all().delete()
+        call_command('build_title_trigrams')
+        assert self.search(client, 'Терминтор') == ['Терминатор']
+        titles_count = Title.objects.count()
+        call_command('benchmark_title_search', titles=200, queries=5)
+        assert Title.objects.count() == titles_count, (
+            'Проверьте, что замер не оставляет синтетические данные в БД.'
+        )
+
+    def test_05_typo_in_one_word(self, admin_client, client):
+        _, categories, genres = create_titles(admin_client)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Мастер и Маргарита',
+            'year': 1967,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        assert self.search(client, 'мастр') == ['Мастер и Маргарита'], (
+            'Проверьте, что нечеткий поиск находит многословное название '
+            'по опечатке в одном слове.'
+        )
+        assert self.search(client, 'мастер маргрита') == [
+            'Мастер и Маргарита'
+        ]
@@ -0,0 +1,89 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29TextSearch:
+
+    URL = '/api/v1/search/'
+
+    @pytest.fixture
+    def texts(self, admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'],
+            'Лучший фильм про роботов <и> путешествия во времени', 10
+        ).json()
+        create_single_review(
+            moderator_client, titles[1]['id'], 'Скучное кино', 3
+        )
+        comment = create_single_comment(
+            moderator_client, titles[0]['id'], review['id'],
+            'Согласен, роботы великолепны'
+        ).json()
+        return titles, review, comment
+
+    def search(self, client, query):
+        response = client.get(f'{self.URL}?{query}')
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['results']
+
+    def test_01_reviews_and_comments(self, client, texts):
+        titles, review, comment = texts
+        results = self.search(client, 'q=робот')
+        assert {(hit['type'], hit['id']) for hit in results} == {
+            ('review', review['id']), ('comment', comment['id'])
+        }, (
+            'Проверьте, что поиск находит отзывы и комментарии по началу '
+            'слова.'
+        )
+        for hit in results:
+            assert hit['title_id'] == titles[0]['id']
+            assert hit['review_id'] == review['id']
+        review_hit = next(hit for hit in results if hit['type'] == 'review')
+        assert '<mark>роботов</mark>' in review_hit['snippet'], (
+            'Проверьте, что совпадения выделены в фрагменте текста.'
+        )
+        assert '&lt;и&gt;' in review_hit['snippet']
+        assert [hit['type'] for hit in self.search(
+            client, 'q=робот&type=comment'
+        )] == ['comment']
+
+    def test_02_sync_and_syntax(self, client, moderator_client, texts):
+        titles, review, comment = texts
+        assert self.search(client, 'q=робот AND "OR* (') == []
+        assert self.search(client, 'q=') == []
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}/'
+            f'comments/{comment["id"]}/'
+        )
+        moderator_client.patch(url, data={'text': 'Передумал'})
+        assert [hit['type'] for hit in self.search(client, 'q=робот')] == [
+            'review'
+        ], 'Проверьте, что индекс обновляется при изменении комментария.'
+        assert self.search(client, 'q=передумал')[0]['id'] == comment['id']
+        moderator_client.delete(url)
+        assert self.search(client, 'q=передумал') == []
+
+    def test_03_no_like_scan(self, client, texts):
+        with CaptureQueriesContext(connection) as context:
+            self.search(client, 'q=кино')
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'MATCH' in sql and 'LIKE' not in sql
+
+    def test_04_rebuild(self, client, texts):
+        _, _, comment = texts
+        Comment.objects.filter(pk=comment['id']).update(text='Новый текст')
+        call_command('rebuild_search_index', batch_size=1)
+        assert self.search(client, 'q=новый')[0]['id'] == comment['id']
+        assert self.search(client, 'q=великолепны') == []
+        response = client.get(f'{self.URL}?q=кино&type=title')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,202 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+
+from reviews.models import Comment, Review, Title, TitleRating, User
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30PendingDeletion:
+
+    TITLES_URL = '/api/v1/titles/'
+    USERS_URL = '/api/v1/users/'
+
+    @pytest.fixture
+    def reviewed(self, admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        user_review = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв пользователя', 2
+        ).json()
+        moderator_review = create_single_review(
+            moderator_client, titles[0]['id'], 'Отзыв модератора', 8
+        ).json()
+        for text in ('Первый', 'Второй', 'Третий'):
+            create_single_comment(
+                moderator_client, titles[0]['id'], user_review['id'], text
+            )
+        create_single_comment(
+            user_client, titles[0]['id'], moderator_review['id'], 'Ответ'
+        )
+        return titles, user_review, moderator_review
+
+    def process(self, batch_size=1):
+        out = StringIO()
+        call_command('process_deletions', batch_size=batch_size, stdout=out)
+        return out.getvalue()
+
+    def test_01_title_hidden_then_deleted(self, admin_client, client,
+                                          reviewed):
+        titles, user_review, _ = reviewed
+        title_id = titles[0]['id']
+        response = admin_client.delete(f'{self.TITLES_URL}{title_id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+
+        assert client.get(
+            f'{self.TITLES_URL}{title_id}/'
+        ).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что произведение скрывается сразу после удаления.'
+        )
+        assert client.get(
+            f'{self.TITLES_URL}{title_id}/reviews/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert client.get(
+            f'{self.TITLES_URL}{title_id}/reviews/{user_review["id"]}/'
+            'comments/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        ids = [
+            title['id'] for title in
+            client.get(self.TITLES_URL).json()['results']
+        ]
+        assert title_id not in ids
+        assert Review.objects.filter(title_id=title_id).count() == 2, (
+            'Проверьте, что отзывы удаляются не в запросе DELETE, '
+            'а командой process_deletions.'
+        )
+
+        output = self.process()
+        assert not Title.all_objects.filter(pk=title_id).exists()
+        assert not Review.objects.filter(title_id=title_id).exists()
+        assert Comment.objects.count() == 0
+        assert f'title {title_id}: comment удалено 4' in output, (
+            'Проверьте, что команда process_deletions сообщает о ходе '
+            'удаления.'
+        )
+        assert f'title {title_id}: review удалено 2' in output
+        assert Title.objects.count() == len(titles) - 1
+
+    def test_02_user_hidden_then_deleted(self, admin_client, client, user,
+                                         reviewed):
+        titles, user_review, moderator_review = reviewed
+        users_count = User.objects.count()
+        response = admin_client.delete(f'{self.USERS_URL}{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert User.objects.count() == users_count - 1
+        assert User.all_objects.filter(pk=user.pk).exists()
+
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        review_ids = [
+            review['id'] for review in client.get(reviews_url).json()[
+                'results'
+            ]
+        ]
+        assert review_ids == [moderator_review['id']], (
+            'Проверьте, что отзывы пользователя, ожидающего удаления, '
+            'скрыты.'
+        )
+        comments = client.get(
+            f'{reviews_url}{moderator_review["id"]}/comments/'
+        ).json()['results']
+        assert comments == []
+        title = client.get(f'{self.TITLES_URL}{titles[0]["id"]}/').json()
+        assert title['rating'] == 8, (
+            'Проверьте, что отзывы пользователя, ожидающего удаления, '
+            'не учитываются в рейтинге до удаления.'
+        )
+
+        self.process()
+        assert not User.all_objects.filter(pk=user.pk).exists()
+        assert list(Review.objects.values_list('pk', flat=True)) == [
+            moderator_review['id']
+        ]
+        assert Comment.objects.count() == 0
+        rating = TitleRating.objects.get(title_id=titles[0]['id'])
+        assert (rating.reviews_count, rating.score_sum) == (1, 8), (
+            'Проверьте, что рейтинг произведения пересчитывается после '
+            'удаления отзывов пользователя.'
+        )
+        title = client.get(f'{self.TITLES_URL}{titles[0]["id"]}/').json()
+        assert title['rating'] == 8
+
+    def test_03_pending_user_cannot_sign_up(self, admin_client, client,
+                                            user):
+        admin_client.delete(f'{self.USERS_URL}{user.username}/')
+        response = client.post(
+            '/api/v1/auth/signup/',
+            data={'username': user.username, 'email': user.email}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что пользователь, ожидающий удаления, не может '
+            'зарегистрироваться заново до завершения удаления.'
+        )
+        response = admin_client.post(
+            self.USERS_URL,
+            data={'username': user.username, 'email': 'other@yamdb.fake'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_pending_user_unique_checks(self, admin_client, user):
+        admin_client.delete(f'{self.USERS_URL}{user.username}/')
+        duplicate = User(username=user.username, email='other@yamdb.fake')
+        with pytest.raises(ValidationError) as error:
+            duplicate.validate_unique()
+        assert 'username' in error.value.message_dict, (
+            'Проверьте, что проверка уникальности учитывает пользователей, '
+            'ожидающих удаления.'
+        )
+        User(username='other', email='other@yamdb.fake').validate_unique()
+
+    def test_05_pending_user_content_hidden_everywhere(
+            self, admin_client, client, user, reviewed):
+        titles, user_review, moderator_review = reviewed
+        admin_client.delete(f'{self.USERS_URL}{user.username}/')
+
+        hits = client.get('/api/v1/search/?q=Отзыв').json()['results']
+        assert [(hit['type'], hit['id']) for hit in hits] == [
+            ('review', moderator_review['id'])
+        ], (
+            'Проверьте, что поиск не находит отзывы пользователя, '
+            'ожидающего удаления.'
+        )
+        for query in ('Первый', 'Ответ'):
+            assert client.get(
+                f'/api/v1/search/?q={query}'
+            ).json()['results'] == []
+
+        changes = {
+            (change['type'], change['id']): change['action']
+            for change in client.get('/api/v1/changes/').json()['changes']
+        }
+        assert changes[('review', user_review['id'])] == 'deleted', (
+            'Проверьте, что лента изменений не отдает отзывы пользователя, '
+            'ожидающего удаления.'
+        )
+        assert changes[('review', moderator_review['id'])] == 'created'
+
+        content = b''.join(
+            admin_client.get('/api/v1/export/review/').streaming_content
+        ).decode()
+        assert 'Отзыв пользователя' not in content
+        assert 'Отзыв модератора' in content
+        content = b''.join(
+            admin_client.get('/api/v1/export/comments/').streaming_content
+        ).decode()
+        assert content.strip().splitlines()[1:] == []
+
+    def test_06_deleted_at_not_in_title_api(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        assert 'deleted_at' not in client.get(url).json()
+        response = admin_client.patch(
+            url, data={'deleted_at': '2020-01-01T00:00:00Z'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert 'deleted_at' not in response.json()
+        assert client.get(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что произведение нельзя пометить на удаление '
+            'через PATCH в обход DELETE.'
+        )
@@ -0,0 +1,208 @@
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.db import OperationalError
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from reviews import jobs
+from reviews.jobs import (JOB_HANDLERS, JobHandler, Worker, claim_jobs,
+                          enqueue, job_stats)
+from reviews.models import Job, Title, User
+from tests.utils import create_single_review, create_titles
+
+
+def run_worker(*args):
+    out = StringIO()
+    call_command('run_worker', '--burst', *args, stdout=out, stderr=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31JobQueue:
+
+    def test_01_deferred_signup_mail(self, client, settings):
+        settings.JOBS_DEFERRED = ('send_confirmation_code',)
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'queued', 'email': 'queued@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что при отложенной отправке письмо не отправляется '
+            'в запросе.'
+        )
+        job = Job.objects.get(kind='send_confirmation_code')
+        assert job.status == 'pending'
+        user = User.objects.get(username='queued')
+        assert job.payload == {'user_id': user.pk}, (
+            'Проверьте, что код подтверждения не хранится в очереди.'
+        )
+
+        output = run_worker()
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что run_worker отправляет отложенные письма.'
+        )
+        assert mail.outbox[0].to == ['queued@yamdb.fake']
+        assert 'send_confirmation_code: 1' in output
+        job.refresh_from_db()
+        assert job.status == 'done'
+        assert job.payload == {}, (
+            'Проверьте, что параметры выполненного задания очищаются.'
+        )
+        code = mail.outbox[0].body.split()[-1]
+        response = client.post('/api/v1/auth/token/', data={
+            'username': 'queued', 'confirmation_code': code
+        })
+        assert response.status_code == HTTPStatus.OK
+
+    def test_02_priority_and_batching(self):
+        for title_id in (1, 2, 3):
+            enqueue('update_title_ratings', {'title_id': title_id})
+        for user_id in (1, 2):
+            enqueue('send_confirmation_code', {'user_id': user_id})
+        kind, jobs = claim_jobs('first')
+        assert kind == 'send_confirmation_code', (
+            'Проверьте, что сначала берутся задания с большим приоритетом.'
+        )
+        assert len(jobs) == 2, (
+            'Проверьте, что задания одного типа берутся пачкой.'
+        )
+        kind, jobs = claim_jobs('second')
+        assert kind == 'update_title_ratings'
+        assert [job.payload['title_id'] for job in jobs] == [1, 2, 3]
+        assert claim_jobs('third') == (None, [])
+
+    def test_03_claim_is_exclusive_until_lease_expires(self):
+        job = enqueue('send_confirmation_code', {'user_id': 1})
+        _, jobs = claim_jobs('first')
+        assert [item.pk for item in jobs] == [job.pk]
+        assert claim_jobs('second') == (None, []), (
+            'Проверьте, что взятое задание не достается другому воркеру.'
+        )
+        Job.objects.filter(pk=job.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        _, jobs = claim_jobs('second')
+        assert [item.pk for item in jobs] == [job.pk], (
+            'Проверьте, что задание с истекшей арендой берет другой воркер.'
+        )
+        assert jobs[0].attempts == 2
+        assert jobs[0].locked_by.startswith('second:')
+
+    def test_04_abandoned_job_fails(self, settings):
+        settings.JOB_MAX_ATTEMPTS = 2
+        job = enqueue('update_title_ratings', {'title_id': 1})
+        for worker in ('first', 'second'):
+            _, jobs = claim_jobs(worker)
+            assert [item.pk for item in jobs] == [job.pk]
+            Job.objects.filter(pk=job.pk).update(
+                locked_until=timezone.now() - timedelta(seconds=1)
+            )
+        assert claim_jobs('third') == (None, []), (
+            'Проверьте, что задание с истекшей арендой не берется после '
+            'JOB_MAX_ATTEMPTS попыток.'
+        )
+        worker = Worker('test')
+        worker.maintain()
+        job.refresh_from_db()
+        assert job.status == 'failed'
+        assert job.payload == {}
+
+        done = enqueue('update_title_ratings', {'title_id': 2})
+        Job.objects.filter(pk=done.pk).update(
+            status='done', finished_at=timezone.now() - timedelta(days=2)
+        )
+        worker.maintain()
+        assert Job.objects.filter(pk=done.pk).exists(), (
+            'Проверьте, что обслуживание очереди выполняется не чаще раза '
+            'в JOB_MAINTENANCE_INTERVAL секунд.'
+        )
+        settings.JOB_MAINTENANCE_INTERVAL = 0
+        worker.maintain()
+        assert not Job.objects.filter(pk=done.pk).exists()
+
+    def test_05_retry_then_fail(self, monkeypatch, settings):
+        settings.JOB_MAX_ATTEMPTS = 2
+
+        def broken(payloads):
+            raise ValueError('сбой')
+
+        monkeypatch.setitem(JOB_HANDLERS, 'broken', JobHandler(broken, 1, 0))
+        job = enqueue('broken')
+        worker = Worker('test')
+        assert worker.run_once() == 1
+        job.refresh_from_db()
+        assert job.status == 'pending', (
+            'Проверьте, что задание с ошибкой возвращается в очередь.'
+        )
+        assert job.last_error == 'ValueError: сбой'
+        assert job.run_after > timezone.now()
+        assert worker.run_once() == 0
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        assert worker.run_once() == 1
+        job.refresh_from_db()
+        assert job.status == 'failed', (
+            'Проверьте, что после JOB_MAX_ATTEMPTS попыток задание '
+            'помечается как failed.'
+        )
+        assert job_stats()['broken']['failed'] == 1
+
+    def test_06_deletion_and_ratings_through_worker(self, admin_client,
+                                                    user_client, settings):
+        settings.JOBS_DEFERRED = ('update_title_ratings', 'process_deletions')
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Текст', 7)
+        assert Job.objects.filter(kind='update_title_ratings').count() == 1
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert Job.objects.filter(kind='process_deletions').exists()
+
+        run_worker()
+        assert not Title.all_objects.filter(pk=titles[1]['id']).exists(), (
+            'Проверьте, что удаление выполняется фоновым заданием.'
+        )
+        title = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert title.json()['rating'] == 7
+
+        stats = job_stats()
+        assert stats['update_title_ratings']['done'] == 1
+        assert stats['process_deletions']['done'] == 1
+        assert stats['process_deletions']['run_avg'] is not None
+        assert 'process_deletions: в очереди 0' in run_worker('--stats')
+
+    def test_07_locked_status_update_retried(self, monkeypatch, settings):
+        settings.JOB_POLL_INTERVAL = 0
+        job = enqueue('update_title_ratings', {'title_id': 1})
+        update = QuerySet.update
+        failures = []
+
+        def locked_update(queryset, **kwargs):
+            if kwargs.get('status') == 'done' and len(failures) < 2:
+                failures.append(1)
+                raise OperationalError('database is locked')
+            return update(queryset, **kwargs)
+
+        monkeypatch.setattr(QuerySet, 'update', locked_update)
+        assert Worker('test').run_once() == 1
+        job.refresh_from_db()
+        assert job.status == 'done', (
+            'Проверьте, что запись статуса повторяется, пока БД '
+            'заблокирована.'
+        )
+
+        failures.clear()
+        monkeypatch.setattr(jobs, 'LOCKED_RETRIES', 2)
+        job = enqueue('update_title_ratings', {'title_id': 2})
+        reports = []
+        worker = Worker('test', report=lambda *args: reports.append(args))
+        assert worker.run_once() == 1, (
+            'Проверьте, что ошибка блокировки при записи статуса не '
+            'останавливает воркер.'
+        )
+        assert 'OperationalError' in reports[0][3]
+        job.refresh_from_db()
+        assert job.status == 'running'
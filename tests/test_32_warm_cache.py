@@ -0,0 +1,65 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from api.warmup import warm_tasks
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test32WarmCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def warm(self, *args):
+        out = StringIO()
+        call_command(
+            'warm_cache', '--base-url', 'http://testserver', '--force',
+            *args,
+            stdout=out, stderr=out
+        )
+        return out.getvalue()
+
+    def test_01_titles_and_lists_warmed(self, admin_client, user_client,
+                                        client, django_assert_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        create_single_review(user_client, titles[1]['id'], 'Текст', 6)
+
+        output = self.warm('--top', '1', '--threads', '2', '-v', '2')
+        assert 'ошибок 0' in output
+        assert 'titles 1-1' in output
+        assert f'list category={categories[0]["slug"]}' in output, (
+            'Проверьте, что warm_cache прогревает страницы списка '
+            'по категориям.'
+        )
+
+        with django_assert_num_queries(0):
+            title = client.get(f'{self.TITLES_URL}{titles[1]["id"]}/')
+            client.get(self.TITLES_URL)
+            client.get(f'{self.TITLES_URL}?category={categories[0]["slug"]}')
+            client.get(f'{self.TITLES_URL}?genre={genres[1]["slug"]}')
+        assert title.json()['rating'] == 6, (
+            'Проверьте, что warm_cache прогревает произведения с наибольшим '
+            'числом отзывов.'
+        )
+
+    def test_02_pages_beyond_last_ignored(self, admin_client):
+        create_titles(admin_client)
+        output = self.warm('--pages', '3')
+        assert 'ошибок 0' in output
+
+    def test_03_process_local_cache(self, admin_client):
+        create_titles(admin_client)
+        with pytest.raises(CommandError):
+            call_command('warm_cache', stdout=StringIO())
+        names = [name for name, _ in warm_tasks(1, 1, 'http://testserver')]
+        assert 'autocomplete' not in names, (
+            'Проверьте, что копии в памяти процесса прогреваются только '
+            'при запуске WSGI-процесса.'
+        )
+        local = warm_tasks(1, 1, 'http://testserver', local=True)
+        assert {'categories', 'genres', 'autocomplete'} <= {
+            name for name, _ in local
+        }